@@ -0,0 +1,171 @@
+"""Tömbös (NumPy) pontszámító motor, amely az összes résztvevő
+tippjeit egyszerre értékeli ki."""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from HattrickNKPredictor.calculators.models import (Participant,
+                                                    ScoreMatrix)
+from HattrickNKPredictor.calculators.rules import DEFAULT_RULES, RuleSet
+
+
+class BatchScorer:
+    """Az összes játékos tippjét tömbökben tárolja, és néhány
+    tömbművelettel számolja ki a pontokat."""
+
+    def __init__(self, predictions: np.ndarray, tuti: np.ndarray,
+                 replay: np.ndarray, bonus: Sequence[str],
+                 valid: np.ndarray = None,
+                 score_matrix: ScoreMatrix = None):
+        """Inicializálja a motort.
+
+        predictions: (n, meccsek, 2) alakú tömb a hazai/vendég tippekkel,
+        tuti: (n,) a tuti meccs 1-től számozott sorszáma (0 = nincs),
+        replay: (n, 3) a replay tippek, bonus: n darab bónusz válasz,
+        valid: opcionális (n, meccsek) maszk a ténylegesen leadott tippekre,
+        score_matrix: a használt pont-tábla (alapból a közös tábla); a
+        tuti szorzót, a replay sávokat és a bónusz pontot is ennek
+        szabálykészletéből (score_matrix.rules) veszi.
+        """
+        self.predictions = self._as_int_array(predictions)
+        self.valid = None if valid is None else np.asarray(valid, dtype=bool)
+        self.tuti = self._as_int_array(tuti)
+        self.replay = self._as_int_array(replay).reshape(-1, 3)
+        self.bonus = np.asarray(bonus, dtype=object)
+        self.score_matrix = score_matrix or ScoreMatrix.shared()
+        self.rules = self.score_matrix.rules
+        self.match_scores = None
+        self.replay_scores = None
+        self.bonus_scores = None
+        self.total_scores = None
+
+    @staticmethod
+    def _as_int_array(values) -> np.ndarray:
+        """Egész tömbbé alakít; a már egész típusú tömböket nem másolja."""
+        array = np.asarray(values)
+        if array.dtype.kind not in 'iu':
+            array = array.astype(np.int64)
+        return array
+
+    @classmethod
+    def from_participants(cls, participants: List[Participant],
+                          score_matrix: ScoreMatrix = None):
+        """Felépíti a tömböket a Participant objektumok listájából."""
+        match_count = max((len(p.predictions) for p in participants),
+                          default=0)
+        predictions = np.zeros((len(participants), match_count, 2),
+                               dtype=np.int64)
+        lengths = np.zeros(len(participants), dtype=np.int64)
+        for row, participant in enumerate(participants):
+            lengths[row] = len(participant.predictions)
+            if participant.predictions:
+                predictions[row, :lengths[row]] = participant.predictions
+        return cls(
+            predictions,
+            [p.tuti_match for p in participants],
+            [p.replay for p in participants],
+            [p.bonus for p in participants],
+            valid=(np.arange(match_count)[np.newaxis, :]
+                   < lengths[:, np.newaxis]),
+            score_matrix=score_matrix
+        )
+
+    def score(self, actual_results: List[Tuple[int, int]],
+              actual_replay: Tuple[int, int, int], correct_bonus: str):
+        """Kiszámítja az összes játékos pontjait egyszerre.
+
+        Ugyanazt adja, mint a Participant.calculate_scores minden
+        játékosra: ha kevesebb valós eredmény van, mint tipp, vagy egy
+        eredmény még függő (None), a meccs 0 pontot ér."""
+        participant_count, match_count, _ = self.predictions.shape
+        scored = min(match_count, len(actual_results))
+        self.match_scores = np.zeros((participant_count, match_count),
+                                     dtype=np.int64)
+
+        if scored:
+            known = np.array([a is not None
+                              for a in actual_results[:scored]])
+            actual = np.array([a if a is not None else (0, 0)
+                               for a in actual_results[:scored]],
+                              dtype=np.int64).reshape(scored, 2)
+            scores = self.score_matrix.score_many(
+                self.predictions[:, :scored, 0],
+                self.predictions[:, :scored, 1],
+                actual[:, 0],
+                actual[:, 1]
+            )
+            tuti_mask = (np.arange(1, scored + 1)[np.newaxis, :]
+                         == self.tuti[:, np.newaxis])
+            scores = np.where(tuti_mask,
+                              scores * self.rules.tuti_multiplier,
+                              scores) * known
+            if self.valid is not None:
+                scores = scores * self.valid[:, :scored]
+            self.match_scores[:, :scored] = scores
+
+        self.replay_scores = self.replay_points(self.replay, actual_replay,
+                                                self.rules)
+        self.bonus_scores = self.bonus_points(self.bonus, correct_bonus,
+                                              self.rules)
+
+        self.total_scores = (self.match_scores.sum(axis=1)
+                             + self.replay_scores + self.bonus_scores)
+        return self.total_scores
+
+    def apply_to(self, participants: List[Participant]):
+        """Visszaírja a kiszámolt pontokat a Participant objektumokba."""
+        match_scores = self.match_scores.tolist()
+        replay_scores = self.replay_scores.tolist()
+        bonus_scores = self.bonus_scores.tolist()
+        total_scores = self.total_scores.tolist()
+        for row, participant in enumerate(participants):
+            participant.match_scores = \
+                match_scores[row][:len(participant.predictions)]
+            participant.replay_score = replay_scores[row]
+            participant.bonus_score = bonus_scores[row]
+            participant.total_score = total_scores[row]
+
+    def column_points(self, match_index: int,
+                      actual: Optional[Tuple[int, int]]) -> np.ndarray:
+        """Egyetlen meccs oszlopának pontjai a tuti duplázással együtt;
+        függő (None) eredmény esetén mindenki 0 pontot kap."""
+        points = np.zeros(self.predictions.shape[0], dtype=np.int64)
+        if actual is None:
+            return points
+        points = self.score_matrix.score_many(
+            self.predictions[:, match_index, 0],
+            self.predictions[:, match_index, 1],
+            actual[0], actual[1]
+        )
+        points = np.where(self.tuti == match_index + 1,
+                          points * self.rules.tuti_multiplier, points)
+        if self.valid is not None:
+            points = points * self.valid[:, match_index]
+        return points
+
+    @staticmethod
+    def replay_points(replay: np.ndarray,
+                      actual_replay: Sequence[Optional[int]],
+                      rules: RuleSet = None) -> np.ndarray:
+        """A replay tippek pontjai a szabályok eltérési sávjai szerint
+        (NK: 5-ön belül 2, 10-en belül 1 pont) elemenként; a még
+        ismeretlen (None) elemek nem érnek pontot."""
+        known = np.array([a is not None for a in actual_replay], dtype=bool)
+        actual = np.array([a if a is not None else 0 for a in actual_replay],
+                          dtype=np.int64)
+        replay_diff = np.abs(np.asarray(replay, dtype=np.int64) - actual)
+        points = BatchScorer.replay_band_points(replay_diff, rules)
+        return (points * known).sum(axis=1)
+
+    @staticmethod
+    def replay_band_points(replay_diff: np.ndarray,
+                           rules: RuleSet = None) -> np.ndarray:
+        """Egy replay elem pontja az eltérés abszolút értéke alapján."""
+        return (rules or DEFAULT_RULES).replay_points(replay_diff)
+
+    @staticmethod
+    def bonus_points(bonus: Sequence[str], correct_bonus: Optional[str],
+                     rules: RuleSet = None) -> np.ndarray:
+        """A bónusz válaszok pontjai; függő (None) válasznál 0 pont."""
+        if correct_bonus is None:
+            return np.zeros(len(bonus), dtype=np.int64)
+        return (np.asarray(bonus, dtype=object) == correct_bonus).astype(
+            np.int64) * (rules or DEFAULT_RULES).bonus_points
@@ -1,29 +1,117 @@
 """A PredictionGame osztály kezeli az NK
 játék résztvevőit és kiszámolja az eredményeket."""
-from typing import List
-from HattrickNKPredictor.calculators.models import Participant
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from HattrickNKPredictor.calculators.ranking import RankingIndex
+from HattrickNKPredictor.calculators.rules import DEFAULT_RULES, RuleSet
+from HattrickNKPredictor.calculators.table import (ParticipantRow,
+                                                   ParticipantTable)
+
+
+# Holtverseny-feloldási kulcsok: név -> (ParticipantTable oszlop, csökkenő-e)
+TIEBREAK_COLUMNS: Dict[str, Tuple[str, bool]] = {
+    "exact": ("exact_hits", True),
+    "tuti": ("tuti_hits", True),
+    "replay": ("replay_scores", True),
+    "sorszam": ("ids", False),
+}
+
+# Alapértelmezett sorrend: több telitalálat, sikeres tuti meccs,
+# több replay pont, végül a korábbi hozzászólás (kisebb sorszám).
+DEFAULT_TIEBREAK = ("exact", "tuti", "replay", "sorszam")
+
+# Az NK fordulóinak meccsszáma, ha a csapatok sora nem árulja el.
+DEFAULT_MATCH_COUNT = 5
 
 
 class PredictionGame:
     """NK játékhoz tartozó pontszámítási
     és rangsorolási logikát tartalmazza."""
 
-    def __init__(self, csv_data: List[List[str]]):
-        """Inicializálja a játékot a CSV adatok alapján."""
-        self.participants = []
+    def __init__(self, csv_data: List[List[str]],
+                 tiebreak: Sequence[str] = DEFAULT_TIEBREAK,
+                 rules: RuleSet = None):
+        """Inicializálja a játékot a CSV adatok alapján.
+
+        A tiebreak a TIEBREAK_COLUMNS kulcsaiból álló lánc, amely az
+        azonos összpontszámú résztvevők sorrendjét dönti el; a rules a
+        pontozási szabálykészlet (alapból az NK szabályai)."""
+        unknown = [key for key in tiebreak if key not in TIEBREAK_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown tiebreak keys: {unknown}")
+        self.tiebreak = tuple(tiebreak)
+        self.rules = rules or DEFAULT_RULES
+        self.table = None
         self.correct_results = None
         self.correct_replay = None
         self.correct_bonus = None
         self.countrys = None
+        self._rows = None
+        self._ranking = None
         self._parse_csv(csv_data)
 
+    @property
+    def participants(self) -> List[ParticipantRow]:
+        """A résztvevők sor-nézetei a ParticipantTable-ből."""
+        if self._rows is None:
+            self._rows = self.table.rows()
+        return self._rows
+
+    def __getstate__(self):
+        """Pickle-hez (pl. folyamatok közti átadáshoz) a sor-nézetek
+        gyorsítótára nem kell, az újra felépíthető."""
+        state = self.__dict__.copy()
+        state["_rows"] = None
+        return state
+
+    @property
+    def ranking(self) -> RankingIndex:
+        """A rangsor-index; csak pontváltozás után épül újra."""
+        if self._ranking is None:
+            tiebreaks = []
+            for key in self.tiebreak:
+                column, descending = TIEBREAK_COLUMNS[key]
+                tiebreaks.append((getattr(self.table, column), descending))
+            self._ranking = RankingIndex(self.table.total_scores,
+                                         self.table.ids, tiebreaks)
+        return self._ranking
+
+    def _scores_changed(self):
+        """Érvényteleníti a pontokra épülő gyorsítótárakat."""
+        self._ranking = None
+
+    @staticmethod
+    def _match_count(country_row: List[str]) -> int:
+        """Meghatározza a forduló meccseinek számát.
+
+        A CSV sorok felépítése: sorszám, név, meccsenként két gól,
+        tuti, három replay érték és a bónusz. A meccsszám a csapatok
+        sorából jön; ha az üres (pl. a szervező szövegesen írt), az
+        alapértelmezett öt meccs marad, mert a sor szélességéből nem
+        dönthető el: az üres replay egyetlen oszlopba esik össze."""
+        if len(country_row) >= 2:
+            return len(country_row) // 2
+        return DEFAULT_MATCH_COUNT
+
+    @staticmethod
+    def _cell_int(row: List[str], index: int) -> int:
+        """Egész értéket olvas ki egy cellából; hiányzó vagy üres ('[]')
+        cella esetén 0-t ad."""
+        if index < len(row) and row[index] != '[]':
+            return int(row[index])
+        return 0
+
     def _parse_csv(self, csv_data: List[List[str]]):
         """Feldolgozza a CSV adatokat és inicializálja a játék állapotát."""
         *participant_rows, correct_row, country_row = csv_data
         self.countrys = list(country_row)
+        match_count = self._match_count(country_row)
+        tuti_col = 2 + 2 * match_count
+        replay_cols = range(tuti_col + 1, tuti_col + 4)
+        bonus_col = tuti_col + 4
 
         self.correct_results = []
-        for i in range(2, 12, 2):
+        for i in range(2, tuti_col, 2):
             if i + 1 < len(correct_row):
                 try:
                     home = int(correct_row[i])
@@ -33,87 +121,151 @@ class PredictionGame:
                     self.correct_results.append((0, 0))
 
         try:
-            self.correct_replay = (
-                int(correct_row[13]),
-                int(correct_row[14]),
-                int(correct_row[15])
-            )
+            self.correct_replay = tuple(int(correct_row[i])
+                                        for i in replay_cols)
         except (ValueError, IndexError):
             self.correct_replay = (0, 0, 0)
 
-        self.correct_bonus = correct_row[16] if len(correct_row) > 16 else ""
+        self.correct_bonus = (correct_row[bonus_col]
+                              if len(correct_row) > bonus_col else "")
 
+        ids, names, predictions, tutis, replays, bonuses = \
+            [], [], [], [], [], []
         for row in participant_rows:
             try:
                 participant_id = int(row[0])
                 name = row[1]
 
-                predictions = []
-                for i in range(2, 12, 2):
+                row_predictions = []
+                for i in range(2, tuti_col, 2):
                     if (i + 1 < len(row) and row[i] != '[]'
                             and row[i + 1] != '[]'):
                         try:
-                            home = int(row[i])
-                            away = int(row[i + 1])
-                            predictions.append((home, away))
-                        except (ValueError, IndexError):
-                            predictions.append((0, 0))
+                            row_predictions.append((int(row[i]),
+                                                    int(row[i + 1])))
+                        except ValueError:
+                            row_predictions.append((0, 0))
                     else:
-                        predictions.append((0, 0))
-
-                if len(predictions) != 5:
-                    print(f"Skipping participant {name}"
-                          f" (ID: {participant_id}) due "
-                          f"to incomplete predictions.")
-                    continue
+                        row_predictions.append((0, 0))
 
-                tuti_match = int(row[12]) if (len(row) > 12
-                                              and row[12] != '[]') else 0
+                tuti_match = self._cell_int(row, tuti_col)
 
                 try:
-                    replay = (
-                        int(row[13]) if (len(row) > 13 and
-                                         row[13] != '[]') else 0,
-                        int(row[14]) if (len(row) > 14 and
-                                         row[14] != '[]') else 0,
-                        int(row[15]) if (len(row) > 15 and
-                                         row[15] != '[]') else 0
-                    )
+                    replay = tuple(self._cell_int(row, i)
+                                   for i in replay_cols)
                 except ValueError:
                     replay = (0, 0, 0)
 
-                bonus = row[16] if len(row) > 16 else ""
-                match_data = {
-                    "tuti_match": tuti_match,
-                    "replay": replay,
-                    "bonus": bonus
-                }
-                self.participants.append(
-                    Participant(participant_id, name, predictions, match_data)
-                )
+                bonus = row[bonus_col] if len(row) > bonus_col else ""
             except (ValueError, IndexError) as e:
                 print(f"Error parsing row {row}: {e}")
+                continue
+
+            ids.append(participant_id)
+            names.append(name)
+            predictions.append(row_predictions)
+            tutis.append(tuti_match)
+            replays.append(replay)
+            bonuses.append(bonus)
+
+        self.table = ParticipantTable(
+            ids, names,
+            np.array(predictions, dtype=np.int32).reshape(
+                len(ids), match_count, 2),
+            tutis, replays, bonuses, self.rules
+        )
+        self._rows = None
+        self._scores_changed()
+
+    def calculate_all_scores(self, vectorized: bool = False):
+        """Kiszámítja minden résztvevő pontszámait.
+
+        vectorized=True esetén a BatchScorer tömbös motorja számol
+        közvetlenül a ParticipantTable oszlopain, ami nagy
+        résztvevőszámnál lényegesen gyorsabb."""
+        self._scores_changed()
+        if vectorized:
+            self.table.score(self.correct_results, self.correct_replay,
+                             self.correct_bonus)
+        else:
+            for participant in self.participants:
+                participant.calculate_scores(
+                    self.correct_results,
+                    self.correct_replay,
+                    self.correct_bonus
+                )
+        self.table.update_statistics(self.correct_results)
+
+    def reset_results(self):
+        """Minden valós eredményt, replay értéket és a bónusz választ
+        függőre (None) állítja, és lenullázza a pontokat. Élő forduló
+        kezdetén használható, amikor még egy eredmény sem ismert."""
+        self.correct_results = [None] * self.table.match_count
+        self.correct_replay = (None, None, None)
+        self.correct_bonus = None
+        self.calculate_all_scores(vectorized=True)
+
+    def set_result(self, match_index: int,
+                   result: Optional[Tuple[int, int]]) -> np.ndarray:
+        """Beállítja, módosítja vagy (None esetén) törli egy meccs valós
+        eredményét, és csak annak a meccsnek az oszlopát számolja újra.
+
+        A match_index 0-tól számozott. A pontokat a változásból frissíti,
+        ezért előtte calculate_all_scores vagy reset_results szükséges.
+        Visszaadja a résztvevőnkénti pontváltozást."""
+        if not 0 <= match_index < self.table.match_count:
+            raise IndexError(f"match index {match_index} out of range")
+        if len(self.correct_results) <= match_index:
+            self.correct_results.extend(
+                [None] * (match_index + 1 - len(self.correct_results)))
+        if result is not None:
+            result = (int(result[0]), int(result[1]))
+        self.correct_results[match_index] = result
+        self._scores_changed()
+        delta = self.table.rescore_match(match_index, result)
+        self.table.update_statistics(self.correct_results)
+        return delta
+
+    def clear_result(self, match_index: int) -> np.ndarray:
+        """Függőre állítja egy meccs eredményét (0 pontot ér)."""
+        return self.set_result(match_index, None)
+
+    def set_replay(self, replay: Sequence[Optional[int]]) -> np.ndarray:
+        """Beállítja a replay értékeket; a None elemek függők maradnak."""
+        if len(replay) != 3:
+            raise ValueError("replay must have exactly three values")
+        self.correct_replay = tuple(None if value is None else int(value)
+                                    for value in replay)
+        self._scores_changed()
+        return self.table.rescore_replay(self.correct_replay)
+
+    def set_bonus(self, bonus: Optional[str]) -> np.ndarray:
+        """Beállítja vagy (None esetén) törli a bónusz kérdés válaszát."""
+        self.correct_bonus = bonus
+        self._scores_changed()
+        return self.table.rescore_bonus(bonus)
+
+    def get_rankings(self, limit: Optional[int] = None
+                     ) -> List[ParticipantRow]:
+        """Visszaadja a résztvevőket pontszám szerint csökkenő sorrendben.
 
-    def calculate_all_scores(self):
-        """Kiszámítja minden résztvevő pontszámait."""
-        for participant in self.participants:
-            participant.calculate_scores(
-                self.correct_results,
-                self.correct_replay,
-                self.correct_bonus
-            )
+        limit megadásakor csak az első limit résztvevőt (top-K)."""
+        participants = self.participants
+        rows = (self.ranking.order if limit is None
+                else self.ranking.top_k(limit))
+        return [participants[row] for row in rows.tolist()]
 
-    def get_rankings(self) -> List[Participant]:
-        """Visszaadja a résztvevőket pontszám szerint csökkenő sorrendben."""
-        return sorted(self.participants, key=lambda p: p.total_score,
-                      reverse=True)
+    def get_rank(self, participant_id: int) -> int:
+        """Egy résztvevő helyezése (holtversenyben azonos helyezés)."""
+        return self.ranking.rank_of(participant_id)
 
     def print_results(self):
         """Kiírja a rangsort a konzolra."""
+        ranks = self.ranking.ranks
         rankings = self.get_rankings()
         print("Rank\tID\tName\tTotal\tMatches\tReplay\tBonus")
-        for rank, participant in enumerate(rankings, 1):
-            print(f"{rank}\t{participant.id}"
+        for row, participant in zip(self.ranking.order.tolist(), rankings):
+            print(f"{ranks[row]}\t{participant.id}"
                   f"\t{participant.name}"
                   f"\t{participant.total_score}\t"
                   f"{sum(participant.match_scores)}"
@@ -3,7 +3,7 @@ exportálásához és összesített pontszámok kiszámításához."""
 import os
 import re
 from collections import defaultdict
-from typing import List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from HattrickNKPredictor.calculators.models import Participant
 
 
@@ -14,10 +14,14 @@ def export_results_to_txt(
     actual_replay: Tuple[int, int, int],
     correct_bonus: str,
     countrys: List[str],
-    output_file: str
+    output_file: str,
+    ranked: bool = False
 ):
     """Exportálja az aktuális forduló eredményeit .txt
-    formátumba, Hattrick fórum táblázat formában."""
+    formátumba, Hattrick fórum táblázat formában.
+
+    ranked=True esetén a résztvevők már rangsorban érkeznek (pl.
+    PredictionGame.get_rankings()), így nem kell újra rendezni."""
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(f"[table][tr][th colspan=10 "
                 f"align=center][q]{round_name}[/q][/th][/tr]\n")
@@ -30,14 +34,20 @@ def export_results_to_txt(
         f.write("[tr][th]Eredmények[/th][td][/td]")
 
         for match in actual_results:
-            f.write(f"[td]{match[0]} - {match[1]}[/td]")
-
-        replay_str = (f"{actual_replay[0]}-"
-                      f"{actual_replay[1]}-{actual_replay[2]}")
-        f.write(f"[td]{replay_str}[/td][td]{correct_bonus}[/td][/tr]\n")
-
-        for p in sorted(participants, key=lambda x: x.total_score,
-                        reverse=True):
+            if match is None:
+                f.write("[td]? - ?[/td]")
+            else:
+                f.write(f"[td]{match[0]} - {match[1]}[/td]")
+
+        replay_str = "-".join("?" if value is None else str(value)
+                              for value in actual_replay)
+        bonus_str = "?" if correct_bonus is None else correct_bonus
+        f.write(f"[td]{replay_str}[/td][td]{bonus_str}[/td][/tr]\n")
+
+        if not ranked:
+            participants = sorted(participants, key=lambda x: x.total_score,
+                                  reverse=True)
+        for p in participants:
             f.write(f"[tr][th]{p.name}[/th][td]{p.total_score}p[/td]")
             for i, pred in enumerate(p.predictions):
                 score = p.match_scores[i]
@@ -51,12 +61,44 @@ def export_results_to_txt(
         f.write("[/table]\n")
 
 
+def export_rounds_to_txt(rounds: Sequence, output_dir: str) -> List[str]:
+    """Exportálja a pontozott fordulókat (PredictionGame) rangsor szerint
+    az output_dir/fordulo<n>.txt fájlokba; a fájlok elérési útját adja."""
+    paths = []
+    for index, game in enumerate(rounds):
+        path = os.path.join(output_dir, f"fordulo{index + 1}.txt")
+        export_results_to_txt(
+            game.get_rankings(),
+            f"NK - {index + 1}. Forduló eredmény",
+            game.correct_results,
+            game.correct_replay,
+            game.correct_bonus,
+            game.countrys,
+            path,
+            ranked=True
+        )
+        paths.append(path)
+    return paths
+
+
+def _natural_key(filename: str) -> List:
+    """Természetes rendezési kulcs: 'fordulo2' a 'fordulo10' elé kerül."""
+    return [int(part) if part.isdigit() else part
+            for part in re.split(r'(\d+)', filename)]
+
+
 class NKScoreAggregator:
-    """Összesíti a különböző txt fájlokból származó NK pontszámokat."""
+    """Összesíti a különböző txt fájlokból származó NK pontszámokat.
+
+    A fájlokban csak a név és a pont szerepel, ezért azonos pontnál a
+    tiebreaks (név -> kulcsok, nagyobb a jobb; pl. a SeasonResult
+    tiebreaks-e) dönt, utána a név."""
 
-    def __init__(self):
+    def __init__(self,
+                 tiebreaks: Optional[Dict[str, Sequence[int]]] = None):
         """Inicializálja az üres ponttáblát."""
         self.scores = defaultdict(int)
+        self.tiebreaks = tiebreaks or {}
 
     def _extract_scores_from_text(self, text: str) -> List[Tuple[str, int]]:
         """Kinyeri a nevet és pontszámot a Hattrick-formátumú táblázatból."""
@@ -75,13 +117,20 @@ class NKScoreAggregator:
     def add_folder(self, folder_path: str):
         """Végigolvassa az összes .txt fájlt
         a mappában és hozzáadja az eredményeket."""
-        for filename in os.listdir(folder_path):
+        for filename in sorted(os.listdir(folder_path), key=_natural_key):
             if filename.endswith(".txt"):
                 self.add_file(os.path.join(folder_path, filename))
 
     def _format_table(self) -> str:
         """Formázza az összesített eredményeket fórum táblázat formátumban."""
-        sorted_scores = sorted(self.scores.items(), key=lambda x: -x[1])
+        width = max(map(len, self.tiebreaks.values()), default=0)
+
+        def sort_key(item):
+            name, score = item
+            values = self.tiebreaks.get(name, (0,) * width)
+            return (-score, tuple(-v for v in values), name.casefold(), name)
+
+        sorted_scores = sorted(self.scores.items(), key=sort_key)
         output = "[table]\n"
         output += ("[tr][th colspan=7 align=center]"
                    "[q]Összesített eredmény[/q][/th][/tr]\n")
@@ -1,18 +1,23 @@
 """Kiszámítja a tippek pontjait a valós eredmények alapján."""
 from typing import List, Tuple
+import numpy as np
+from HattrickNKPredictor.calculators.rules import DEFAULT_RULES, RuleSet
 
 
 class MatchScorer:
     """Kiszámítja a tippek pontjait a valós eredmények alapján."""
     @staticmethod
     def calculate_score(prediction: Tuple[int, int],
-                        actual: Tuple[int, int]) -> int:
-        """Kiszámítja a pontot egy adott jóslat és valódi eredmény alapján."""
+                        actual: Tuple[int, int],
+                        rules: RuleSet = None) -> int:
+        """Kiszámítja a pontot egy adott jóslat és valódi eredmény alapján
+        (alapból az NK szabályaival)."""
+        rules = rules or DEFAULT_RULES
         pred_home, pred_away = prediction
         actual_home, actual_away = actual
 
         if prediction == actual:
-            return 5
+            return rules.exact
 
         pred_diff = pred_home - pred_away
         actual_diff = actual_home - actual_away
@@ -22,13 +27,104 @@ class MatchScorer:
 
         if pred_outcome == actual_outcome:
             if pred_diff == actual_diff:
-                return 3
-            return 2
+                return rules.goal_difference
+            return rules.outcome
 
         if pred_home == actual_home or pred_away == actual_away:
-            return 1
+            return rules.partial
 
-        return 0
+        return rules.miss
+
+    @staticmethod
+    def calculate_score_array(pred_home: np.ndarray, pred_away: np.ndarray,
+                              actual_home: np.ndarray,
+                              actual_away: np.ndarray,
+                              rules: RuleSet = None) -> np.ndarray:
+        """A calculate_score tömbös változata: tetszőleges, egymással
+        broadcastolható alakú gólszám-tömbökre számolja ki a pontokat."""
+        rules = rules or DEFAULT_RULES
+        pred_diff = np.subtract(pred_home, pred_away)
+        actual_diff = np.subtract(actual_home, actual_away)
+        same_home = np.equal(pred_home, actual_home)
+        same_away = np.equal(pred_away, actual_away)
+        same_outcome = np.sign(pred_diff) == np.sign(actual_diff)
+
+        return np.select(
+            [same_home & same_away,
+             same_outcome & (pred_diff == actual_diff),
+             same_outcome,
+             same_home | same_away],
+            [rules.exact, rules.goal_difference, rules.outcome,
+             rules.partial],
+            default=rules.miss
+        )
+
+
+class ScoreMatrix:
+    """Előre kiszámolt pont-tábla egy RuleSet meccspontjaihoz.
+
+    A table[tipp_hazai, tipp_vendég, valós_hazai, valós_vendég] elem
+    a tipp pontszáma 0..max_goals gólig; efölött a képlet számol."""
+
+    DEFAULT_MAX_GOALS = 10
+    _shared = {}
+
+    def __init__(self, max_goals: int = DEFAULT_MAX_GOALS,
+                 rules: RuleSet = None):
+        """Felépíti a (max_goals + 1)^4 méretű pont-táblát."""
+        if max_goals < 0:
+            raise ValueError("max_goals must be non-negative")
+        self.max_goals = max_goals
+        self.rules = rules or DEFAULT_RULES
+        goals = np.arange(max_goals + 1)
+        self.table = MatchScorer.calculate_score_array(
+            *np.meshgrid(goals, goals, goals, goals, indexing='ij'),
+            rules=self.rules
+        ).astype(np.int16)
+        self.table.flags.writeable = False
+
+    @classmethod
+    def shared(cls, max_goals: int = DEFAULT_MAX_GOALS,
+               rules: RuleSet = None):
+        """Visszaadja a folyamaton belül közösen használt táblát
+        (gólhatáronként és szabálykészletenként egyet)."""
+        key = (max_goals, rules or DEFAULT_RULES)
+        if key not in cls._shared:
+            cls._shared[key] = cls(max_goals, rules)
+        return cls._shared[key]
+
+    def score(self, prediction: Tuple[int, int],
+              actual: Tuple[int, int]) -> int:
+        """Egyetlen tipp pontja; a határ fölött a képlettel számol."""
+        goals = (*prediction, *actual)
+        if all(0 <= g <= self.max_goals for g in goals):
+            return int(self.table[goals])
+        return MatchScorer.calculate_score(prediction, actual, self.rules)
+
+    def score_many(self, pred_home, pred_away,
+                   actual_home, actual_away) -> np.ndarray:
+        """Tetszőleges, egymással broadcastolható alakú gólszám-tömbök
+        pontjai; a határon kívüli elemeket a tömbös képlet számolja."""
+        pred_home, pred_away, actual_home, actual_away = np.broadcast_arrays(
+            *(np.asarray(goals, dtype=np.int64) for goals in
+              (pred_home, pred_away, actual_home, actual_away))
+        )
+        in_range = np.ones(pred_home.shape, dtype=bool)
+        for goals in (pred_home, pred_away, actual_home, actual_away):
+            in_range &= (goals >= 0) & (goals <= self.max_goals)
+
+        if in_range.all():
+            return self.table[pred_home, pred_away,
+                              actual_home, actual_away].astype(np.int64)
+
+        result = MatchScorer.calculate_score_array(
+            pred_home, pred_away, actual_home, actual_away, self.rules
+        )
+        result[in_range] = self.table[pred_home[in_range],
+                                      pred_away[in_range],
+                                      actual_home[in_range],
+                                      actual_away[in_range]]
+        return result
 
 
 class Participant:
@@ -51,23 +147,30 @@ class Participant:
 
     def calculate_scores(self, actual_results: List[Tuple[int, int]],
                          actual_replay: Tuple[int, int, int],
-                         correct_bonus: str):
-        """Kiszámítja a játékos összes pontját."""
+                         correct_bonus: str, rules: RuleSet = None):
+        """Kiszámítja a játékos összes pontját (alapból az NK
+        szabályaival).
+
+        A még függő (None) eredmények, replay elemek és bónusz
+        válasz nem érnek pontot."""
+        rules = rules or DEFAULT_RULES
         for i, (pred, actual) in enumerate(
                 zip(self.predictions, actual_results)):
-            score = MatchScorer.calculate_score(pred, actual)
+            if actual is None:
+                self.match_scores[i] = 0
+                continue
+            score = MatchScorer.calculate_score(pred, actual, rules)
             if (i + 1) == self.tuti_match:
-                score *= 2
+                score *= rules.tuti_multiplier
             self.match_scores[i] = score
 
         self.replay_score = sum(
-            2 for p, a in zip(self.replay, actual_replay) if abs(p - a) <= 5
-        ) + sum(
-            1 for p, a in zip(self.replay, actual_replay)
-            if 5 < abs(p - a) <= 10
+            int(rules.replay_points(abs(p - a)))
+            for p, a in zip(self.replay, actual_replay) if a is not None
         )
 
-        self.bonus_score = 1 if self.bonus == correct_bonus else 0
+        self.bonus_score = (rules.bonus_points if correct_bonus is not None
+                            and self.bonus == correct_bonus else 0)
 
         self.total_score = (sum(self.match_scores)
                             + self.replay_score + self.bonus_score)
@@ -0,0 +1,107 @@
+"""Gyorsítótárazható rangsor-index top-K és helyezés lekérdezésekkel."""
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+
+
+class RankingIndex:
+    """Pontszám szerint csökkenő rangsor egy adott pontállapothoz.
+
+    Egyszer épül fel a pontszámításkor, és csak akkor kell újat építeni,
+    ha a pontok megváltoztak. Holtversenynél a szabványos versenyes
+    helyezést adja (1, 2, 2, 4), a sorrend pedig stabil: egyenlő
+    pontnál az eredeti (beküldési) sorrend dönt.
+
+    A tiebreaks (oszlop, csökkenő-e) párok sorozata további rendezési
+    kulcsokat ad meg; ilyenkor csak az minősül holtversenynek, ahol
+    minden kulcs egyezik."""
+
+    def __init__(self, scores: Sequence[int],
+                 ids: Optional[Sequence[int]] = None,
+                 tiebreaks: Sequence[Tuple[Sequence[int], bool]] = ()):
+        """Eltárolja a pontokat; a teljes rendezés csak igény esetén fut."""
+        self.scores = np.array(scores, dtype=np.int64)
+        self.tiebreaks = [(np.array(values, dtype=np.int64), descending)
+                          for values, descending in tiebreaks]
+        self._row_of_id: Optional[Dict[int, int]] = None
+        self._ids = None if ids is None else np.asarray(ids)
+        self._order = None
+        self._ranks = None
+
+    def _sort_keys(self):
+        """A kulcsok növekvő rendezéshez előjelezve, fontossági sorrendben."""
+        keys = [-self.scores]
+        for values, descending in self.tiebreaks:
+            keys.append(-values if descending else values)
+        return keys
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def order(self) -> np.ndarray:
+        """A sorindexek csökkenő pontszám szerinti sorrendben."""
+        if self._order is None:
+            if self.tiebreaks:
+                keys = self._sort_keys()
+                # A lexsort az utolsó kulcsot tekinti elsődlegesnek.
+                self._order = np.lexsort(
+                    (np.arange(len(self.scores)), *reversed(keys)))
+            else:
+                self._order = np.argsort(-self.scores, kind='stable')
+        return self._order
+
+    @property
+    def ranks(self) -> np.ndarray:
+        """Soronkénti versenyes helyezés (1, 2, 2, 4 ...)."""
+        if self._ranks is None:
+            order = self.order
+            # Az első sor mindig új csoportot nyit (üres táblán nincs sor).
+            new_group = np.ones(len(order), dtype=bool)
+            new_group[1:] = False
+            for key in self._sort_keys():
+                sorted_key = key[order]
+                new_group[1:] |= sorted_key[1:] != sorted_key[:-1]
+            positions = np.arange(1, len(order) + 1)
+            sorted_ranks = np.maximum.accumulate(
+                np.where(new_group, positions, 0))
+            self._ranks = np.empty(len(order), dtype=np.int64)
+            self._ranks[order] = sorted_ranks
+        return self._ranks
+
+    def top_k(self, k: int) -> np.ndarray:
+        """Az első k sor indexe rangsor szerint.
+
+        Ha a teljes rendezés még nem készült el, részleges
+        kiválasztással (argpartition) dolgozik, O(n + k log k) lépésben;
+        a határon álló holtversenyt is a stabil sorrend szerint dönti el."""
+        count = len(self.scores)
+        k = max(0, min(k, count))
+        if self._order is not None or self.tiebreaks or k == count:
+            return self.order[:k]
+        if k == 0:
+            return np.empty(0, dtype=np.int64)
+
+        threshold = np.partition(self.scores, count - k)[count - k]
+        above = np.flatnonzero(self.scores > threshold)
+        tied = np.flatnonzero(self.scores == threshold)[:k - len(above)]
+        selected = np.concatenate([above, tied])
+        return selected[np.lexsort((selected, -self.scores[selected]))]
+
+    def rank_of_row(self, row: int) -> int:
+        """Egy sor versenyes helyezése; a teljes rendezés nélkül O(n)."""
+        if self._ranks is not None or self.tiebreaks:
+            return int(self.ranks[row])
+        return int(np.count_nonzero(self.scores > self.scores[row])) + 1
+
+    def row_of(self, participant_id: int) -> int:
+        """Visszaadja az azonosítóhoz tartozó sor indexét."""
+        if self._ids is None:
+            return participant_id
+        if self._row_of_id is None:
+            self._row_of_id = {int(pid): row
+                               for row, pid in enumerate(self._ids.tolist())}
+        return self._row_of_id[participant_id]
+
+    def rank_of(self, participant_id: int) -> int:
+        """Egy résztvevő versenyes helyezése azonosító alapján."""
+        return self.rank_of_row(self.row_of(participant_id))
@@ -0,0 +1,122 @@
+"""Deklaratív pontozási szabályok (RuleSet) dict vagy TOML forrásból."""
+from typing import Any, Dict, Sequence, Tuple
+import numpy as np
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10
+    try:
+        import tomli as tomllib
+    except ModuleNotFoundError:
+        tomllib = None
+
+
+class RuleSet:
+    """Egy NK liga pontozási szabályai.
+
+    A meccspontok (telitalálat, gólkülönbség, kimenetel, részleges
+    találat, mellé), a tuti szorzó, a replay eltérési sávok
+    ((határ, pont) párok növekvő határ szerint) és a bónusz pont.
+    A meccspontokat a ScoreMatrix, a replay sávokat a replay_table
+    fordítja le előre kiszámolt táblákká."""
+
+    FIELDS = ("exact", "goal_difference", "outcome", "partial", "miss",
+              "tuti_multiplier", "replay_bands", "bonus_points")
+
+    def __init__(self, exact: int = 5, goal_difference: int = 3,
+                 outcome: int = 2, partial: int = 1, miss: int = 0,
+                 tuti_multiplier: int = 2,
+                 replay_bands: Sequence[Tuple[int, int]] = ((5, 2), (10, 1)),
+                 bonus_points: int = 1, name: str = "NK"):
+        """Eltárolja és ellenőrzi a szabályokat."""
+        self.name = name
+        self.exact = int(exact)
+        self.goal_difference = int(goal_difference)
+        self.outcome = int(outcome)
+        self.partial = int(partial)
+        self.miss = int(miss)
+        self.tuti_multiplier = int(tuti_multiplier)
+        self.replay_bands = tuple((int(limit), int(points))
+                                  for limit, points in replay_bands)
+        self.bonus_points = int(bonus_points)
+
+        limits = [limit for limit, _ in self.replay_bands]
+        if any(limit < 0 for limit in limits) or limits != sorted(limits):
+            raise ValueError("replay bands must have non-negative, "
+                             "increasing limits")
+
+        # replay_table[eltérés] a pont; az utolsó elem (0) minden, a
+        # legnagyobb határ fölötti eltérésre vonatkozik.
+        size = (limits[-1] + 2) if limits else 1
+        self.replay_table = np.zeros(size, dtype=np.int64)
+        for limit, points in reversed(self.replay_bands):
+            self.replay_table[:limit + 1] = points
+        self.replay_table.flags.writeable = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Szabályok dict-ből; lapos kulcsokkal vagy a TOML szerinti
+        [match], [tuti], [replay], [bonus] csoportokkal."""
+        data = dict(data)
+        flat: Dict[str, Any] = {}
+        if "name" in data:
+            flat["name"] = data.pop("name")
+        groups = {
+            "match": {"exact": "exact",
+                      "goal_difference": "goal_difference",
+                      "outcome": "outcome", "partial": "partial",
+                      "miss": "miss"},
+            "tuti": {"multiplier": "tuti_multiplier"},
+            "replay": {"bands": "replay_bands"},
+            "bonus": {"points": "bonus_points"},
+        }
+        for group, keys in groups.items():
+            section = data.pop(group, None)
+            if section is None:
+                continue
+            if not isinstance(section, dict):
+                raise ValueError(f"Rule section '{group}' must be a table")
+            for key, value in section.items():
+                if key not in keys:
+                    raise ValueError(f"Unknown rule '{group}.{key}'")
+                flat[keys[key]] = value
+        for key, value in data.items():
+            if key not in cls.FIELDS:
+                raise ValueError(f"Unknown rule '{key}'")
+            flat[key] = value
+        return cls(**flat)
+
+    @classmethod
+    def from_toml(cls, text: str):
+        """Szabályok TOML szövegből."""
+        if tomllib is None:
+            raise ImportError("TOML rule sets need Python 3.11+ or tomli")
+        return cls.from_dict(tomllib.loads(text))
+
+    @classmethod
+    def load(cls, path: str):
+        """Szabályok TOML fájlból."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_toml(f.read())
+
+    def key(self) -> Tuple:
+        """A szabályokat egyértelműen azonosító (hash-elhető) kulcs."""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RuleSet) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def __repr__(self) -> str:
+        return f"RuleSet(name={self.name!r}, {self.key()!r})"
+
+    def replay_points(self, difference):
+        """Replay elem(ek) pontja az eltérés abszolút értéke alapján;
+        skalárra és tömbre is a replay_table-ből olvas."""
+        return self.replay_table[np.minimum(difference,
+                                            len(self.replay_table) - 1)]
+
+
+DEFAULT_RULES = RuleSet()
@@ -0,0 +1,191 @@
+"""Pontos "ki nyerhet még" elemzés a függő kimenetelek bejárásával."""
+import math
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from HattrickNKPredictor.calculators.batch import BatchScorer
+from HattrickNKPredictor.calculators.calculator import PredictionGame
+from HattrickNKPredictor.calculators.models import ScoreMatrix
+from HattrickNKPredictor.calculators.simulation import ScoreDistribution
+
+
+class OutcomeDimension:
+    """Egy függő tétel (meccs, replay elem vagy bónusz) lehetséges
+    kimenetelei, a résztvevőnkénti pontokkal és valószínűségekkel.
+
+    Az olyan kimeneteleket, amelyek minden résztvevőnek ugyanannyi
+    pontot adnak, egy csoportba vonja; a csoportot a legvalószínűbb
+    tagja képviseli."""
+
+    def __init__(self, label: str, outcomes: Sequence[Any],
+                 points: np.ndarray, probabilities: Sequence[float]):
+        """points: (kimenetelek, résztvevők) alakú pont-tábla."""
+        self.label = label
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        groups, inverse = np.unique(np.asarray(points, dtype=np.int64),
+                                    axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        self.points = groups
+        self.outcomes = []
+        self.costs = np.empty(len(groups))
+        for group in range(len(groups)):
+            members = np.flatnonzero(inverse == group)
+            best = members[np.argmax(probabilities[members])]
+            self.outcomes.append(outcomes[best])
+            self.costs[group] = (-math.log(probabilities[best])
+                                 if probabilities[best] > 0 else math.inf)
+        self.group_count = len(groups)
+
+    def __len__(self) -> int:
+        return self.group_count
+
+
+class WinningChance:
+    """Egy résztvevő elemzésének eredménye."""
+
+    def __init__(self, name: str, participant_id: Optional[int],
+                 can_win: bool, scenario: Optional[Dict[str, Any]] = None,
+                 cost: float = math.inf):
+        """scenario: a legolcsóbb (legvalószínűbb) győztes kimenetel
+        tételenként, cost: annak negatív log-valószínűsége."""
+        self.name = name
+        self.id = participant_id
+        self.can_win = can_win
+        self.scenario = scenario
+        self.cost = cost
+
+
+class WinnerEnumerator:
+    """Minden függő kimenetel-kombinációt (gólhatárig) figyelembe véve
+    eldönti, ki lehet még a forduló győztese.
+
+    Az ágakat metszi, ha egy versenytárs a hátralévő tételekből
+    legkedvezőbb esetben is megelőzi a vizsgált résztvevőt (a
+    résztvevők egymáshoz viszonyított maximális pontfelső korlátja
+    alapján), illetve ha az ág már drágább a legjobb ismert győztes
+    forgatókönyvnél. Holtversenyes első hely is győzelemnek számít."""
+
+    def __init__(self, game: PredictionGame, max_goals: int = 5,
+                 score_distributions: Optional[
+                     Dict[int, ScoreDistribution]] = None,
+                 bonus_options: Optional[Sequence[str]] = None,
+                 base_scores: Optional[Sequence[int]] = None):
+        """Felépíti a függő tételek csoportosított pont-tábláit.
+
+        score_distributions: meccsindexenkénti eloszlás a "legolcsóbb"
+        forgatókönyv súlyozásához (alapból Poisson), bonus_options: a
+        bónusz lehetséges válaszai (alapból a résztvevők válaszai)."""
+        self.game = game
+        table = game.table
+        self.base = np.asarray(table.total_scores, dtype=np.int64).copy()
+        if base_scores is not None:
+            self.base += np.asarray(base_scores, dtype=np.int64)
+        self.dimensions: List[OutcomeDimension] = []
+
+        distributions = score_distributions or {}
+        default = ScoreDistribution.poisson(max_goals=max_goals)
+        scorer = table.scorer(ScoreMatrix.shared(max_goals, table.rules))
+        size = max_goals + 1
+        results = list(game.correct_results)
+        results += [None] * (table.match_count - len(results))
+        for match_index, actual in enumerate(results):
+            if actual is not None:
+                continue
+            distribution = distributions.get(match_index, default)
+            if distribution.max_goals != max_goals:
+                raise ValueError("score distributions must use max_goals")
+            outcomes = [divmod(k, size) for k in range(size * size)]
+            points = np.stack([scorer.column_points(match_index, outcome)
+                               for outcome in outcomes])
+            self.dimensions.append(OutcomeDimension(
+                f"match {match_index + 1}", outcomes, points,
+                distribution.probabilities.ravel()))
+
+        values = np.arange(101)
+        for component, value in enumerate(game.correct_replay):
+            if value is not None:
+                continue
+            diff = np.abs(values[:, np.newaxis]
+                          - table.replay[np.newaxis, :, component])
+            self.dimensions.append(OutcomeDimension(
+                f"replay {component + 1}", values.tolist(),
+                BatchScorer.replay_band_points(diff, table.rules),
+                np.full(len(values), 1 / len(values))))
+
+        if game.correct_bonus is None:
+            options = list(bonus_options or sorted(set(table.bonus)))
+            points = np.stack([BatchScorer.bonus_points(table.bonus, option,
+                                                        table.rules)
+                               for option in options])
+            self.dimensions.append(OutcomeDimension(
+                "bonus", options, points,
+                np.full(len(options), 1 / len(options))))
+
+        self.dimensions.sort(key=len)
+
+    def scenario_count(self) -> int:
+        """A csoportosítás utáni kombinációk száma (metszés nélkül)."""
+        return math.prod(len(dimension) for dimension in self.dimensions)
+
+    def analyse(self, cheapest: bool = True) -> List[WinningChance]:
+        """Minden résztvevőre eldönti, nyerhet-e még.
+
+        cheapest=False esetén az első talált győztes forgatókönyvnél
+        megáll (gyorsabb, ha csak az igen/nem válasz kell)."""
+        return [self.analyse_participant(row, cheapest)
+                for row in range(len(self.base))]
+
+    def analyse_participant(self, row: int,
+                            cheapest: bool = True) -> WinningChance:
+        """Egy résztvevő (sorindex) győzelmi lehetőségének keresése."""
+        table = self.game.table
+        dimensions = self.dimensions
+        depth_count = len(dimensions)
+
+        # relative_min[d][q]: a d. tételtől hátralévő részből q legalább
+        # ennyivel kap többet a vizsgált résztvevőnél.
+        relative_min = np.zeros((depth_count + 1, len(self.base)),
+                                dtype=np.int64)
+        cost_min = np.zeros(depth_count + 1)
+        for depth in range(depth_count - 1, -1, -1):
+            points = dimensions[depth].points
+            relative = points - points[:, row:row + 1]
+            relative_min[depth] = relative_min[depth + 1] + relative.min(0)
+            cost_min[depth] = (cost_min[depth + 1]
+                               + dimensions[depth].costs.min())
+
+        best = {"cost": math.inf, "choice": None}
+        choice = [0] * depth_count
+
+        def search(depth: int, scores: np.ndarray, cost: float) -> bool:
+            if cost + cost_min[depth] >= best["cost"]:
+                return False
+            lead = scores - scores[row] + relative_min[depth]
+            if (lead > 0).any():
+                return False
+            if depth == depth_count:
+                best["cost"] = cost
+                best["choice"] = list(choice)
+                return not cheapest
+
+            dimension = dimensions[depth]
+            if cheapest:
+                order = np.argsort(dimension.costs, kind='stable')
+            else:
+                gain = dimension.points[:, row] - dimension.points.max(1)
+                order = np.argsort(-gain, kind='stable')
+            for group in order.tolist():
+                choice[depth] = group
+                if search(depth + 1, scores + dimension.points[group],
+                          cost + dimension.costs[group]):
+                    return True
+            return False
+
+        search(0, self.base, 0.0)
+        name = table.names[row]
+        participant_id = int(table.ids[row])
+        if best["choice"] is None:
+            return WinningChance(name, participant_id, False)
+        scenario = {dimension.label: dimension.outcomes[group]
+                    for dimension, group in zip(dimensions, best["choice"])}
+        return WinningChance(name, participant_id, True, scenario,
+                             best["cost"])
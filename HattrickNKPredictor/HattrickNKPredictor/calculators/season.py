@@ -0,0 +1,115 @@
+"""Egy teljes szezon fordulóinak párhuzamos kiértékelése."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from HattrickNKPredictor.calculators.calculator import (DEFAULT_TIEBREAK,
+                                                        TIEBREAK_COLUMNS,
+                                                        PredictionGame)
+from HattrickNKPredictor.calculators.rules import RuleSet
+from HattrickNKPredictor.forum.csv_handler import handler
+
+RoundSource = Union[str, os.PathLike, List[List[str]]]
+
+# A fordulók tiebreak kulcsai közül ezek adhatók össze a szezonra; a
+# hozzászólás sorszáma fordulónként más, így összesítve a név dönt.
+SEASON_TIEBREAKS = ("exact", "tuti", "replay")
+
+
+def _score_round(source: RoundSource, tiebreak: Sequence[str],
+                 rules: Optional[RuleSet] = None) -> PredictionGame:
+    """Beolvas és kiértékel egy fordulót (a munkafolyamatokban fut).
+
+    A forrás lehet CSV fájl elérési útja vagy már beolvasott sorok."""
+    if isinstance(source, (str, os.PathLike)):
+        source = handler.csv_reader(source)
+    game = PredictionGame(source, tiebreak, rules)
+    game.calculate_all_scores(vectorized=True)
+    # A rangsor is a munkafolyamatban készül el, és vele együtt utazik;
+    # résztvevő nélküli fordulóban (csak a szervező zárása) nincs mit
+    # rangsorolni.
+    if len(game.table):
+        _ = game.ranking.ranks
+    return game
+
+
+class SeasonResult:
+    """A szezon fordulónkénti eredményei és az összesített ponttábla.
+
+    matrix[i, j] az i-edik játékos pontja a j-edik fordulóban (0, ha
+    nem tippelt); a játékosok az első megjelenésük sorrendjében vannak.
+    A tiebreaks név -> a fordulók tiebreak láncának SEASON_TIEBREAKS-beli
+    kulcsai szerinti szezonösszegek, a láncban megadott sorrendben."""
+
+    def __init__(self, rounds: List[PredictionGame]):
+        """Felépíti a játékos × forduló mátrixot."""
+        self.rounds = rounds
+        self.names: List[str] = []
+        row_of_name: Dict[str, int] = {}
+        cells = []
+        keys = [key for key in (rounds[0].tiebreak if rounds else ())
+                if key in SEASON_TIEBREAKS]
+        sums: Dict[str, List[int]] = {}
+        for column, game in enumerate(rounds):
+            values = [getattr(game.table, TIEBREAK_COLUMNS[key][0]).tolist()
+                      for key in keys]
+            for row, (name, score) in enumerate(zip(
+                    game.table.names, game.table.total_scores.tolist())):
+                name = name.strip()
+                if name not in row_of_name:
+                    row_of_name[name] = len(self.names)
+                    self.names.append(name)
+                    sums[name] = [0] * len(keys)
+                cells.append((row_of_name[name], column, score))
+                for index, column_values in enumerate(values):
+                    sums[name][index] += column_values[row]
+        self.tiebreaks: Dict[str, Tuple[int, ...]] = {
+            name: tuple(values) for name, values in sums.items()}
+
+        self.matrix = np.zeros((len(self.names), len(rounds)),
+                               dtype=np.int64)
+        if cells:
+            rows, columns, scores = np.array(cells, dtype=np.int64).T
+            np.add.at(self.matrix, (rows, columns), scores)
+        self.totals = self.matrix.sum(axis=1)
+
+    def standings(self) -> List[Tuple[str, int]]:
+        """Összesített sorrend (név, pont) párokként: azonos pontnál a
+        tiebreaks, végül a név dönt, a tiebreaks-szel létrehozott
+        NKScoreAggregator sorrendjével egyezően."""
+        return sorted(zip(self.names, self.totals.tolist()),
+                      key=lambda x: (-x[1],
+                                     tuple(-v for v in self.tiebreaks[x[0]]),
+                                     x[0].casefold(), x[0]))
+
+
+class SeasonEngine:
+    """Sok forduló kiértékelése egy folyamatkészlettel (process pool).
+
+    Az eredmény sorrendje mindig a bemenet sorrendje, független attól,
+    hogy a munkafolyamatok milyen sorrendben végeznek."""
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 tiebreak: Sequence[str] = DEFAULT_TIEBREAK,
+                 chunksize: int = 1, rules: Optional[RuleSet] = None):
+        """max_workers: a munkafolyamatok száma (None = CPU magok száma,
+        1 = soros futás ugyanabban a folyamatban), rules: a fordulók
+        pontozási szabálykészlete (alapból az NK szabályai)."""
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.tiebreak = tuple(tiebreak)
+        self.chunksize = chunksize
+        self.rules = rules
+
+    def score(self, sources: Sequence[RoundSource]) -> SeasonResult:
+        """Kiértékeli az összes fordulót, és összesíti a szezont."""
+        sources = list(sources)
+        tiebreaks = [self.tiebreak] * len(sources)
+        rules = [self.rules] * len(sources)
+        if self.max_workers == 1 or len(sources) <= 1:
+            rounds = list(map(_score_round, sources, tiebreaks, rules))
+        else:
+            workers = min(self.max_workers, len(sources))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                rounds = list(executor.map(_score_round, sources, tiebreaks,
+                                           rules, chunksize=self.chunksize))
+        return SeasonResult(rounds)
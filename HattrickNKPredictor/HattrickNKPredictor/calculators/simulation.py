@@ -0,0 +1,281 @@
+"""Monte Carlo szimuláció a félkész forduló (és szezon) végeredményére."""
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from HattrickNKPredictor.calculators.batch import BatchScorer
+from HattrickNKPredictor.calculators.calculator import PredictionGame
+from HattrickNKPredictor.calculators.models import ScoreMatrix
+
+ReplaySampler = Callable[[np.random.Generator, int], np.ndarray]
+
+
+class ScoreDistribution:
+    """Egy meccs végeredményének eloszlása a 0..max_goals gólrácson.
+
+    A probabilities[h, a] a h-a végeredmény valószínűsége."""
+
+    def __init__(self, probabilities):
+        """Eltárolja (és 1-re normálja) a valószínűségi mátrixot."""
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if (probabilities.ndim != 2
+                or probabilities.shape[0] != probabilities.shape[1]):
+            raise ValueError("probabilities must be a square matrix")
+        if (probabilities < 0).any() or probabilities.sum() <= 0:
+            raise ValueError("probabilities must be non-negative "
+                             "and not all zero")
+        self.probabilities = probabilities / probabilities.sum()
+        self.max_goals = probabilities.shape[0] - 1
+        self._cumulative = np.cumsum(self.probabilities.ravel())
+
+    @classmethod
+    def poisson(cls, home_rate: float = 1.4, away_rate: float = 1.1,
+                max_goals: int = ScoreMatrix.DEFAULT_MAX_GOALS):
+        """Független Poisson gólszámok, a max_goals fölötti rész levágva."""
+        goals = np.arange(max_goals + 1)
+        factorials = np.array([math.factorial(g) for g in goals],
+                              dtype=np.float64)
+        home = np.exp(-home_rate) * home_rate ** goals / factorials
+        away = np.exp(-away_rate) * away_rate ** goals / factorials
+        return cls(np.outer(home, away))
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """size darab végeredmény a rács lapított indexeként
+        (h * (max_goals + 1) + a)."""
+        return np.minimum(
+            np.searchsorted(self._cumulative, rng.random(size), side='right'),
+            self.probabilities.size - 1)
+
+
+class SimulationResult:
+    """A szimuláció résztvevőnkénti összesítése."""
+
+    def __init__(self, names: List[str], ids: List[Optional[int]],
+                 win_probability: np.ndarray,
+                 podium_probability: np.ndarray,
+                 expected_rank: np.ndarray, scenarios: int):
+        """Eltárolja a résztvevőnkénti valószínűségeket."""
+        self.names = names
+        self.ids = ids
+        self.win_probability = win_probability
+        self.podium_probability = podium_probability
+        self.expected_rank = expected_rank
+        self.scenarios = scenarios
+
+    def summary(self) -> List[Tuple[str, float, float, float]]:
+        """(név, győzelmi esély, dobogós esély, várható helyezés)
+        sorok várható helyezés szerint rendezve."""
+        rows = zip(self.names, self.win_probability.tolist(),
+                   self.podium_probability.tolist(),
+                   self.expected_rank.tolist())
+        return sorted(rows, key=lambda row: (row[3], -row[1]))
+
+
+class StandingsSimulator:
+    """A még le nem játszott meccsek, a replay és a bónusz kimenetelét
+    sorsolja, és minden forgatókönyvben tömbösen pontoz mindenkit.
+
+    A függő (None) értékeket a PredictionGame live API-ja jelöli
+    (reset_results, set_result ...); az ismert részek pontjai a tábla
+    aktuális összpontszámából jönnek. A helyezés csak az összpontszámon
+    alapul, holtversenyben mindenki osztozik (közös győzelem is
+    győzelemnek számít). Azonos seed és chunk_size mellett az eredmény
+    reprodukálható."""
+
+    def __init__(self, game: PredictionGame,
+                 score_distributions: Union[
+                     ScoreDistribution,
+                     Dict[int, ScoreDistribution], None] = None,
+                 replay_sampler: Optional[ReplaySampler] = None,
+                 bonus_options: Optional[Dict[str, float]] = None,
+                 base_scores: Optional[Sequence[int]] = None,
+                 other_competitors: Optional[Dict[str, int]] = None,
+                 seed: Optional[int] = None, chunk_size: int = 4096):
+        """Inicializálja a szimulációt.
+
+        score_distributions: egy közös vagy meccsindexenkénti eloszlás,
+        replay_sampler: (rng, méret) -> (méret, 3) replay értékek,
+        bonus_options: bónusz válasz -> valószínűség (alapból a
+        résztvevők válaszai egyenlő eséllyel), base_scores: a korábbi
+        fordulók pontjai résztvevőnként (szezon szimulációhoz),
+        other_competitors: a fordulóban nem tippelő, de a szezonban
+        versenyben lévő játékosok név -> pont párjai."""
+        self.game = game
+        self.rng = np.random.default_rng(seed)
+        self.chunk_size = chunk_size
+        self.replay_sampler = replay_sampler or self.dirichlet_replay
+        table = game.table
+
+        self.names = list(table.names)
+        self.ids: List[Optional[int]] = table.ids.tolist()
+        base = np.asarray(table.total_scores, dtype=np.int64).copy()
+        if base_scores is not None:
+            base += np.asarray(base_scores, dtype=np.int64)
+        others = other_competitors or {}
+        self.names.extend(others)
+        self.ids.extend([None] * len(others))
+        self.base = np.concatenate(
+            [base, np.fromiter(others.values(), dtype=np.int64,
+                               count=len(others))])
+        padding = len(others)
+
+        self.dimensions: List[Tuple[np.ndarray, Callable]] = []
+        self._add_match_dimensions(score_distributions, padding)
+        self._add_replay_dimensions(padding)
+        self._add_bonus_dimension(bonus_options, padding)
+
+    @staticmethod
+    def dirichlet_replay(rng: np.random.Generator, size: int) -> np.ndarray:
+        """Alapértelmezett replay sorsolás: három, 100-ra összegződő érték
+        egyenletes (Dirichlet(1, 1, 1)) arányokkal."""
+        shares = rng.dirichlet((1.0, 1.0, 1.0), size)
+        return rng.multinomial(100, shares)
+
+    def _add_dimension(self, points: np.ndarray, sampler: Callable,
+                       padding: int):
+        """Felvesz egy sorsolandó dimenziót: points[k] a k-adik kimenetel
+        résztvevőnkénti pontja (a többi versenyző 0 pontot kap)."""
+        points = np.pad(points, ((0, 0), (0, padding)))
+        self.dimensions.append((np.ascontiguousarray(points,
+                                                     dtype=np.int32),
+                                sampler))
+
+    def _add_match_dimensions(self, score_distributions, padding: int):
+        """A függő meccsek pont-táblái a teljes gólrácsra."""
+        table = self.game.table
+        results = list(self.game.correct_results)
+        results += [None] * (table.match_count - len(results))
+        if not isinstance(score_distributions, dict):
+            default = score_distributions or ScoreDistribution.poisson()
+            score_distributions = {}
+        else:
+            default = ScoreDistribution.poisson()
+
+        for match_index, actual in enumerate(results):
+            if actual is not None:
+                continue
+            distribution = score_distributions.get(match_index, default)
+            size = distribution.max_goals + 1
+            scorer = table.scorer(ScoreMatrix.shared(distribution.max_goals,
+                                                     table.rules))
+            points = np.stack([
+                scorer.column_points(match_index, divmod(k, size))
+                for k in range(size * size)
+            ])
+            self._add_dimension(points, distribution.sample, padding)
+
+    def _add_replay_dimensions(self, padding: int):
+        """A függő replay elemek pont-táblái 0..100 között."""
+        pending = [i for i, value in enumerate(self.game.correct_replay)
+                   if value is None]
+        if not pending:
+            return
+        values = np.arange(101)
+        samples = {}
+
+        def make_sampler(component):
+            def sample(rng, size):
+                # Egy forgatókönyvhöz mindhárom elemet együtt sorsoljuk.
+                if component == pending[0]:
+                    samples["replay"] = np.clip(
+                        self.replay_sampler(rng, size), 0, 100)
+                return samples["replay"][:, component]
+            return sample
+
+        for component in pending:
+            diff = np.abs(values[:, np.newaxis]
+                          - self.game.table.replay[np.newaxis, :, component])
+            self._add_dimension(
+                BatchScorer.replay_band_points(diff, self.game.rules),
+                make_sampler(component), padding)
+
+    def _add_bonus_dimension(self, bonus_options, padding: int):
+        """A függő bónusz kérdés kimenetelei."""
+        if self.game.correct_bonus is not None:
+            return
+        if not bonus_options:
+            answers = sorted(set(self.game.table.bonus))
+            bonus_options = {answer: 1.0 for answer in answers}
+        options = list(bonus_options)
+        weights = np.array([bonus_options[o] for o in options],
+                           dtype=np.float64)
+        cumulative = np.cumsum(weights / weights.sum())
+        points = np.stack([
+            BatchScorer.bonus_points(self.game.table.bonus, option,
+                                     self.game.rules)
+            for option in options
+        ])
+
+        def sample(rng, size):
+            return np.minimum(np.searchsorted(cumulative, rng.random(size),
+                                              side='right'),
+                              len(options) - 1)
+
+        self._add_dimension(points, sample, padding)
+
+    # A hisztogram legfeljebb ennyi cellás lehet (forgatókönyv x
+    # pontszám-szélesség); e fölött a rendezéses számítás a kisebb.
+    MAX_HISTOGRAM_CELLS = 1 << 22
+
+    @classmethod
+    def competition_ranks(cls, scores: np.ndarray) -> np.ndarray:
+        """Forgatókönyvenkénti (soronkénti) versenyes helyezés rendezés
+        nélkül: a pontok korlátosak, így soronkénti hisztogramból
+        számolható, hányan állnak valaki előtt.
+
+        A hisztogram szélessége a sorok pontterjedelme (a soronkénti
+        minimumtól); ha a cellák száma túllépi a MAX_HISTOGRAM_CELLS-t
+        (pl. egy messze elhúzó szezonlista), rendezéssel számol."""
+        scenario_count, _ = scores.shape
+        low = scores.min(axis=1, keepdims=True)
+        width = int((scores.max(axis=1, keepdims=True) - low).max()) + 1
+        if scenario_count * width > cls.MAX_HISTOGRAM_CELLS:
+            return cls._sorted_competition_ranks(scores)
+        offsets = (scores - low).astype(np.intp)
+        offsets += np.arange(0, scenario_count * width, width,
+                             dtype=np.intp)[:, np.newaxis]
+        counts = np.bincount(offsets.ravel(),
+                             minlength=scenario_count * width
+                             ).reshape(scenario_count, width)
+        at_least = np.cumsum(counts[:, ::-1], axis=1)[:, ::-1]
+        greater = (at_least - counts + 1).astype(np.int32)
+        return greater.ravel()[offsets]
+
+    @staticmethod
+    def _sorted_competition_ranks(scores: np.ndarray) -> np.ndarray:
+        """A competition_ranks soronkénti rendezéssel: a csökkenő sorrend
+        minden holtverseny-csoportja az első tagja helyezését kapja."""
+        order = np.argsort(-scores, axis=1, kind='stable')
+        ordered = np.take_along_axis(scores, order, axis=1)
+        positions = np.arange(scores.shape[1], dtype=np.int32)
+        group_start = np.where(
+            np.concatenate([np.ones((scores.shape[0], 1), dtype=bool),
+                            ordered[:, 1:] != ordered[:, :-1]], axis=1),
+            positions, 0)
+        ranks = np.empty(scores.shape, dtype=np.int32)
+        np.put_along_axis(ranks, order,
+                          np.maximum.accumulate(group_start, axis=1) + 1,
+                          axis=1)
+        return ranks
+
+    def run(self, scenarios: int = 100_000) -> SimulationResult:
+        """Lefuttatja a szimulációt scenarios forgatókönyvvel."""
+        competitors = len(self.base)
+        wins = np.zeros(competitors, dtype=np.int64)
+        podiums = np.zeros(competitors, dtype=np.int64)
+        rank_sums = np.zeros(competitors, dtype=np.int64)
+
+        for start in range(0, scenarios, self.chunk_size):
+            size = min(self.chunk_size, scenarios - start)
+            scores = np.repeat(self.base[np.newaxis, :].astype(np.int32),
+                               size, axis=0)
+            for points, sampler in self.dimensions:
+                scores += points[sampler(self.rng, size)]
+            ranks = self.competition_ranks(scores)
+            wins += (ranks == 1).sum(axis=0)
+            podiums += (ranks <= 3).sum(axis=0)
+            rank_sums += ranks.sum(axis=0)
+
+        total = max(scenarios, 1)
+        return SimulationResult(self.names, self.ids, wins / total,
+                                podiums / total, rank_sums / total,
+                                scenarios)
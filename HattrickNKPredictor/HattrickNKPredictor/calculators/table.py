@@ -0,0 +1,222 @@
+"""Oszlopos (columnar) tároló a résztvevők tippjeihez és pontjaihoz."""
+import sys
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from HattrickNKPredictor.calculators.batch import BatchScorer
+from HattrickNKPredictor.calculators.models import Participant, ScoreMatrix
+from HattrickNKPredictor.calculators.rules import DEFAULT_RULES, RuleSet
+
+
+class ParticipantRow:
+    """Könnyűsúlyú nézet a ParticipantTable egy sorára.
+
+    Ugyanazokat az attribútumokat adja, mint a Participant, így az
+    exportálás és a rangsorolás változtatás nélkül működik vele."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table, index: int):
+        """Eltárolja a táblát és a sor indexét."""
+        self._table = table
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        """A résztvevő azonosítója (a hozzászólás sorszáma)."""
+        return int(self._table.ids[self._index])
+
+    @property
+    def name(self) -> str:
+        """A résztvevő neve."""
+        return self._table.names[self._index]
+
+    @property
+    def predictions(self) -> List[Tuple[int, int]]:
+        """A meccsenkénti (hazai, vendég) tippek."""
+        return [tuple(pred) for pred in
+                self._table.predictions[self._index].tolist()]
+
+    @property
+    def tuti_match(self) -> int:
+        """A tuti meccs 1-től számozott sorszáma (0 = nincs)."""
+        return int(self._table.tuti[self._index])
+
+    @property
+    def replay(self) -> Tuple[int, int, int]:
+        """A replay tipp."""
+        return tuple(self._table.replay[self._index].tolist())
+
+    @property
+    def bonus(self) -> str:
+        """A bónusz kérdésre adott válasz."""
+        return self._table.bonus[self._index]
+
+    @property
+    def match_scores(self) -> List[int]:
+        """A meccsenként szerzett pontok."""
+        return self._table.match_scores[self._index].tolist()
+
+    @property
+    def replay_score(self) -> int:
+        """A replay tippért járó pont."""
+        return int(self._table.replay_scores[self._index])
+
+    @property
+    def bonus_score(self) -> int:
+        """A bónusz kérdésért járó pont."""
+        return int(self._table.bonus_scores[self._index])
+
+    @property
+    def total_score(self) -> int:
+        """Az összpontszám."""
+        return int(self._table.total_scores[self._index])
+
+    def to_participant(self) -> Participant:
+        """Önálló Participant objektumot készít a sor adataiból."""
+        return Participant(self.id, self.name, self.predictions, {
+            "tuti_match": self.tuti_match,
+            "replay": self.replay,
+            "bonus": self.bonus
+        })
+
+    def calculate_scores(self, actual_results: List[Tuple[int, int]],
+                         actual_replay: Tuple[int, int, int],
+                         correct_bonus: str):
+        """Objektumonkénti pontszámítás a Participant szabályaival,
+        az eredményt visszaírja a táblába."""
+        participant = self.to_participant()
+        participant.calculate_scores(actual_results, actual_replay,
+                                     correct_bonus, self._table.rules)
+        self._table.store_scores(self._index, participant.match_scores,
+                                 participant.replay_score,
+                                 participant.bonus_score)
+
+
+class ParticipantTable:
+    """A résztvevők adatait oszloponként, tömbökben tárolja.
+
+    predictions: (n, meccsek, 2), tuti: (n,), replay: (n, 3),
+    a pontok pedig match_scores: (n, meccsek) és (n,) oszlopok.
+    A meccsek száma tetszőleges, fordulónként eltérhet; a pontozás a
+    rules szabálykészlet szerint történik."""
+
+    def __init__(self, ids: Sequence[int], names: Sequence[str],
+                 predictions, tuti: Sequence[int], replay,
+                 bonus: Sequence[str], rules: RuleSet = None):
+        """Inicializálja az oszlopokat és nullázza a pontokat."""
+        self.rules = rules or DEFAULT_RULES
+        self.ids = np.asarray(ids, dtype=np.int64)
+        participant_count = len(self.ids)
+        self.names = [sys.intern(name) for name in names]
+        self.predictions = np.asarray(predictions, dtype=np.int32)
+        if (self.predictions.ndim != 3
+                or self.predictions.shape[0] != participant_count
+                or self.predictions.shape[2] != 2):
+            raise ValueError("predictions must have shape (n, matches, 2)")
+        self.tuti = np.asarray(tuti, dtype=np.int32)
+        self.replay = np.asarray(replay, dtype=np.int32).reshape(
+            participant_count, 3)
+        self.bonus = [sys.intern(answer) for answer in bonus]
+        self.match_scores = np.zeros(self.predictions.shape[:2],
+                                     dtype=np.int32)
+        self.replay_scores = np.zeros(participant_count, dtype=np.int32)
+        self.bonus_scores = np.zeros(participant_count, dtype=np.int32)
+        self.total_scores = np.zeros(participant_count, dtype=np.int32)
+        self.exact_hits = np.zeros(participant_count, dtype=np.int32)
+        self.tuti_hits = np.zeros(participant_count, dtype=np.int32)
+
+    @property
+    def match_count(self) -> int:
+        """A fordulóban szereplő meccsek száma."""
+        return self.predictions.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> ParticipantRow:
+        if not -len(self) <= index < len(self):
+            raise IndexError("participant index out of range")
+        return ParticipantRow(self, index % len(self))
+
+    def __iter__(self):
+        return (ParticipantRow(self, index) for index in range(len(self)))
+
+    def rows(self) -> List[ParticipantRow]:
+        """Visszaadja az összes sor nézetét."""
+        return list(self)
+
+    def store_scores(self, index: int, match_scores: Sequence[int],
+                     replay_score: int, bonus_score: int):
+        """Beírja egy sor pontjait és frissíti az összpontszámát."""
+        self.match_scores[index, :len(match_scores)] = match_scores
+        self.replay_scores[index] = replay_score
+        self.bonus_scores[index] = bonus_score
+        self.total_scores[index] = (self.match_scores[index].sum()
+                                    + replay_score + bonus_score)
+
+    def update_statistics(self, actual_results: List[Tuple[int, int]]):
+        """Kiszámolja a holtverseny-feloldáshoz használt statisztikákat:
+        a telitalálatok számát és hogy a tuti meccs hozott-e pontot."""
+        scored = min(self.match_count, len(actual_results))
+        known = np.array([a is not None for a in actual_results[:scored]],
+                         dtype=bool)
+        actual = np.array([a if a is not None else (0, 0)
+                           for a in actual_results[:scored]],
+                          dtype=np.int32).reshape(scored, 2)
+        exact = (self.predictions[:, :scored] == actual).all(axis=2)
+        self.exact_hits[:] = (exact & known).sum(axis=1)
+
+        tuti_column = self.tuti - 1
+        has_tuti = (tuti_column >= 0) & (tuti_column < self.match_count)
+        tuti_points = self.match_scores[np.arange(len(self)),
+                                        np.where(has_tuti, tuti_column, 0)]
+        self.tuti_hits[:] = has_tuti & (tuti_points > 0)
+
+    def scorer(self, score_matrix: ScoreMatrix = None) -> BatchScorer:
+        """A tábla oszlopaira épülő (másolás nélküli) BatchScorer, alapból
+        a tábla szabálykészletének közös pont-táblájával."""
+        return BatchScorer(self.predictions, self.tuti, self.replay,
+                           self.bonus, score_matrix=(
+                               score_matrix
+                               or ScoreMatrix.shared(rules=self.rules)))
+
+    def score(self, actual_results: List[Tuple[int, int]],
+              actual_replay: Tuple[int, int, int], correct_bonus: str,
+              score_matrix: ScoreMatrix = None):
+        """Az összes sor pontjait a BatchScorer tömbös motorjával számolja."""
+        scorer = self.scorer(score_matrix)
+        scorer.score(actual_results, actual_replay, correct_bonus)
+        self.match_scores[:] = scorer.match_scores
+        self.replay_scores[:] = scorer.replay_scores
+        self.bonus_scores[:] = scorer.bonus_scores
+        self.total_scores[:] = scorer.total_scores
+
+    def rescore_match(self, match_index: int,
+                      actual: Optional[Tuple[int, int]],
+                      score_matrix: ScoreMatrix = None) -> np.ndarray:
+        """Csak egy meccs oszlopát számolja újra, az összpontszámot a
+        változásból frissíti. Visszaadja a résztvevőnkénti változást."""
+        points = self.scorer(score_matrix).column_points(match_index, actual)
+        delta = points - self.match_scores[:, match_index]
+        self.match_scores[:, match_index] = points
+        self.total_scores += delta
+        return delta
+
+    def rescore_replay(self, actual_replay: Sequence[Optional[int]]
+                       ) -> np.ndarray:
+        """Újraszámolja a replay pontokat, és visszaadja a változást."""
+        points = BatchScorer.replay_points(self.replay, actual_replay,
+                                           self.rules)
+        delta = points - self.replay_scores
+        self.replay_scores[:] = points
+        self.total_scores += delta
+        return delta
+
+    def rescore_bonus(self, correct_bonus: Optional[str]) -> np.ndarray:
+        """Újraszámolja a bónusz pontokat, és visszaadja a változást."""
+        points = BatchScorer.bonus_points(self.bonus, correct_bonus,
+                                          self.rules)
+        delta = points - self.bonus_scores
+        self.bonus_scores[:] = points
+        self.total_scores += delta
+        return delta
@@ -1,93 +1,401 @@
 """Authentication and session management
  for Hattrick using Selenium and Requests."""
 
+import atexit
+import hashlib
+import hmac
+import json
 import os
+import secrets
+import threading
 import time
+from contextlib import contextmanager
+from urllib.parse import urljoin
 import requests
+from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.common import TimeoutException
 from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from HattrickNKPredictor.forum.fetch_scheduler import FetchScheduler
 
 download_dir = os.path.dirname(os.path.abspath(__file__))
 
 
+def user_config_dir():
+    """Per-user directory for the app's private files: %APPDATA% on
+    Windows, $XDG_CONFIG_HOME (or ~/.config) elsewhere."""
+    if os.name == "nt":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        base = (os.environ.get("XDG_CONFIG_HOME")
+                or os.path.join(os.path.expanduser("~"), ".config"))
+    return os.path.join(base, "HattrickNKPredictor")
+
+
+COOKIE_CACHE_PATH = os.path.join(user_config_dir(), "session_cookies.json")
+COOKIE_CACHE_VERSION = 2
+# PBKDF2 rounds of the password check stored next to the cached cookies.
+PASSWORD_CHECK_ROUNDS = 100_000
+
+# Ids of the user name inputs on the forum and the main login forms.
+USERNAME_INPUT_IDS = ("ctl00_ctl00_CPContent_ucLogin_txtUserName",
+                      "inputLoginname")
+FORUM_LOGIN_PREFIX = "ctl00_ctl00_CPContent_ucLogin_"
+COOKIE_BANNER = (By.CSS_SELECTOR, '.cky-btn.cky-btn-accept')
+
+# Seconds to wait for each browser login condition.
+DEFAULT_TIMEOUTS = {
+    "page_load": 30,      # driver.get until the document is loaded
+    "cookie_banner": 3,   # the consent pop-up to become clickable
+    "element": 10,        # a form element to become usable
+    "authenticated": 20,  # the login form to disappear after submit
+}
+POLL_FREQUENCY = 0.1
+
+
+class LoginError(Exception):
+    """Raised when the HTTP login form cannot be used or is rejected."""
+
+
+def create_browser():
+    """Starts a headless Firefox browser with download preferences."""
+    options = Options()
+    options.headless = True
+    options.set_preference("browser.download.folderList", 2)
+    options.set_preference("browser.download.manager"
+                           ".showWhenStarting", False)
+    options.set_preference("browser.download.dir", download_dir)
+    options.set_preference("browser.helperApps.neverAsk."
+                           "saveToDisk", "text/csv")
+    return webdriver.Firefox(options=options)
+
+
+class DriverPool:
+    """Keeps a single browser per process for every AuthManager.
+
+    The browser is started on first use, handed to each consumer in turn
+    and quit once at interpreter exit (or on shutdown). authenticated_as
+    is the user whose Hattrick login the browser currently holds, so
+    later consumers can skip the login form."""
+
+    def __init__(self, factory=create_browser):
+        """factory: callable that starts a new browser."""
+        self.factory = factory
+        self.starts = 0
+        self.authenticated_as = None
+        self._driver = None
+        self._lock = threading.Lock()
+        self._registered = False
+
+    def acquire(self):
+        """Returns the shared browser, starting it if needed."""
+        with self._lock:
+            if self._driver is None:
+                self._driver = self.factory()
+                self.starts += 1
+                if not self._registered:
+                    atexit.register(self.shutdown)
+                    self._registered = True
+            return self._driver
+
+    def shutdown(self):
+        """Quits the shared browser if it is running."""
+        with self._lock:
+            driver, self._driver = self._driver, None
+            self.authenticated_as = None
+        if driver is not None:
+            driver.quit()
+
+
+DRIVER_POOL = DriverPool()
+
+
 class AuthManager:
     """Handles authentication and session transfer for the Hattrick website."""
 
-    def __init__(self, username, password, url):
+    def __init__(self, username, password, url, scheduler=None,
+                 cookie_path=None, driver_pool=None, timeouts=None):
+        """scheduler: the FetchScheduler that paces and retries the
+        requests of the transferred session (a default one if omitted),
+        cookie_path: file to keep the session cookies in between runs
+        (no caching if omitted), driver_pool: the DriverPool to take the
+        browser from (the process-wide DRIVER_POOL if omitted),
+        timeouts: overrides for DEFAULT_TIMEOUTS."""
         self.username = username
         self.password = password
         self.url = url
+        self.scheduler = scheduler or FetchScheduler()
+        self.cookie_path = cookie_path
+        self.session_source = None
+        self.driver_pool = driver_pool or DRIVER_POOL
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.timings = {}
         self.driver = None
 
+    @contextmanager
+    def step(self, name):
+        """Times a login step into timings (seconds by step name)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = (self.timings.get(name, 0.0)
+                                  + time.perf_counter() - started)
+
+    def format_timings(self):
+        """One-line breakdown of the login time by step."""
+        return ", ".join(f"{name} {seconds:.2f} s"
+                         for name, seconds in self.timings.items())
+
+    def wait(self, timeout, condition):
+        """Waits until the condition holds, for the named timeout."""
+        return WebDriverWait(self.driver, self.timeouts[timeout],
+                             poll_frequency=POLL_FREQUENCY).until(condition)
+
     def setup_browser(self):
-        """Sets up headless Firefox browser with download preferences."""
-        options = Options()
-        options.headless = True
-        options.set_preference("browser.download.folderList", 2)
-        options.set_preference("browser.download.manager"
-                               ".showWhenStarting", False)
-        options.set_preference("browser.download.dir", download_dir)
-        options.set_preference("browser.helperApps.neverAsk."
-                               "saveToDisk", "text/csv")
-        self.driver = webdriver.Firefox(options=options)
+        """Takes the shared headless browser from the driver pool.
+
+        Returns whether the browser is already logged in as this user."""
+        with self.step("browser start"):
+            self.driver = self.driver_pool.acquire()
+            self.driver.set_page_load_timeout(self.timeouts["page_load"])
+        return self.driver_pool.authenticated_as == self.username
+
+    def open_page(self):
+        """Loads the login URL (driver.get returns once it is loaded)."""
+        with self.step("page load"):
+            self.driver.get(self.url)
 
     def accept_cookies(self):
-        """Accepts cookies if a pop-up appears."""
-        try:
-            WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR,
-                                            '.cky-btn.cky-btn-accept'))
-            ).click()
-        except TimeoutException:
-            pass
+        """Accepts cookies if a pop-up appears, and waits until it is
+        gone so it does not cover the login form."""
+        with self.step("cookie banner"):
+            try:
+                banner = self.wait("cookie_banner",
+                                   EC.element_to_be_clickable(COOKIE_BANNER))
+            except TimeoutException:
+                return
+            banner.click()
+            self.wait("element",
+                      EC.invisibility_of_element_located(COOKIE_BANNER))
+
+    def submit_login(self, username_locator, password_locator,
+                     button_locator):
+        """Fills in and submits a login form once its fields are usable,
+        then waits until the password field is gone."""
+        with self.step("submit"):
+            (self.wait("element",
+                       EC.element_to_be_clickable(username_locator))
+             .send_keys(self.username))
+            (self.wait("element",
+                       EC.element_to_be_clickable(password_locator))
+             .send_keys(self.password))
+            self.wait("element",
+                      EC.element_to_be_clickable(button_locator)).click()
+        with self.step("authenticated"):
+            try:
+                self.wait("authenticated",
+                          EC.invisibility_of_element_located(
+                              password_locator))
+            except TimeoutException as e:
+                raise LoginError("The browser login was not accepted") from e
+        self.driver_pool.authenticated_as = self.username
 
     def login(self):
         """Logs in via the main login page."""
-        self.setup_browser()
-        self.driver.get(self.url)
+        logged_in = self.setup_browser()
+        self.open_page()
+        if logged_in:
+            return
         self.accept_cookies()
-        time.sleep(1)
-        self.driver.find_element("link text", "Belépés").click()
-        time.sleep(1)
-        (self.driver.find_element(By.ID,
-                                  "inputLoginname")
-         .send_keys(self.username))
-        (self.driver.find_element(By.ID,
-                                  "inputPassword")
-         .send_keys(self.password))
-        self.driver.find_element(By.CSS_SELECTOR,
-                                 "button.primary-button").click()
-        time.sleep(1)
+        with self.step("submit"):
+            self.wait("element", EC.element_to_be_clickable(
+                (By.LINK_TEXT, "Belépés"))).click()
+        self.submit_login((By.ID, "inputLoginname"),
+                          (By.ID, "inputPassword"),
+                          (By.CSS_SELECTOR, "button.primary-button"))
 
     def login_forum(self):
         """Logs in via the forum login page."""
-        self.setup_browser()
-        self.driver.get(self.url)
-        time.sleep(1)
+        logged_in = self.setup_browser()
+        self.open_page()
+        if logged_in:
+            return
         self.accept_cookies()
-        time.sleep(1)
-        (self.driver.find_element(By.ID,
-                                  "ctl00_ctl00_CPContent_ucLogin_txtUserName")
-         .send_keys(self.username))
-        (self.driver.find_element(By.ID,
-                                  "ctl00_ctl00_CPContent_ucLogin_txtPassword")
-         .send_keys(self.password))
-        (self.driver.find_element
-         (By.ID, 'ctl00_ctl00_CPContent_ucLogin_butLogin').click())
-        time.sleep(1)
+        self.submit_login((By.ID, f"{FORUM_LOGIN_PREFIX}txtUserName"),
+                          (By.ID, f"{FORUM_LOGIN_PREFIX}txtPassword"),
+                          (By.ID, f"{FORUM_LOGIN_PREFIX}butLogin"))
+
+    def http_login(self):
+        """Logs in without a browser and returns the authenticated session.
+
+        Reads the login form of the page (with its hidden ASP.NET state
+        fields such as __VIEWSTATE and __EVENTVALIDATION), posts the
+        credentials and checks that the login form is gone afterwards."""
+        session = self.scheduler.session()
+        response = session.get(self.url)
+        response.raise_for_status()
+        action, fields = self.read_login_form(response.text, response.url)
+        response = session.post(action, data=fields)
+        response.raise_for_status()
+        if self.find_login_form(response.text) is not None:
+            raise LoginError("Login was rejected")
+        return session
+
+    def read_login_form(self, html, page_url):
+        """Returns the action URL and the filled-in fields of the login
+        form on the page."""
+        form = self.find_login_form(html)
+        if form is None:
+            raise LoginError("No login form found")
+        fields = {}
+        username_input = None
+        for tag in form.find_all("input"):
+            name = tag.get("name")
+            kind = tag.get("type", "text").lower()
+            if not name:
+                continue
+            if kind == "hidden":
+                fields[name] = tag.get("value", "")
+            elif kind == "password":
+                fields[name] = self.password
+            elif kind in ("text", "email") and (
+                    username_input is None
+                    or tag.get("id") in USERNAME_INPUT_IDS):
+                username_input = tag
+        if username_input is None:
+            raise LoginError("No user name field in the login form")
+        fields[username_input["name"]] = self.username
+        submit = form.find(["input", "button"], type="submit",
+                           attrs={"name": True})
+        if submit is not None:
+            fields[submit["name"]] = submit.get("value", "")
+        return urljoin(page_url, form.get("action") or page_url), fields
+
+    @staticmethod
+    def find_login_form(html):
+        """The form holding a password input, or None."""
+        soup = BeautifulSoup(html, "html.parser")
+        password = soup.find("input", type="password")
+        return password.find_parent("form") if password else None
+
+    def open_session(self, fallback=None):
+        """Returns an authenticated requests session.
+
+        Reuses the cached cookies while they are still accepted and the
+        password matches the one they were saved with. Otherwise
+        tries the browserless HTTP login first and falls back to the
+        Selenium login (login_forum unless another fallback is given)
+        if the form flow does not work. session_source tells which of
+        "cache", "http" or "browser" was used, and timings how long each
+        step took."""
+        self.timings = {}
+        with self.step("cookie probe"):
+            session = self.load_session()
+        if session is not None:
+            self.session_source = "cache"
+            return session
+        try:
+            with self.step("http login"):
+                session = self.http_login()
+            self.session_source = "http"
+        except (LoginError, requests.RequestException) as e:
+            print(f"HTTP login failed ({e}), falling back to the browser")
+            (fallback or self.login_forum)()
+            session = self.convert_cookies_to_requests()
+            self.session_source = "browser"
+        self.save_session(session)
+        return session
+
+    def password_check(self, salt):
+        """Salted PBKDF2 hash of the password, stored with the cookies so
+        that a cached session is only reused with the same password."""
+        return hashlib.pbkdf2_hmac("sha256", self.password.encode("utf-8"),
+                                   bytes.fromhex(salt),
+                                   PASSWORD_CHECK_ROUNDS).hex()
+
+    def load_session(self):
+        """Returns a session with the cached cookies of this user if the
+        password matches the cached one and one probe request shows that
+        they are still logged in, else None."""
+        if self.cookie_path is None:
+            return None
+        try:
+            with open(self.cookie_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (data.get("version") != COOKIE_CACHE_VERSION
+                or data.get("username") != self.username
+                or not hmac.compare_digest(
+                    data.get("password_check", ""),
+                    self.password_check(data.get("salt", "")))):
+            return None
+        session = self.scheduler.session()
+        now = time.time()
+        for cookie in data["cookies"]:
+            if cookie["expires"] is not None and cookie["expires"] < now:
+                continue
+            session.cookies.set(cookie["name"], cookie["value"],
+                                domain=cookie["domain"],
+                                path=cookie["path"],
+                                expires=cookie["expires"],
+                                secure=cookie["secure"])
+        if not session.cookies:
+            return None
+        try:
+            response = session.get(self.url)
+        except requests.RequestException:
+            return None
+        if (response.status_code != 200
+                or self.find_login_form(response.text) is not None):
+            return None
+        return session
+
+    def save_session(self, session):
+        """Stores the session cookies in cookie_path, readable only by
+        the current user.
+
+        On POSIX the file gets mode 0600 in a 0700 directory. On Windows
+        chmod only toggles the read-only flag, so there the protection
+        comes from the per-user profile directory (%APPDATA%) alone; the
+        cookies themselves are stored unencrypted. The password is only
+        kept as a salted hash (password_check)."""
+        if self.cookie_path is None:
+            return
+        directory = os.path.dirname(self.cookie_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        salt = secrets.token_hex(16)
+        data = {
+            "version": COOKIE_CACHE_VERSION,
+            "username": self.username,
+            "salt": salt,
+            "password_check": self.password_check(salt),
+            "cookies": [{"name": cookie.name, "value": cookie.value,
+                         "domain": cookie.domain, "path": cookie.path,
+                         "expires": cookie.expires, "secure": cookie.secure}
+                        for cookie in session.cookies],
+        }
+        temporary = f"{self.cookie_path}.tmp"
+        fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                     0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.chmod(temporary, 0o600)
+        os.replace(temporary, self.cookie_path)
 
     def convert_cookies_to_requests(self):
-        """Transfers Selenium cookies to a requests session."""
-        s = requests.Session()
+        """Transfers Selenium cookies to a rate-limited, retrying
+        requests session."""
+        s = self.scheduler.session()
         for cookie in self.driver.get_cookies():
             s.cookies.set(cookie['name'], cookie['value'])
         return s
 
     def close(self):
-        """Closes the browser if open."""
-        if self.driver:
-            self.driver.quit()
+        """Hands the browser back; the pool quits it once at exit."""
+        self.driver = None
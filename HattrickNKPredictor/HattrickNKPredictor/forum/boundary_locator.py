@@ -0,0 +1,217 @@
+"""A fordulók határainak keresése a hozzászólások sorszáma szerint.
+
+A sorszámok időrendben nőnek, és bármelyik oldal közvetlenül letölthető
+az n= eltolással, így egy nap első és utolsó hozzászólása bináris
+kereséssel, O(log N) oldal letöltésével megtalálható.
+
+A keresés feltételezi, hogy a dátumok a sorszámmal együtt nőnek. A
+dátum azonban a felhasználók által beírt táblázatfejlécből jön, így egy
+régi dátumú, bemásolt táblázat ezt megsértheti. A kereső ezért minden
+határ két oldalát és az összes letöltött hozzászólás sorrendjét
+ellenőrzi, és eltérés esetén UnorderedDates hibát dob; a le nem töltött
+oldalakon lévő eltéréseket nem láthatja."""
+from typing import Callable, Dict, List, Optional, Tuple
+
+# (sorszám, dátum, szerző) - a ForumDateAnalyzer.extract_post_data alakja
+PostData = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class UnorderedDates(ValueError):
+    """A letöltött hozzászólások dátumai nem nőnek a sorszámmal, így a
+    bináris keresés eredménye nem megbízható."""
+
+
+class DatedPost:
+    """Egy dátumozott hozzászólás sorszáma, dátuma és szerzője."""
+
+    __slots__ = ("number", "date", "author")
+
+    def __init__(self, number: int, date: str, author: Optional[str]):
+        """Eltárolja a hozzászólás adatait."""
+        self.number = number
+        self.date = date
+        self.author = author
+
+
+class BoundaryLocator:
+    """Dátumhatárok keresése az n= eltolású oldalak lekérésével.
+
+    fetch_wrappers: egy oldal URL-jéből a .cfWrapper elemeket adja,
+    extract_post_data: egy elemből a (sorszám, dátum, szerző) hármast,
+    forum_url: a szál címe az n= paraméter elé. A letöltött oldalak
+    minden hozzászólását megjegyzi, így a keresés vége felé a próbák
+    már a memóriából válaszolnak. A fetches a letöltött oldalak száma."""
+
+    def __init__(self, fetch_wrappers: Callable[[str], list],
+                 extract_post_data: Callable[[object], PostData],
+                 forum_url: str, page_size: int = 20):
+        """Inicializálja a keresőt (a page_size csak a kezdő lépésköz,
+        az első letöltött oldal alapján pontosodik)."""
+        self.fetch_wrappers = fetch_wrappers
+        self.extract_post_data = extract_post_data
+        self.forum_url = forum_url
+        self.page_size = page_size
+        self.fetches = 0
+        # sorszám -> dátumozott hozzászólás, vagy None, ha nincs dátuma
+        self._posts: Dict[int, Optional[DatedPost]] = {}
+        self._end: Optional[int] = None
+
+    def first_dated(self, number: int) -> Optional[DatedPost]:
+        """Az első dátumozott hozzászólás a number sorszámtól kezdve
+        (None, ha a szál addig véget ér)."""
+        while True:
+            if self._end is not None and number > self._end:
+                return None
+            if number not in self._posts:
+                self._fetch(number)
+                continue
+            post = self._posts[number]
+            if post is not None:
+                return post
+            number += 1
+
+    def date_bounds(self, date: str) -> Optional[Tuple[int, int,
+                                                       Optional[str]]]:
+        """A date napjának első és utolsó dátumozott hozzászólása és az
+        utolsó szerzője; None, ha a napról nincs hozzászólás."""
+        start = self._search(1, lambda post: post.date >= date)
+        first = self.first_dated(start)
+        if first is None or first.date != date:
+            return None
+        self._confirm(self._previous_dated(first.number), first)
+        last = self._last_of_day(first)
+        self.check_order()
+        return first.number, last.number, last.author
+
+    def round_range(self, date: str,
+                    organiser: str) -> Optional[Tuple[int, int]]:
+        """Egy forduló tartománya a get_date_ranges alakjában (a nap első
+        hozzászólása utántól az utolsóig), ha a szervező zárta le."""
+        bounds = self.date_bounds(date)
+        if bounds is None or bounds[2] != organiser:
+            return None
+        return bounds[0] + 1, bounds[1]
+
+    def date_ranges(self, organiser: str) -> List[Tuple[int, int]]:
+        """Az összes lezárt forduló tartománya; naponként O(log N)
+        letöltés a nap hosszában."""
+        ranges = []
+        post = self.first_dated(1)
+        while post is not None:
+            last = self._last_of_day(post)
+            if last.author == organiser:
+                ranges.append((post.number + 1, last.number))
+            post = self.first_dated(last.number + 1)
+        self.check_order()
+        return ranges
+
+    def check_order(self):
+        """Ellenőrzi, hogy a letöltött dátumozott hozzászólások dátumai
+        a sorszámmal együtt nőnek; különben UnorderedDates."""
+        previous = None
+        for number in sorted(self._posts):
+            post = self._posts[number]
+            if post is None:
+                continue
+            if previous is not None and post.date < previous.date:
+                raise UnorderedDates(
+                    f"#{post.number} ({post.date}) follows "
+                    f"#{previous.number} ({previous.date})")
+            previous = post
+
+    def _last_of_day(self, first: DatedPost) -> DatedPost:
+        """A first napjának utolsó dátumozott hozzászólása."""
+        after = self._search(first.number,
+                             lambda post: post.date > first.date,
+                             self._known_after(first.date))
+        # after - 1 a nap utolsó dátumozott hozzászólása, különben
+        # first_dated(after - 1) és first_dated(after) ugyanaz lenne.
+        last = self.first_dated(after - 1)
+        if last.date != first.date:
+            raise UnorderedDates(f"#{last.number} ({last.date}) ends the "
+                                 f"day {first.date}")
+        self._confirm(last, self.first_dated(last.number + 1))
+        return last
+
+    def _previous_dated(self, number: int) -> Optional[DatedPost]:
+        """Az utolsó dátumozott hozzászólás a number sorszám előtt."""
+        number -= 1
+        while number >= 1:
+            if number not in self._posts:
+                self._fetch(max(1, number - self.page_size + 1))
+                self._posts.setdefault(number, None)
+                continue
+            post = self._posts[number]
+            if post is not None:
+                return post
+            number -= 1
+        return None
+
+    @staticmethod
+    def _confirm(before: Optional[DatedPost], after: Optional[DatedPost]):
+        """Egy napváltás két oldala: az előző nap később nem folytatódhat."""
+        if before is not None and after is not None \
+                and not before.date < after.date:
+            raise UnorderedDates(f"#{after.number} ({after.date}) follows "
+                                 f"#{before.number} ({before.date})")
+
+    def _known_after(self, date: str) -> Optional[int]:
+        """A már letöltött, date utáni napra eső legkisebb sorszám (vagy a
+        szál vége utáni első), a keresés felső korlátjának."""
+        later = [number for number, post in self._posts.items()
+                 if post is not None and post.date > date]
+        if self._end is not None:
+            later.append(self._end + 1)
+        return min(later, default=None)
+
+    def _search(self, low: int, reached: Callable[[DatedPost], bool],
+                high: Optional[int] = None) -> int:
+        """A legkisebb n > low (vagy n = low), amelytől kezdve az első
+        dátumozott hozzászólás már reached (vagy a szál véget ért).
+
+        Feltételezi, hogy a reached a dátumok sorrendjében monoton. Ismert
+        felső korlát (high) nélkül előbb duplázódó lépésekkel korlátoz
+        felülről, majd felez."""
+        def done(number):
+            post = self.first_dated(number)
+            return post is None or reached(post)
+
+        if done(low):
+            return low
+        if high is None:
+            step = self.page_size
+            high = low + step
+            while not done(high):
+                low, step = high, step * 2
+                high = low + step
+        while high - low > 1:
+            middle = (low + high) // 2
+            if done(middle):
+                high = middle
+            else:
+                low = middle
+        return high
+
+    def _fetch(self, number: int):
+        """Letölti a number sorszámmal kezdődő oldalt, és megjegyzi a
+        hozzászólásait; üres oldalnál a szál végét."""
+        self.fetches += 1
+        wrappers = self.fetch_wrappers(f"{self.forum_url}n={number}")
+        expected = number
+        for wrapper in wrappers:
+            post_number, date, author = self.extract_post_data(wrapper)
+            if post_number is None:
+                continue
+            current = int(post_number.lstrip('#'))
+            if current < number:
+                # A szál végén a szerver az utolsó oldalt adhatja vissza.
+                continue
+            for missing in range(expected, current):
+                self._posts.setdefault(missing, None)
+            self._posts[current] = (DatedPost(current, date, author)
+                                    if date is not None else None)
+            expected = current + 1
+        if expected == number:
+            self._end = number - 1
+            return
+        self.page_size = max(self.page_size, expected - number)
@@ -0,0 +1,185 @@
+"""Felvétel/visszajátszás (kazetta) a fórum HTTP munkamenetéhez.
+
+Felvételkor a munkamenet minden kérését és válaszát egy tömörített
+(gzip JSON) archívumba menti; visszajátszáskor ugyanezeket adja vissza
+hálózat, bejelentkezés és Selenium nélkül. Így egy teljes szezon
+letöltése és pontozása offline, lemezsebességgel megismételhető, és az
+elemző változásai valódi, archivált szálakon tesztelhetők."""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+CASSETTE_VERSION = 1
+MODES = ("record", "replay")
+# A main.py ezekből a környezeti változókból kapcsolja be a kazettát.
+CASSETTE_ENV = "HT_CASSETTE"
+CASSETTE_MODE_ENV = "HT_CASSETTE_MODE"
+# Ezek a fejlécek nem kerülnek az archívumba (élő munkamenet-sütik).
+PRIVATE_HEADERS = ("set-cookie",)
+
+
+class CassetteMiss(LookupError):
+    """A visszajátszott kérés nincs az archívumban."""
+
+
+class Cassette:
+    """Kérés-válasz párok archívuma.
+
+    A kérések kulcsa a metódus, az URL és (ha van) a törzs kivonata. Egy
+    kulcs ismételt kéréseit felvételkor sorban tárolja, visszajátszáskor
+    sorban adja vissza, az utolsót ismételve, ha elfogytak. A recorded /
+    replayed számlálók a felvett és a visszajátszott válaszok száma."""
+
+    def __init__(self, path: str, mode: str = "replay"):
+        """Visszajátszásnál betölti az archívumot."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.recorded = 0
+        self.replayed = 0
+        self._interactions: Dict[str, List[dict]] = {}
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self.load()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """A HT_CASSETTE útvonalú kazetta a HT_CASSETTE_MODE (alapból
+        replay) módban, vagy None, ha nincs beállítva."""
+        path = os.environ.get(CASSETTE_ENV)
+        if not path:
+            return None
+        return cls(path, os.environ.get(CASSETTE_MODE_ENV, "replay"))
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        """A kérés azonosítója az archívumban."""
+        key = f"{request.method} {request.url}"
+        body = request.body
+        if body:
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            key += f" {hashlib.sha1(body).hexdigest()[:16]}"
+        return key
+
+    def record(self, request: requests.PreparedRequest,
+               response: requests.Response):
+        """Eltárol egy kérés-válasz párt."""
+        interaction = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "url": response.url,
+            "headers": {name: value for name, value
+                        in response.headers.items()
+                        if name.lower() not in PRIVATE_HEADERS},
+            # surrogateescape: bármilyen bájtsor veszteség nélkül
+            "body": response.content.decode("utf-8", "surrogateescape"),
+        }
+        with self._lock:
+            self._interactions.setdefault(self.key(request),
+                                          []).append(interaction)
+            self.recorded += 1
+
+    def play(self, request: requests.PreparedRequest) -> requests.Response:
+        """A kéréshez felvett (soron következő) válasz."""
+        key = self.key(request)
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                raise CassetteMiss(key)
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            interaction = interactions[min(position, len(interactions) - 1)]
+            self.replayed += 1
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.url = interaction["url"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = (  # pylint: disable=protected-access
+            interaction["body"].encode("utf-8", "surrogateescape"))
+        response.request = request
+        return response
+
+    def load(self):
+        """Betölti az archívumot."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {self.path}")
+        self._interactions = data["interactions"]
+
+    def save(self):
+        """Elmenti a felvételt (atomi cserével)."""
+        with self._lock:
+            data = {"version": CASSETTE_VERSION,
+                    "interactions": self._interactions}
+        temporary = f"{self.path}.tmp"
+        with gzip.open(temporary, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary, self.path)
+
+    def attach(self, session: requests.Session) -> requests.Session:
+        """A munkamenet kéréseit a kazettán vezeti át.
+
+        Felvételkor a munkamenet request hívását csomagolja, így egy
+        ütemezett munkamenet újrapróbálásai közül csak a végső válasz
+        (az átirányítások lépéseivel együtt) kerül az archívumba;
+        visszajátszáskor a CassetteAdapter válaszol."""
+        if self.mode == "replay":
+            for prefix in ("https://", "http://"):
+                session.mount(prefix, CassetteAdapter(self))
+            return session
+
+        send = session.request
+
+        def request(method, url, *args, **kwargs):
+            response = send(method, url, *args, **kwargs)
+            for step in response.history + [response]:
+                self.record(step.request, step)
+            return response
+
+        session.request = request
+        return session
+
+    def session(self) -> requests.Session:
+        """Új munkamenet a kazettán (visszajátszáshoz nem kell
+        bejelentkezés)."""
+        return self.attach(requests.Session())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.mode == "record":
+            self.save()
+
+
+class CassetteAdapter(BaseAdapter):
+    """requests adapter, amely a kazettáról játssza vissza a válaszokat.
+
+    Csak visszajátszásra való: a szállítási beállításokat (timeout,
+    verify, proxies, cert, stream) figyelmen kívül hagyja, mert nem
+    nyit kapcsolatot; a felvétel a valódi adapteren át megy."""
+
+    def __init__(self, cassette: Cassette):
+        """A visszajátszott kazetta."""
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **_kwargs):  # pylint: disable=arguments-differ
+        """A kéréshez felvett válasz (a szállítási beállítások nélkül)."""
+        return self.cassette.play(request)
+
+    def close(self):
+        """Nincs lezárandó kapcsolat."""
@@ -0,0 +1,214 @@
+"""Kíméletes letöltés a Hattrick szerverekről: token-vödrös
+sebességkorlát, korlátozott párhuzamosság, időkorlát és újrapróbálás
+exponenciális, véletlenített várakozással."""
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Csak ezeket a kéréseket szabad újraküldeni (a belépő POST-ot nem).
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class TokenBucket:
+    """Token-vödör: átlagosan rate kérés másodpercenként, legfeljebb
+    burst kérés egyszerre."""
+
+    def __init__(self, rate: float, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Tele vödörrel indul."""
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Kivesz egy tokent, szükség esetén megvárja; a várakozás
+        másodpercben."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens
+                                   + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+
+
+class FetchStats:
+    """Kérésenkénti időmérés és számlálók (szálbiztos).
+
+    timings: (url, státusz vagy None hiba esetén, másodperc) minden
+    próbálkozásra, retries: az újrapróbálások, failures: a végleg
+    sikertelen kérések száma, throttled: a sebességkorlát miatti
+    összes várakozás másodpercben, max_in_flight: a legtöbb egyszerre
+    futó kérés."""
+
+    def __init__(self):
+        """Üres statisztika."""
+        self.timings: List[Tuple[str, Optional[int], float]] = []
+        self.retries = 0
+        self.failures = 0
+        self.throttled = 0.0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def started(self):
+        """Egy kérés elindult."""
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+    def record(self, url: str, status: Optional[int], seconds: float):
+        """Feljegyez egy befejezett próbálkozást."""
+        with self._lock:
+            self._in_flight -= 1
+            self.timings.append((url, status, seconds))
+
+    def count(self, counter: str, amount: Union[int, float] = 1):
+        """Növeli a megadott számlálót."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def summary(self) -> Dict[str, float]:
+        """Összesítés: kérések száma, újrapróbálások, hibák, és az idők
+        összege, átlaga, 95. percentilise és maximuma."""
+        with self._lock:
+            seconds = sorted(timing[2] for timing in self.timings)
+            retries, failures = self.retries, self.failures
+            throttled = self.throttled
+        count = len(seconds)
+        return {
+            "requests": count,
+            "retries": retries,
+            "failures": failures,
+            "throttled": throttled,
+            "total": sum(seconds),
+            "mean": sum(seconds) / count if count else 0.0,
+            "p95": seconds[int(0.95 * (count - 1))] if count else 0.0,
+            "max": seconds[-1] if count else 0.0,
+        }
+
+
+class FetchScheduler:
+    """A kérések ütemezője.
+
+    rate/burst: a token-vödör paraméterei, max_concurrency: az egyszerre
+    futó kérések száma (ekkora a kapcsolat-készlet is), retries: az
+    újrapróbálások száma 429/5xx válasz, időtúllépés vagy kapcsolati
+    hiba után (csak az IDEMPOTENT_METHODS kéréseinél),
+    backoff/max_backoff: az exponenciális várakozás alapja és felső
+    korlátja (teljes jitterrel), timeout: a requests (kapcsolódási,
+    olvasási) időkorlátja."""
+
+    def __init__(self, rate: float = 5.0, burst: int = 5,
+                 max_concurrency: int = 4, retries: int = 4,
+                 backoff: float = 0.5, max_backoff: float = 30.0,
+                 timeout: Tuple[float, float] = (5.0, 30.0),
+                 sleep: Callable[[float], None] = time.sleep,
+                 rng: Optional[random.Random] = None):
+        """Inicializálja az ütemezőt."""
+        self.bucket = TokenBucket(rate, burst, sleep=sleep)
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.stats = FetchStats()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def session(self) -> "ScheduledSession":
+        """Új munkamenet, amelynek minden kérése ezen az ütemezőn megy."""
+        return ScheduledSession(self)
+
+    def mount(self, session: requests.Session):
+        """A párhuzamossághoz illő méretű kapcsolat-készlet beállítása."""
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency,
+                              pool_maxsize=self.max_concurrency)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def delay(self, attempt: int,
+              response: Optional[requests.Response] = None) -> float:
+        """Várakozás az attempt-edik (0-tól) újrapróbálás előtt; 429
+        esetén a Retry-After fejlécet is tiszteletben tartja."""
+        delay = self.rng.uniform(0, min(self.max_backoff,
+                                        self.backoff * 2 ** attempt))
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, min(self.max_backoff,
+                                       float(retry_after)))
+        return delay
+
+    def request(self, send: Callable[..., requests.Response], method: str,
+                url: str, *args, **kwargs) -> requests.Response:
+        """Elküld egy kérést a send hívással az ütemezés szabályai szerint.
+
+        A végleg sikertelen kérésnél az utolsó hibát dobja tovább, illetve
+        az utolsó hibás státuszú válaszra requests.HTTPError-t dob, hogy
+        egy hibaoldal ne kerüljön feldolgozásra üres oldalként. A nem
+        idempotens kéréseket egyszer küldi el, és a választ változatlanul
+        adja vissza."""
+        kwargs.setdefault("timeout", self.timeout)
+        retries = self.retries if method.upper() in IDEMPOTENT_METHODS \
+            else 0
+        attempt = 0
+        while True:
+            response, error = None, None
+            with self._slots:
+                self.stats.count("throttled", self.bucket.acquire())
+                self.stats.started()
+                started = time.perf_counter()
+                try:
+                    response = send(method, url, *args, **kwargs)
+                except (requests.Timeout, requests.ConnectionError) as e:
+                    error = e
+                self.stats.record(
+                    url, response.status_code if response is not None
+                    else None, time.perf_counter() - started)
+
+            retryable = error is not None or \
+                response.status_code in RETRY_STATUSES
+            if not retryable or (error is None and not retries):
+                return response
+            if attempt >= retries:
+                self.stats.count("failures")
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+            self.stats.count("retries")
+            self.sleep(self.delay(attempt, response))
+            attempt += 1
+
+
+class ScheduledSession(requests.Session):
+    """requests.Session, amelynek kéréseit egy FetchScheduler ütemezi."""
+
+    def __init__(self, scheduler: FetchScheduler):
+        """Beállítja a kapcsolat-készletet az ütemezőhöz."""
+        super().__init__()
+        self.scheduler = scheduler
+        scheduler.mount(self)
+
+    def request(self, method, url, *args, **kwargs):
+        """Az ütemezőn keresztül küldi a kérést."""
+        return self.scheduler.request(super().request, method, url,
+                                      *args, **kwargs)
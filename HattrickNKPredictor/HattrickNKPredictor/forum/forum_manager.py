@@ -1,62 +1,184 @@
 """A fórum információt leszedi és átírja csv-re"""
 
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Tuple
-from bs4 import BeautifulSoup
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from HattrickNKPredictor.forum.auth_manager import AuthManager
+from HattrickNKPredictor.forum.boundary_locator import (BoundaryLocator,
+                                                        UnorderedDates)
+from HattrickNKPredictor.forum.fetch_scheduler import FetchScheduler
+from HattrickNKPredictor.forum.html_parser import parse_forum_page
+from HattrickNKPredictor.forum.http_cache import HttpCache
+from HattrickNKPredictor.forum.post_grammar import (parse_plain_post,
+                                                    split_lines)
+from HattrickNKPredictor.forum.sync_state import SyncState
+
+
+def get_page(session, url: str, cache: Optional[HttpCache] = None):
+    """Letölt egy oldalt, a gyorsítótáron keresztül, ha van.
+
+    Hibás státusz esetén requests.HTTPError-t dob: egy hibaoldal
+    üres utolsó oldalként csendben lerövidítené a bejárást."""
+    if cache is not None:
+        response = cache.get(session, url)
+    else:
+        response = session.get(url)
+    response.raise_for_status()
+    return response
+
+
+def last_post_number(wrappers) -> Optional[int]:
+    """Az oldal utolsó hozzászólásának sorszáma."""
+    for wrapper in reversed(wrappers):
+        tag = wrapper.select_one('.cfHeader a[id]')
+        number = tag.text.strip().lstrip('#') if tag else ''
+        if number.isdigit():
+            return int(number)
+    return None
+
+
+def page_offset(url: str) -> Optional[int]:
+    """Az URL n= paramétere (az oldal első hozzászólásának sorszáma)."""
+    for key, value in parse_qsl(urlsplit(url).query):
+        if key == 'n':
+            return int(value) if value.isdigit() else None
+    return None
+
+
+def with_page_offset(url: str, offset: int) -> str:
+    """Az URL másolata n=offset paraméterrel."""
+    parts = urlsplit(url)
+    query = [(key, str(offset) if key == 'n' else value)
+             for key, value in parse_qsl(parts.query)]
+    return urlunsplit(parts._replace(query=urlencode(query)))
 
 
 class ForumFetcher:
     """A Hattrick fórum adatainak letöltéséért felelős osztály."""
 
-    def __init__(self, username, password, forum_url, kezdo, utolso):
-        """Inicializálja a lekérdezéshez szükséges adatokat."""
+    def __init__(self, username, password, forum_url, kezdo, utolso,
+                 max_workers=4, cache=None, parser=None, scheduler=None,
+                 cookie_path=None):
+        """Inicializálja a lekérdezéshez szükséges adatokat.
+
+        max_workers: az egyszerre letöltött oldalak száma (1 = a
+        "Következő" linkek soros követése), cache: opcionális HttpCache,
+        parser: a HTML elemző neve (alapból a leggyorsabb elérhető),
+        scheduler: a kéréseket ütemező FetchScheduler (alapból
+        max_workers párhuzamos kéréssel és ekkora kapcsolat-készlettel),
+        cookie_path: a munkamenet sütijeinek fájlja (AuthManager).
+        Az immutable_until sorszámig (az utolsó lezárt forduló végéig)
+        teljesen lezárt oldalakat a gyorsítótár megváltoztathatatlannak
+        jelöli."""
         self.username = username
         self.password = password
         self.forum_url = forum_url
         self.kezdo = kezdo
         self.utolso = utolso
-        self.login = AuthManager(self.username, self.password, self.forum_url)
+        self.max_workers = max_workers
+        self.cache = cache
+        self.parser = parser
+        self.immutable_until = None
+        self.login = AuthManager(
+            self.username, self.password, self.forum_url,
+            scheduler or FetchScheduler(max_concurrency=max_workers),
+            cookie_path=cookie_path)
         self.session = None
 
     def fetch_forum_data(self):
-        """Letölti és feldolgozza a fórum hozzászólásokat."""
+        """Letölti és feldolgozza a fórum hozzászólásokat.
+
+        Az első oldal után az oldalméretet a "Következő" link n=
+        paraméteréből határozza meg, és a kezdo..utolso közé eső
+        oldalakat párhuzamosan tölti le, majd sorszám szerint fűzi
+        össze. Ha az oldalméret nem állapítható meg, vagy egy oldal
+        üresen jön vissza, a linkeket követi sorban."""
+        first_url = f"{self.forum_url}n={self.kezdo}&t=17632450&v=4"
+        posts, next_url, _ = self._fetch_page(first_url)
+        forum_data, reached_last = self._collect(posts)
+        if reached_last or not next_url:
+            return forum_data
+
+        if self.max_workers > 1:
+            rest = self._fetch_concurrent(first_url, next_url)
+            if rest is not None:
+                return forum_data + rest
+        return forum_data + self._fetch_serial(next_url)
+
+    def _fetch_page(self, url):
+        """Letölt és feldolgoz egy oldalt.
+
+        Visszaadja a tipp-hozzászólásokat, a következő oldal URL-jét és
+        az oldalon lévő összes hozzászólás számát."""
+        response = get_page(self.session, url, self.cache)
+        page = parse_forum_page(response.text, self.parser)
+        wrappers = page.wrappers
+        posts = [post for post in map(self.parse_post, wrappers)
+                 if post is not None]
+        next_url = page.next_url(url)
+        if (self.cache is not None and self.immutable_until is not None
+                and next_url is not None):
+            last = last_post_number(wrappers)
+            if last is not None and last <= self.immutable_until:
+                self.cache.mark_immutable(url)
+        return posts, next_url, len(wrappers)
+
+    def _collect(self, posts):
+        """Az utolso sorszámig tartó hozzászólások, és hogy elértük-e."""
+        for index, post in enumerate(posts):
+            if post["sorszam"] > self.utolso:
+                return posts[:index], True
+        return posts, False
+
+    def _fetch_serial(self, url):
+        """A "Következő" linkek követése az utolso sorszámig."""
         forum_data = []
-        current_url = f"{self.forum_url}n={self.kezdo}&t=17632450&v=4"
-        reached_last = False
-
-        while not reached_last and current_url:
-            response = self.session.get(current_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            for wrapper in soup.select('.cfWrapper'):
-                post_data = self.parse_post(wrapper)
-                if post_data is None:
-                    continue
-                if post_data:
-                    msg_num = post_data["sorszam"]
-                    if msg_num > self.utolso:
-                        reached_last = True
-                        break
-                    forum_data.append(post_data)
-
-            if not reached_last:
-                next_link = soup.select_one('a[title="Következő"],'
-                                            ' a[accesskey="N"]')
-                if next_link and 'href' in next_link.attrs:
-                    current_url = (f"https://www.hattrick.org"
-                                   f"{next_link['href']}")
-                else:
-                    break
+        while url:
+            posts, url, _ = self._fetch_page(url)
+            page_data, reached_last = self._collect(posts)
+            forum_data.extend(page_data)
+            if reached_last:
+                break
         return forum_data
 
-    def parse_post(self, wrapper):
-        """Kinyeri a szükséges adatokat egy bejegyzésből."""
+    def _fetch_concurrent(self, first_url, next_url):
+        """A hátralévő oldalak párhuzamos letöltése az n= eltolások alapján.
+
+        None-t ad, ha az oldalméret nem határozható meg, vagy valamelyik
+        oldal üres (ekkor a hívó a soros bejárásra vált)."""
+        first, second = page_offset(first_url), page_offset(next_url)
+        if first is None or second is None or second <= first:
+            return None
+        urls = [with_page_offset(next_url, offset) for offset in
+                range(second, self.utolso + 1, second - first)]
+        if not urls:
+            return []
+
+        workers = min(self.max_workers, len(urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pages = list(executor.map(self._fetch_page, urls))
+
+        merged = {}
+        for posts, _, post_count in pages:
+            if not post_count:
+                return None
+            for post in posts:
+                if second <= post["sorszam"] <= self.utolso:
+                    merged.setdefault(post["sorszam"], post)
+        return [merged[number] for number in sorted(merged)]
+
+    def parse_post(self, wrapper, is_last_post=None):
+        """Kinyeri a szükséges adatokat egy bejegyzésből.
+
+        A csapatneveket csak az utolsó (utolso sorszámú) hozzászólásból
+        olvassa ki, hacsak az is_last_post másként nem rendelkezik."""
         msg_number = self.get_msg_number(wrapper)
         username = self.get_referenced_msg(wrapper)
-        result = self.extract_match_info(wrapper, int(msg_number.lstrip('#')
-                                                      ) == self.utolso)
+        if is_last_post is None:
+            is_last_post = int(msg_number.lstrip('#')) == self.utolso
+        result = self.extract_match_info(wrapper, is_last_post)
         if result is None:
             return None
         matches, tuti_indices, replay, bonus, team_names = result
@@ -118,120 +240,181 @@ class ForumFetcher:
         else:
             message_div = wrapper.select_one('.message .hattrick-ml')
             if message_div:
-                lines = [line.strip() for line in
-                         message_div.get_text('\n')
-                         .split('\n') if line.strip()]
-                start_processing = False
-
-                for line_idx, line in enumerate(lines, start=1):
-                    if not start_processing:
-                        if line.lower().startswith("nk "):
-                            start_processing = True
-                        continue
-
-                    if re.search(r'\bT\b', line, re.IGNORECASE):
-                        tuti_indices = line_idx - 2
-
-                    match = re.match(r'^.+? - .+? (?:\(\d+\))?\s*(\d{1}[-:]\d'
-                                     r'{1})(?!-)(.*)$', line)
-                    if match:
-                        score = re.split("[-:]", match.group(1))
-                        matches.append(score[0])
-                        matches.append(score[1])
-                        if 't' in match.group(2).lower():
-                            tuti_indices = line_idx - 1
-                    elif line.upper().startswith('REPLAY'):
-                        if line_idx + 1 < len(lines):
-                            replay = lines[line_idx].strip().split(" ")[-1]
-                    elif (line.upper().startswith('B\u00d3NUSZ')
-                          or line.upper().startswith('BONUS')):
-                        bonus = lines[line_idx].strip().split(" ")[-1]
+                post = parse_plain_post(
+                    split_lines(message_div.get_text('\n')))
+                if post is not None:
+                    matches = post.matches
+                    if post.tuti is not None:
+                        tuti_indices = post.tuti
+                    replay = post.replay
+                    bonus = post.bonus
 
         if len(matches) != 10:
             return None
 
         return matches, tuti_indices, replay, bonus, team_names
 
+    @staticmethod
+    def csv_lines(forum_data):
+        """A fórum adatai CSV sorokként (a save_to_csv formátumában)."""
+        lines = []
+        csapatok = ""
+        for post in forum_data:
+            meccsek = ','.join(post['meccsek']) if post['meccsek'] else ''
+            replay = post['replay'].replace('-', ','
+                                            ) if post['replay'] else ''
+            bonus = post['bonusz'] if post['bonusz'] else ''
+            lines.append(f"{post['sorszam']},{post['felhasznalonev']},"
+                         f"{meccsek},{post['tuti']},{replay},{bonus}\n")
+            if forum_data[-1] == post:
+                csapatok = ','.join(post['csapatok'])
+        lines.append(f"{csapatok}\n")
+        return lines
+
     def save_to_csv(self, forum_data, filename=None):
         """Elmenti a fórum adatait CSV fájlba."""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"forum_data_{timestamp}.csv"
-        csapatok = ""
         with open(filename, 'w', encoding='utf-8') as f:
-            for post in forum_data:
-                meccsek = ','.join(post['meccsek']) if post['meccsek'] else ''
-                replay = post['replay'].replace('-', ','
-                                                ) if post['replay'] else ''
-                bonus = post['bonusz'] if post['bonusz'] else ''
-                line = (f"{post['sorszam']},{post['felhasznalonev']},"
-                        f"{meccsek},{post['tuti']},{replay},{bonus}\n")
-                f.write(line)
-                if forum_data[-1] == post:
-                    csapatok = ','.join(post['csapatok'])
-            f.write(f"{csapatok}\n")
+            f.writelines(self.csv_lines(forum_data))
 
 
 class ForumDateAnalyzer:
-    """A Hattrick fórum hozzászólásait dátum szerint csoportosító osztály."""
-
-    def __init__(self, username: str, password: str, forum_url: str):
+    """A Hattrick fórum hozzászólásait dátum szerint csoportosító osztály.
+
+    A hozzászólás dátuma a felhasználó által írt táblázatfejléc (.htMlTable
+    th), nem a fórum időbélyege. A bináris keresés (boundary_search)
+    feltételezi, hogy ezek a dátumok a sorszámmal együtt nőnek; ha a
+    letöltött oldalakon ez nem teljesül (pl. egy régi dátumú táblázatot
+    másoltak be), a teljes bejárásra vált."""
+
+    ORGANISER = "Cacci"
+
+    def __init__(self, username: str, password: str, forum_url: str,
+                 cache: Optional[HttpCache] = None,
+                 parser: Optional[str] = None,
+                 sync_state: Optional[SyncState] = None,
+                 boundary_search: bool = False,
+                 scheduler: Optional[FetchScheduler] = None,
+                 cookie_path: Optional[str] = None):
+        """sync_state: a korábbi futások mentett állapota; megadásakor a
+        bejárás az utolsó ismert oldaltól folytatódik. boundary_search:
+        mentett állapot nélkül a napok határait bináris kereséssel
+        (BoundaryLocator) keresi a teljes bejárás helyett. scheduler: a
+        kéréseket ütemező FetchScheduler, cookie_path: a munkamenet
+        sütijeinek fájlja (AuthManager)."""
         self.username = username
         self.password = password
         self.forum_url = forum_url
-        self.login = AuthManager(self.username, self.password, self.forum_url)
+        self.cache = cache
+        self.parser = parser
+        self.sync_state = sync_state
+        self.boundary_search = boundary_search
+        self.login = AuthManager(self.username, self.password, self.forum_url,
+                                 scheduler, cookie_path=cookie_path)
         self.session = None
 
     def get_date_ranges(self) -> List[Tuple[int, int]]:
         """
         Visszaadja a dátum szerint csoportosított hozzászólások tartományait,
         de csak azokat, ahol az utolsó hozzászólás Cacci-tól van.
-        """
-        self.login.login_forum()
-        self.session = self.login.convert_cookies_to_requests()
 
-        date_dict = {}
-        last_post_authors = {}
-        current_url = f"{self.forum_url}n=1"
-        has_next_page = True
+        Mentett állapot esetén csak az utolsó ismert oldaltól olvas; ha
+        az nem változott (nincs új oldal, és ugyanannyi hozzászólás van
+        rajta), azonnal a mentett tartományokat adja vissza.
+        """
+        self.session = self.login.open_session()
+        if self.boundary_search and self.sync_state is None:
+            try:
+                ranges = self.locator().date_ranges(self.ORGANISER)
+            except UnorderedDates as e:
+                print(f"A dátumok nem időrendiek ({e}), teljes bejárás")
+            else:
+                self.login.close()
+                return ranges
+
+        state = self.sync_state or SyncState(self.forum_url)
+        full_pages = self._scan(state)
+        self.login.close()
+        if full_pages is None:
+            full_pages = []
+        else:
+            state.save()
 
-        while has_next_page:
-            response = self.session.get(current_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+        filtered_dates = state.round_ranges(self.ORGANISER)
+        if self.cache is not None and filtered_dates:
+            self._mark_closed_pages(full_pages, filtered_dates[-1][1])
+        return filtered_dates
 
-            for wrapper in soup.select('.cfWrapper'):
-                post_number, date, author = self._extract_post_data(wrapper)
+    def _scan(self, state: SyncState):
+        """Végigolvassa a szálat a state folytatási pontjától, és a
+        dátumozott hozzászólásokat a state-be gyűjti.
+
+        A teljes oldalak (URL, utolsó sorszám) listáját adja, vagy
+        None-t, ha az utolsó ismert oldal nem változott."""
+        full_pages = []
+        current_url = state.resume_url or f"{self.forum_url}n=1"
+        first_page = True
+
+        while current_url is not None:
+            response = get_page(self.session, current_url, self.cache)
+            page = parse_forum_page(response.text, self.parser)
+            wrappers = page.wrappers
+            next_url = page.next_url(current_url)
+            if first_page and state.is_unchanged(current_url, len(wrappers),
+                                                 next_url is not None):
+                break
+            first_page = False
+
+            for wrapper in wrappers:
+                post_number, date, author = self.extract_post_data(wrapper)
                 if post_number is None or date is None:
                     continue
+                state.add_post(int(post_number.lstrip('#')), date, author)
 
-                post_num = int(post_number.lstrip('#'))
-
-                if date not in date_dict:
-                    date_dict[date] = (post_num+1, post_num)
-                    last_post_authors[date] = author
-                else:
-                    first, _ = date_dict[date]
-                    date_dict[date] = (first, post_num)
-                    last_post_authors[date] = author
-
-            next_link = soup.select_one('a[title="Következő"],'
-                                        ' a[accesskey="N"]')
-            if next_link and 'href' in next_link.attrs:
-                current_url = f"https://www.hattrick.org{next_link['href']}"
+            if next_url is not None:
+                full_pages.append((current_url, last_post_number(wrappers)))
             else:
-                has_next_page = False
-
-        self.login.driver.quit()
-
-        filtered_dates = []
-        sorted_dates = sorted(date_dict.keys())
-        for date in sorted_dates:
-            if last_post_authors.get(date) == "Cacci":
-                filtered_dates.append(date_dict[date])
-
-        return filtered_dates
-
-    def _extract_post_data(self, wrapper) -> Tuple[str, str, str]:
+                state.resume_url = current_url
+                state.resume_post_count = len(wrappers)
+            current_url = next_url
+        return None if first_page else full_pages
+
+    def get_round_range(self, date: str) -> Optional[Tuple[int, int]]:
+        """Egyetlen nap (YYYY-MM-DD) forduló-tartománya néhány oldal
+        letöltésével; None, ha nincs ilyen nap, vagy nem Cacci zárta.
+        Nem időrendi dátumok esetén a teljes szálat olvassa végig."""
+        self.session = self.login.open_session()
+        try:
+            round_range = self.locator().round_range(date, self.ORGANISER)
+        except UnorderedDates as e:
+            print(f"A dátumok nem időrendiek ({e}), teljes bejárás")
+            state = SyncState(self.forum_url)
+            self._scan(state)
+            round_range = (tuple(state.dates[date])
+                           if state.closing_authors.get(date)
+                           == self.ORGANISER else None)
+        self.login.close()
+        return round_range
+
+    def locator(self) -> BoundaryLocator:
+        """A bejelentkezett munkamenettel dolgozó határkereső."""
+        def fetch_wrappers(url):
+            response = get_page(self.session, url, self.cache)
+            return parse_forum_page(response.text, self.parser).wrappers
+        return BoundaryLocator(fetch_wrappers, self.extract_post_data,
+                               self.forum_url)
+
+    def _mark_closed_pages(self, full_pages, last_closed_post: int):
+        """Az utolsó lezárt forduló végéig tartó teljes oldalak
+        megváltoztathatatlanok, a következő futás már nem kéri le őket."""
+        for url, last in full_pages:
+            if last is not None and last <= last_closed_post:
+                self.cache.mark_immutable(url)
+
+    @staticmethod
+    def extract_post_data(wrapper) -> Tuple[str, str, str]:
         """Kinyeri a hozzászólás számát, dátumát és szerzőjét."""
         post_number_tag = wrapper.select_one('.cfHeader a[id]')
         if not post_number_tag:
@@ -0,0 +1,148 @@
+"""Cserélhető HTML elemző a fórumoldalakhoz.
+
+Egy fórumoldalból csak a hozzászólások (.cfWrapper blokkok) és a
+"Következő" link kell, ezért a BeautifulSoup alapú elemzők SoupStrainer
+szűrővel csak ezeket a részfákat építik fel. Elérhető elemzők:
+'selectolax' (ha telepítve van), 'lxml' (ha telepítve van) és a
+mindig meglévő 'html.parser'. A hozzászólás-feldolgozó kód mindegyikkel
+ugyanazt a BeautifulSoup-szerű felületet kapja. A két gyorsabb elemző
+opcionális: pip install HattrickNKPredictor[selectolax] vagy [lxml]."""
+import html
+import re
+from typing import List, Optional
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401  pylint: disable=unused-import
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    # A selectolax 1.0 óta csak a lexbor motor érhető el.
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+WRAPPER_STRAINER = SoupStrainer(
+    'div', attrs={'class': re.compile(r'(?:^|\s)cfWrapper(?:\s|$)')})
+NEXT_LINK_SELECTOR = 'a[title="Következő"], a[accesskey="N"]'
+_ANCHOR_PATTERN = re.compile(r'<a\b([^>]*)>', re.IGNORECASE)
+_ATTRIBUTE_PATTERN = re.compile(
+    r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+
+
+def available_backends() -> List[str]:
+    """A telepített elemzők, a leggyorsabbal kezdve."""
+    backends = []
+    if SelectolaxParser is not None:
+        backends.append('selectolax')
+    if HAS_LXML:
+        backends.append('lxml')
+    backends.append('html.parser')
+    return backends
+
+
+def default_backend() -> str:
+    """A leggyorsabb elérhető elemző neve."""
+    return available_backends()[0]
+
+
+def find_next_href(page_html: str) -> Optional[str]:
+    """A "Következő" link href értéke a nyers HTML-ből.
+
+    A SoupStrainer nem tud "VAGY" feltételt több attribútumra, ezért
+    a linket egy előre lefordított mintával keressük meg."""
+    for anchor in _ANCHOR_PATTERN.finditer(page_html):
+        # A három érték-csoport közül pontosan egy illeszkedik.
+        attrs = {name.lower(): html.unescape(''.join(values))
+                 for name, *values in
+                 _ATTRIBUTE_PATTERN.findall(anchor.group(1))}
+        if ((attrs.get('title') == 'Következő'
+             or attrs.get('accesskey') == 'N') and 'href' in attrs):
+            return attrs['href']
+    return None
+
+
+class SelectolaxNode:
+    """Selectolax csomópont a BeautifulSoup Tag felületének a fórum
+    feldolgozó által használt részével."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        """Becsomagolja a selectolax csomópontot."""
+        self._node = node
+
+    def select(self, selector: str) -> List["SelectolaxNode"]:
+        """CSS szelektorra illeszkedő leszármazottak."""
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional["SelectolaxNode"]:
+        """Az első illeszkedő leszármazott, vagy None."""
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def find_all(self, name: str) -> List["SelectolaxNode"]:
+        """Az adott nevű leszármazott elemek."""
+        return self.select(name)
+
+    def get_text(self, separator: str = '') -> str:
+        """A szöveges tartalom a szövegrészek közé tett elválasztóval."""
+        return self._node.text(deep=True, separator=separator)
+
+    @property
+    def text(self) -> str:
+        """A teljes szöveges tartalom."""
+        return self._node.text(deep=True)
+
+    @property
+    def attrs(self) -> dict:
+        """Az elem attribútumai."""
+        return dict(self._node.attributes)
+
+    def __getitem__(self, name: str) -> str:
+        """Egy attribútum értéke (KeyError, ha nincs)."""
+        return self._node.attributes[name]
+
+
+class ForumPage:
+    """Egy feldolgozott fórumoldal: a hozzászólás-blokkok és a
+    következő oldal linkje."""
+
+    def __init__(self, wrappers: list, next_href: Optional[str]):
+        """Eltárolja a blokkokat és a nyers linket."""
+        self.wrappers = wrappers
+        self.next_href = next_href
+
+    def next_url(self, page_url: str) -> Optional[str]:
+        """A következő oldal abszolút URL-je, ha van."""
+        if self.next_href is None:
+            return None
+        return urljoin(page_url, self.next_href)
+
+
+def parse_forum_page(page_html: str,
+                     backend: Optional[str] = None) -> ForumPage:
+    """Feldolgoz egy fórumoldalt a megadott (alapból a leggyorsabb
+    elérhető) elemzővel."""
+    backend = backend or default_backend()
+    if backend == 'selectolax':
+        if SelectolaxParser is None:
+            raise ValueError("selectolax is not installed")
+        tree = SelectolaxParser(page_html)
+        wrappers = [SelectolaxNode(node) for node in tree.css('.cfWrapper')]
+        next_link = tree.css_first(NEXT_LINK_SELECTOR)
+        next_href = (next_link.attributes.get('href')
+                     if next_link is not None else None)
+        return ForumPage(wrappers, next_href)
+    if backend not in ('lxml', 'html.parser'):
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+    if backend == 'lxml' and not HAS_LXML:
+        raise ValueError("lxml is not installed")
+    soup = BeautifulSoup(page_html, backend, parse_only=WRAPPER_STRAINER)
+    return ForumPage(soup.select('.cfWrapper'), find_next_href(page_html))
@@ -0,0 +1,151 @@
+"""Lemezes HTTP válasz-gyorsítótár a fórumoldalakhoz.
+
+A válaszokat URL szerint, zlib-bel tömörítve tárolja egy SQLite fájlban.
+A változékony oldalakat feltételes kéréssel (ETag / Last-Modified)
+ellenőrzi, a lezárt fordulók oldalait pedig megváltoztathatatlannak
+(immutable) jelöli, így azokat többé nem kéri le."""
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional
+import requests
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "forum_cache.sqlite")
+
+
+class CacheEntry:
+    """Egy tárolt válasz."""
+
+    def __init__(self, url: str, body: bytes, etag: Optional[str],
+                 last_modified: Optional[str], immutable: bool,
+                 fetched: float):
+        """Eltárolja a kicsomagolt törzset és a validátorokat."""
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.immutable = immutable
+        self.fetched = fetched
+
+
+class HttpCache:
+    """URL szerinti válasz-gyorsítótár feltételes újraérvényesítéssel.
+
+    Szálbiztos: a ForumFetcher párhuzamos letöltése is használhatja.
+    A hits / revalidated / fetched számlálók a kiszolgált, a 304-gyel
+    megerősített és a ténylegesen letöltött oldalak számát mutatják."""
+
+    def __init__(self, path: str = CACHE_PATH, compress_level: int = 6):
+        """Megnyitja (szükség esetén létrehozza) a gyorsítótár fájlt."""
+        self.path = path
+        self.compress_level = compress_level
+        self.hits = 0
+        self.revalidated = 0
+        self.fetched = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)),
+                        exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " url TEXT PRIMARY KEY, body BLOB NOT NULL,"
+                " etag TEXT, last_modified TEXT,"
+                " immutable INTEGER NOT NULL DEFAULT 0,"
+                " fetched REAL NOT NULL)")
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """A tárolt válasz, vagy None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, immutable, fetched"
+                " FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, immutable, fetched = row
+        return CacheEntry(url, zlib.decompress(body), etag, last_modified,
+                          bool(immutable), fetched)
+
+    def store(self, url: str, body: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None,
+              immutable: bool = False):
+        """Eltárol (felülír) egy választ."""
+        compressed = zlib.compress(body, self.compress_level)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, compressed, etag, last_modified, int(immutable),
+                 time.time()))
+
+    def mark_immutable(self, url: str):
+        """Megváltoztathatatlannak jelöli az oldalt: többé nem kéri le."""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE responses SET immutable = 1 WHERE url = ?", (url,))
+
+    def is_immutable(self, url: str) -> bool:
+        """Megváltoztathatatlan-e a tárolt oldal."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT immutable FROM responses WHERE url = ?",
+                (url,)).fetchone()
+        return bool(row and row[0])
+
+    def clear(self):
+        """Minden tárolt választ töröl."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self):
+        """Lezárja a gyorsítótár fájlt."""
+        self._db.close()
+
+    def get(self, session: requests.Session, url: str,
+            **kwargs) -> requests.Response:
+        """GET kérés a gyorsítótáron keresztül.
+
+        Megváltoztathatatlan oldalnál nincs hálózati kérés; egyébként
+        feltételes kérés megy ki, és 304 esetén a tárolt törzs jön
+        vissza. Csak a 200-as válaszokat tárolja."""
+        entry = self.lookup(url)
+        if entry is not None and entry.immutable:
+            self._count("hits")
+            return self._cached_response(entry)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self._count("revalidated")
+            return self._cached_response(entry)
+        self._count("fetched")
+        if response.status_code == 200:
+            self.store(url, response.content,
+                       response.headers.get("ETag"),
+                       response.headers.get("Last-Modified"))
+        return response
+
+    def _count(self, counter: str):
+        """Szálbiztosan növel egy számlálót."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def _cached_response(entry: CacheEntry) -> requests.Response:
+        """A tárolt törzsből felépített 200-as válasz."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry.url
+        response._content = entry.body  # pylint: disable=protected-access
+        response.encoding = "utf-8"
+        response.headers["X-From-Cache"] = "1"
+        return response
@@ -0,0 +1,106 @@
+"""Egymenetes nyelvtan a szöveges (nem táblázatos) tipp-hozzászólásokhoz.
+
+Egy szöveges tipp felépítése:
+
+    NK 12. forduló                  <- fejléc ("NK " kezdetű sor)
+    Magyarország - Ausztria 2-1     <- meccssorok, "T" a tuti jelölés
+    Spanyolország - Olaszország 1:1 T
+    ...
+    Replay                          <- a következő sor utolsó szava
+    40-35-25
+    Bónusz                          <- a következő sor utolsó szava
+    B
+
+A feldolgozás egy kis állapotgép (fejléc keresése, törzs, replay/bónusz
+érték várása), előre lefordított mintákkal, és pontosan a korábbi
+ForumFetcher.extract_match_info szabályait követi, a tuti sorszám
+számítását is beleértve."""
+import re
+from typing import List, Optional, Sequence, Tuple
+
+MATCH_LINE = re.compile(
+    r'^.+? - .+? (?:\(\d+\))?\s*(\d{1}[-:]\d{1})(?!-)(.*)$')
+SCORE_SEPARATOR = re.compile(r'[-:]')
+TUTI_MARK = re.compile(r'\bT\b', re.IGNORECASE)
+
+SEEK_HEADER, BODY, REPLAY_VALUE, BONUS_VALUE = range(4)
+
+
+class PlainPost:
+    """Egy szöveges tipp feldolgozásának eredménye.
+
+    matches: a gólok szövegként (meccsenként kettő), tuti: a tuti meccs
+    sorszáma (None, ha nincs jelölve), replay / bonus: a megadott érték
+    vagy None, rejected: a fejléc utáni, fel nem ismert sorok
+    (sorszám, sor) párjai."""
+
+    __slots__ = ("header", "matches", "tuti", "replay", "bonus",
+                 "rejected")
+
+    def __init__(self, header: str):
+        """Üres eredmény a megtalált fejléccel."""
+        self.header = header
+        self.matches: List[str] = []
+        self.tuti: Optional[int] = None
+        self.replay: Optional[str] = None
+        self.bonus: Optional[str] = None
+        self.rejected: List[Tuple[int, str]] = []
+
+    @property
+    def is_complete(self) -> bool:
+        """Mind az öt meccsre van-e tipp."""
+        return len(self.matches) == 10
+
+
+def split_lines(text: str) -> List[str]:
+    """A szöveg nem üres, szélein levágott sorai."""
+    return [line for line in map(str.strip, text.split('\n')) if line]
+
+
+def parse_plain_post(lines: Sequence[str]) -> Optional[PlainPost]:
+    """Feldolgozza egy szöveges tipp sorait; None, ha nincs NK fejléc.
+
+    A sorszámozás 1-től indul a teljes sorlistán, a tuti sorszám a
+    korábbi szabály szerint: "T" jelölés bárhol a sorban a sorszám - 2,
+    egy meccssor eredménye utáni "t" a sorszám - 1. A replay és a
+    bónusz értéke a kulcsszó utáni sor utolsó szava (a replay-é csak
+    akkor, ha nem az az utolsó sor)."""
+    state = SEEK_HEADER
+    post = None
+    line_count = len(lines)
+    for line_idx, line in enumerate(lines, start=1):
+        if state == SEEK_HEADER:
+            if line.lower().startswith("nk "):
+                post = PlainPost(line)
+                state = BODY
+            continue
+
+        recognised = False
+        if state == REPLAY_VALUE:
+            if line_idx < line_count:
+                post.replay = line.split(" ")[-1]
+            recognised = True
+        elif state == BONUS_VALUE:
+            post.bonus = line.split(" ")[-1]
+            recognised = True
+        state = BODY
+
+        if TUTI_MARK.search(line):
+            post.tuti = line_idx - 2
+            recognised = True
+
+        match = MATCH_LINE.match(line)
+        if match:
+            post.matches.extend(SCORE_SEPARATOR.split(match.group(1)))
+            if 't' in match.group(2).lower():
+                post.tuti = line_idx - 1
+            continue
+
+        upper = line.upper()
+        if upper.startswith('REPLAY'):
+            state = REPLAY_VALUE
+        elif upper.startswith('BÓNUSZ') or upper.startswith('BONUS'):
+            state = BONUS_VALUE
+        elif not recognised:
+            post.rejected.append((line_idx, line))
+    return post
@@ -0,0 +1,99 @@
+"""A fórum szál feldolgozásának mentett állapota a növekményes
+frissítéshez."""
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+SYNC_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "forum_sync.json")
+STATE_VERSION = 1
+
+
+class SyncState:
+    """Az eddig feldolgozott hozzászólások összesítése.
+
+    last_post: a legnagyobb feldolgozott sorszám, resume_url és
+    resume_post_count: az utolsó (nem teljes) oldal címe és az ott talált
+    hozzászólások száma, dates: dátum -> [első + 1, utolsó] sorszám (a
+    get_date_ranges korábbi alakjában), closing_authors: dátum -> a nap
+    utolsó hozzászólásának szerzője, rounds: a ThreadCrawler lezárt
+    fordulói (ForumRound.to_dict alakban)."""
+
+    def __init__(self, forum_url: str = "", path: Optional[str] = None):
+        """Üres állapot a megadott szálhoz."""
+        self.forum_url = forum_url
+        self.path = path
+        self.last_post = 0
+        self.resume_url: Optional[str] = None
+        self.resume_post_count = 0
+        self.dates: Dict[str, List[int]] = {}
+        self.closing_authors: Dict[str, Optional[str]] = {}
+        self.rounds: List[dict] = []
+
+    @classmethod
+    def load(cls, forum_url: str, path: str = SYNC_STATE_PATH):
+        """Betölti a mentett állapotot; ha nincs, vagy más szálhoz
+        tartozik, üres állapotot ad."""
+        state = cls(forum_url, path)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return state
+        if (data.get("version") != STATE_VERSION
+                or data.get("forum_url") != forum_url):
+            return state
+        state.last_post = data["last_post"]
+        state.resume_url = data["resume_url"]
+        state.resume_post_count = data["resume_post_count"]
+        state.dates = {date: list(bounds)
+                       for date, bounds in data["dates"].items()}
+        state.closing_authors = data["closing_authors"]
+        state.rounds = data.get("rounds", [])
+        return state
+
+    def save(self):
+        """Elmenti az állapotot (atomi cserével)."""
+        if self.path is None:
+            return
+        data = {
+            "version": STATE_VERSION,
+            "forum_url": self.forum_url,
+            "last_post": self.last_post,
+            "resume_url": self.resume_url,
+            "resume_post_count": self.resume_post_count,
+            "dates": self.dates,
+            "closing_authors": self.closing_authors,
+            "rounds": self.rounds,
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temporary, self.path)
+
+    def add_post(self, post_number: int, date: str,
+                 author: Optional[str]) -> bool:
+        """Feldolgoz egy hozzászólást; a már látottakat kihagyja.
+
+        Visszaadja, hogy új volt-e."""
+        if post_number <= self.last_post:
+            return False
+        if date not in self.dates:
+            self.dates[date] = [post_number + 1, post_number]
+        else:
+            self.dates[date][1] = post_number
+        self.closing_authors[date] = author
+        self.last_post = post_number
+        return True
+
+    def is_unchanged(self, url: str, post_count: int,
+                     has_next_page: bool) -> bool:
+        """Az utolsó oldal ugyanaz, mint a legutóbbi futáskor."""
+        return (url == self.resume_url and not has_next_page
+                and post_count == self.resume_post_count)
+
+    def round_ranges(self, organiser: str) -> List[Tuple[int, int]]:
+        """A lezárt fordulók (a nap utolsó hozzászólása a szervezőé)
+        tartományai dátum szerint rendezve."""
+        return [tuple(self.dates[date]) for date in sorted(self.dates)
+                if self.closing_authors.get(date) == organiser]
@@ -0,0 +1,169 @@
+"""Egymenetes fórumbejárás: a fordulók határait és a tippeket egyszerre
+gyűjti, minden oldalt egyszer tölt le és egyszer dolgoz fel."""
+import csv
+from typing import Iterator, List, Optional
+from HattrickNKPredictor.forum.forum_manager import (ForumDateAnalyzer,
+                                                     ForumFetcher, get_page,
+                                                     last_post_number)
+from HattrickNKPredictor.forum.html_parser import parse_forum_page
+from HattrickNKPredictor.forum.sync_state import SyncState
+
+
+class ForumRound:
+    """Egy lezárt, pontozásra kész forduló.
+
+    first_post..last_post a ForumDateAnalyzer tartománya (a nap első
+    hozzászólása utántól a szervező záró hozzászólásáig), a posts a
+    ForumFetcher.fetch_forum_data-val egyező tipp-adatok."""
+
+    def __init__(self, index: int, date: str, first_post: int,
+                 last_post: int, posts: List[dict]):
+        """Eltárolja a forduló adatait."""
+        self.index = index
+        self.date = date
+        self.first_post = first_post
+        self.last_post = last_post
+        self.posts = posts
+
+    def rows(self) -> List[List[str]]:
+        """A forduló CSV sorai, ahogy a csv_reader a save_to_csv fájljából
+        beolvasná (a SeasonEngine közvetlenül pontozni tudja)."""
+        return list(csv.reader(ForumFetcher.csv_lines(self.posts)))
+
+    def to_dict(self) -> dict:
+        """A SyncState-be menthető alak (a sorszám nélkül)."""
+        return {"date": self.date, "first_post": self.first_post,
+                "last_post": self.last_post, "posts": self.posts}
+
+
+class _OpenRound:
+    """A bejárás közben gyűlő, még le nem zárt nap."""
+
+    def __init__(self, date: str, first: int):
+        self.date = date
+        self.first = first
+        self.last = first
+        self.posts: List[dict] = []
+        self.closing_author: Optional[str] = None
+
+
+class ThreadCrawler(ForumFetcher):
+    """A szálat egyszer bejárva, dátum szerint csoportosítja a
+    hozzászólásokat, és minden lezárt fordulót (a nap utolsó
+    hozzászólása a szervezőé) azonnal kiad, amint a következő nap
+    elkezdődik vagy a szál véget ér.
+
+    Ugyanazokat a fordulókat adja, mint a ForumDateAnalyzer tartományai
+    alapján futtatott ForumFetcher, de fele annyi letöltéssel és
+    feldolgozással, és egyetlen bejelentkezéssel.
+
+    A forum_url a szál címe a t= azonosítóval (pl. ...Read.aspx?t=1&),
+    ehhez fűzi az n= paramétert."""
+
+    def __init__(self, username, password, forum_url, organiser="Cacci",
+                 cache=None, parser=None, scheduler=None,
+                 cookie_path=None, sync_state: Optional[SyncState] = None):
+        """Inicializálja a bejárót (a munkamenetet a session adja).
+
+        cookie_path: a munkamenet sütijeinek fájlja (AuthManager),
+        sync_state: a korábbi futások lezárt fordulói; megadásakor a
+        bejárás az utolsó mentett forduló napjától folytatódik."""
+        super().__init__(username, password, forum_url, 1, 0,
+                         max_workers=1, cache=cache, parser=parser,
+                         scheduler=scheduler, cookie_path=cookie_path)
+        self.organiser = organiser
+        self.sync_state = sync_state
+        self.pages_fetched = 0
+
+    def crawl(self, start: Optional[int] = None) -> Iterator[ForumRound]:
+        """Bejárja a szálat a start sorszámtól, és sorban kiadja a
+        lezárt fordulókat.
+
+        start nélkül, mentett állapot esetén a korábban lezárt fordulókat
+        letöltés nélkül adja ki, és csak az utolsó mentett forduló
+        napjától tölt le (azt újra bejárja, mert azóta kaphatott még
+        hozzászólást); a bejárás végén elmenti a lezárt fordulókat."""
+        state = self.sync_state if start is None else None
+        stored = list(state.rounds) if state is not None else []
+        start = start or 1
+        if stored:
+            start = stored.pop()["first_post"] - 1
+        for index, data in enumerate(stored):
+            yield ForumRound(index, **data)
+
+        for finished in self._crawl_pages(start, len(stored)):
+            stored.append(finished.to_dict())
+            yield finished
+        if state is not None:
+            state.rounds = stored
+            state.save()
+
+    def _crawl_pages(self, start: int, index: int) -> Iterator[ForumRound]:
+        """A start sorszámtól letöltött lezárt fordulók, index-től
+        számozva."""
+        current: Optional[_OpenRound] = None
+        pending: List[dict] = []
+        full_pages = []
+        url = f"{self.forum_url}n={start}"
+
+        while url is not None:
+            response = get_page(self.session, url, self.cache)
+            self.pages_fetched += 1
+            page = parse_forum_page(response.text, self.parser)
+            for wrapper in page.wrappers:
+                post_number, date, author = \
+                    ForumDateAnalyzer.extract_post_data(wrapper)
+                if post_number is None:
+                    continue
+                post = self.parse_post(wrapper, is_last_post=True)
+                if date is None:
+                    # Dátum nélküli hozzászólás: a napé, ha utána még
+                    # jön ugyanarról a napról dátumozott hozzászólás.
+                    if current is not None and post is not None:
+                        pending.append(post)
+                    continue
+
+                if current is None or date != current.date:
+                    if current is not None:
+                        finished = self._close(current, index)
+                        if finished is not None:
+                            self._mark_closed_pages(full_pages,
+                                                    finished.last_post)
+                            index += 1
+                            yield finished
+                    current = _OpenRound(date, int(post_number.lstrip('#')))
+                else:
+                    current.posts.extend(pending)
+                    if post is not None:
+                        current.posts.append(post)
+                    current.last = int(post_number.lstrip('#'))
+                pending = []
+                current.closing_author = author
+
+            next_url = page.next_url(url)
+            if next_url is not None:
+                full_pages.append((url, last_post_number(page.wrappers)))
+            url = next_url
+
+        if current is not None:
+            finished = self._close(current, index)
+            if finished is not None:
+                self._mark_closed_pages(full_pages, finished.last_post)
+                yield finished
+
+    def _close(self, day: _OpenRound, index: int) -> Optional[ForumRound]:
+        """Lezárja a napot; fordulót csak a szervező zárása után ad."""
+        if day.closing_author != self.organiser:
+            return None
+        for post in day.posts:
+            if post["sorszam"] != day.last:
+                post["csapatok"] = []
+        return ForumRound(index, day.date, day.first + 1, day.last,
+                          day.posts)
+
+    def _mark_closed_pages(self, full_pages, last_closed_post: int):
+        """A lezárt fordulóig tartó teljes oldalak megváltoztathatatlanok."""
+        if self.cache is None:
+            return
+        while full_pages and (full_pages[0][1] or 0) <= last_closed_post:
+            self.cache.mark_immutable(full_pages.pop(0)[0])
@@ -10,14 +10,18 @@ from tkinter import messagebox
 import tkinter.font as tkFont
 from tkinter.ttk import Checkbutton
 
+import requests
 from selenium.common import TimeoutException
 
-from HattrickNKPredictor.forum.auth_manager import AuthManager
-from HattrickNKPredictor.forum.csv_handler import handler
-from HattrickNKPredictor.forum.forum_manager import (ForumFetcher,
-                                                     ForumDateAnalyzer)
-from HattrickNKPredictor.calculators.calculator import PredictionGame
-from HattrickNKPredictor.calculators.exporters import (export_results_to_txt,
+from HattrickNKPredictor.forum.auth_manager import (AuthManager,
+                                                    COOKIE_CACHE_PATH,
+                                                    LoginError)
+from HattrickNKPredictor.forum.cassette import Cassette
+from HattrickNKPredictor.forum.http_cache import HttpCache
+from HattrickNKPredictor.forum.sync_state import SyncState
+from HattrickNKPredictor.forum.thread_crawler import ThreadCrawler
+from HattrickNKPredictor.calculators.season import SeasonEngine
+from HattrickNKPredictor.calculators.exporters import (export_rounds_to_txt,
                                                        NKScoreAggregator)
 
 
@@ -100,14 +104,19 @@ class HattrickLoginApp:
                 self.username,
                 self.password,
                 "https://www.hattrick.org/hu/"
-                "?ReturnUrl=%2fMyHattrick%2fDashboard.aspx"
+                "?ReturnUrl=%2fMyHattrick%2fDashboard.aspx",
+                cookie_path=COOKIE_CACHE_PATH
             )
-            self.hattrick_scraper.login()
-            self.hattrick_scraper.driver.quit()
+            self.hattrick_scraper.open_session(self.hattrick_scraper.login)
+            self.hattrick_scraper.close()
+            print(f"Login ({self.hattrick_scraper.session_source}): "
+                  f"{self.hattrick_scraper.format_timings()}")
 
             self.show_main_menu()
         except (ConnectionError, TimeoutError) as e:
             messagebox.showerror("Login Failed", f"Network error: {str(e)}")
+        except (LoginError, TimeoutException) as e:
+            messagebox.showerror("Login Failed", str(e))
 
     def show_main_menu(self):
         """Display the main menu after successful login."""
@@ -136,57 +145,65 @@ class HattrickLoginApp:
 
     def do_results(self):
         """Az összes forduló kiértékelése egyszerre"""
-        fetcher = ForumDateAnalyzer(
+        # HT_CASSETTE=<fájl> HT_CASSETTE_MODE=record|replay: a letöltés
+        # felvétele, illetve offline visszajátszása. Kazettával nincs
+        # gyorsítótár és mentett állapot, hogy a teljes bejárás
+        # kerüljön a kazettára, illetve az játszódjon vissza.
+        cassette = Cassette.from_env()
+        cache = HttpCache() if cassette is None else None
+        thread_url = ("https://www.hattrick.org/hu/Forum/Read.aspx"
+                      "?t=17632450&v=4&")
+        # A fordulók határait és a tippeket egyetlen bejárás gyűjti össze,
+        # a korábban lezárt fordulók után folytatva.
+        crawler = ThreadCrawler(
             self.username,
             self.password,
-            "https://www83.hattrick.org/Forum/Read.aspx?t=17632450&",
+            thread_url,
+            cache=cache,
+            # Az érvényes mentett sütikkel nincs újabb bejelentkezés.
+            cookie_path=COOKIE_CACHE_PATH,
+            sync_state=(SyncState.load(thread_url) if cassette is None
+                        else None)
         )
-        self.date_ranges = fetcher.get_date_ranges()
-        if not hasattr(self, 'date_ranges') or not self.date_ranges:
+        try:
+            if cassette is not None and cassette.mode == "replay":
+                crawler.session = cassette.session()
+            else:
+                crawler.session = crawler.login.open_session()
+                if cassette is not None:
+                    cassette.attach(crawler.session)
+            rounds = list(crawler.crawl())
+        except (TimeoutException, LoginError,
+                requests.RequestException) as e:
+            print(f"Hiba a fórum letöltésekor: {str(e)}")
+            rounds = []
+        finally:
+            crawler.login.close()
+            if cache is not None:
+                cache.close()
+            if cassette is not None and cassette.mode == "record":
+                cassette.save()
+        print(f"Bejelentkezés ({crawler.login.session_source}): "
+              f"{crawler.login.format_timings()}")
+        stats = crawler.login.scheduler.stats.summary()
+        print(f"Letöltés: {stats['requests']} kérés, "
+              f"{stats['retries']} újrapróbálás, "
+              f"átlag {stats['mean']:.2f} s, p95 {stats['p95']:.2f} s")
+
+        self.date_ranges = [(r.first_post, r.last_post) for r in rounds]
+        if not self.date_ranges:
             messagebox.showerror("Hiba", "Először töltsd le a fordulókat!")
             return
         base_dir = pathlib.Path(__file__).parent.resolve()
         eredmenyek_dir = base_dir / "eredmenyek"
         eredmenyek_dir.mkdir(exist_ok=True)
-        fetcher = ForumFetcher(
-            self.username,
-            self.password,
-            "https://www.hattrick.org/hu/Forum/Read.aspx?",
-            0,
-            0
-        )
-        fetcher.login.login_forum()
-        fetcher.session=fetcher.login.convert_cookies_to_requests()
-        for index, (first_post, last_post) in enumerate(self.date_ranges):
-            try:
-                fetcher.kezdo=first_post
-                fetcher.utolso=last_post
-                data = fetcher.fetch_forum_data()
-
-                csv_filename = f"fordulo_{index + 1}.csv"
-                fetcher.save_to_csv(data, csv_filename)
-
-                # Eredmények számolása
-                game = PredictionGame(handler.csv_reader(csv_filename))
-                game.calculate_all_scores()
-
-                # Eredmények exportálása
-                export_results_to_txt(
-                    game.participants,
-                    f"NK - {index + 1}. Forduló eredmény",
-                    game.correct_results,
-                    game.correct_replay,
-                    game.correct_bonus,
-                    game.countrys,
-                    f"{eredmenyek_dir}\\fordulo{index + 1}.txt"
-                )
 
-                os.remove(csv_filename)
-            except TimeoutException as e:
-                print(f"Hiba a {index + 1}. forduló feldolgozásakor: {str(e)}")
-                continue
-        fetcher.login.driver.quit()
-        aggregator = NKScoreAggregator()
+        # Eredmények számolása az összes fordulóra párhuzamosan
+        season = SeasonEngine().score([r.rows() for r in rounds])
+
+        # Eredmények exportálása
+        export_rounds_to_txt(season.rounds, str(eredmenyek_dir))
+        aggregator = NKScoreAggregator(season.tiebreaks)
         aggregator.add_folder(f"{eredmenyek_dir}")
         aggregator.save_result()
 
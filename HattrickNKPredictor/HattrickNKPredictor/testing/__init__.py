@@ -0,0 +1 @@
+"""Tesztelési segédeszközök (helyi fórum-szerver, adatgenerátorok)."""
@@ -0,0 +1,16 @@
+"""Véletlenszerű, a fórum CSV formátumának megfelelő forduló adatok a
+pontozó tesztekhez."""
+
+
+def random_csv_data(rng, participant_count, max_goals=6):
+    """Véletlenszerű, a fórum CSV formátumának megfelelő adatot készít."""
+    def row(first, second):
+        goals = [str(rng.randint(0, max_goals)) for _ in range(10)]
+        tuti = str(rng.randint(0, 5))
+        replay = [str(rng.randint(0, 100)) for _ in range(3)]
+        return [first, second, *goals, tuti, *replay, rng.choice("ABCD")]
+
+    rows = [row(str(i), f"User{i}") for i in range(1, participant_count + 1)]
+    rows.append(row("", ""))
+    rows.append([f"Team{i}" for i in range(10)])
+    return rows
@@ -0,0 +1,377 @@
+"""Helyi, a Hattrick fórumot utánzó HTTP szerver a letöltők teszteléséhez.
+
+A szál oldalait az n= paraméter (az oldal első hozzászólásának sorszáma)
+szerint szolgálja ki, a "Következő" linkkel együtt. Felhasználónév és
+jelszó megadásakor a szál csak bejelentkezés után olvasható, addig a
+Hattrick ASP.NET belépő űrlapját (rejtett állapotmezőkkel) adja."""
+import random
+import secrets
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+import requests
+from HattrickNKPredictor.forum.forum_manager import ForumDateAnalyzer
+
+FORUM_PATH = "/Forum/Read.aspx"
+SESSION_COOKIE = "HTSession"
+LOGIN_PREFIX = "ctl00$ctl00$CPContent$ucLogin$"
+# A véletlenszerűen beinjektált hibák válaszkódjai.
+INJECTED_STATUSES = (429, 500, 502, 503)
+
+
+def render_post(number: int, author: str, body: str,
+                date: Optional[str] = None) -> str:
+    """Egy hozzászólás HTML-je a fórum szerkezetével (.cfWrapper).
+
+    A body a .message .hattrick-ml blokk (már HTML) tartalma; a date
+    megadásakor a dátum egy .htMlTable fejlécbe kerül."""
+    date_html = (f'<table class="htMlTable"><tr><th>{escape(date)}</th>'
+                 f'</tr></table>' if date else "")
+    return (f'<div class="cfWrapper"><div class="cfHeader">'
+            f'<a id="m{number}" href="#">#{number}</a> '
+            f'<a title="Hattrick" href="#">HT</a> '
+            f'<a title="{escape(author)}" href="#">{escape(author)}</a>'
+            f'</div><div class="message">{date_html}'
+            f'<div class="hattrick-ml">{body}</div></div></div>')
+
+
+def render_table_prediction(scores: Sequence[str], tuti: int = -1,
+                            replay: str = "", bonus: str = "",
+                            teams: Optional[Sequence[str]] = None) -> str:
+    """Táblázatos (htMlTable) tipp: meccssorok, replay és bónusz sor.
+
+    A scores "h-v" alakú eredmények, a tuti a T jelölésű sor indexe."""
+    rows = []
+    for index, score in enumerate(scores):
+        team = teams[index] if teams else f"Home{index} - Away{index}"
+        mark = " T" if index == tuti else ""
+        rows.append(f"<tr><td>{escape(team)}</td><td></td>"
+                    f"<td>{escape(score)}{mark}</td></tr>")
+    if replay:
+        rows.append(f"<tr><td>Replay</td><td>{escape(replay)}</td></tr>")
+    if bonus:
+        rows.append(f"<tr><td>Bónusz</td><td>{escape(bonus)}</td></tr>")
+    return f'<table class="htMlTable">{"".join(rows)}</table>'
+
+
+def make_thread(post_count, seed=0):
+    """Fórum szál tipp- és zaj-hozzászólásokkal vegyesen."""
+    rng = random.Random(seed)
+    posts = []
+    for number in range(1, post_count + 1):
+        if number % 7 == 0:
+            body = "Sok sikert mindenkinek!"
+        else:
+            scores = [f"{rng.randint(0, 4)}-{rng.randint(0, 4)}"
+                      for _ in range(5)]
+            body = render_table_prediction(
+                scores, tuti=rng.randint(0, 4),
+                replay=f"{rng.randint(0, 60)}-{rng.randint(0, 40)}-"
+                       f"{rng.randint(0, 20)}",
+                bonus=rng.choice("ABCD"))
+        posts.append(render_post(number, f"User{number}", body))
+    return posts
+
+
+def make_season(rng, days):
+    """Fordulók napokra bontva: nyitó hozzászólás, tippek, zaj és (a
+    lezárt napokon) a szervező eredmény-hozzászólása."""
+    posts = []
+
+    def add(author, body, date):
+        posts.append(render_post(len(posts) + 1, author, body, date))
+
+    def prediction():
+        return render_table_prediction(
+            [f"{rng.randint(0, 4)}-{rng.randint(0, 4)}" for _ in range(5)],
+            tuti=rng.randint(0, 4), replay="40-35-25",
+            bonus=rng.choice("ABCD"),
+            teams=[f"H{i} - V{i}" for i in range(5)])
+
+    for day, closed in days:
+        add("Cacci", "NK forduló indul", day)
+        for player in range(rng.randint(3, 9)):
+            add(f"User{player}", prediction(), day)
+            if rng.random() < 0.3:
+                add(f"User{player}", "Hajrá!", None)
+        if closed:
+            add("Cacci", prediction(), day)
+    return posts
+
+
+class StubForumServer:
+    """Helyi fórum szál kiszolgálása egy háttérszálon.
+
+    posts: a hozzászólások HTML-je sorszám szerint (az első az 1-es),
+    page_size: hozzászólás oldalanként, delay: mesterséges késleltetés
+    másodpercben minden kérésnél, jitter: ehhez adott véletlen
+    késleltetés (0..jitter másodperc), etags: ETag fejléc küldése és a
+    feltételes kérésekre 304 válasz. A failures a következő kérésekre
+    sorban visszaadott hibakódok listája (429-nél Retry-After: 0
+    fejléccel); error_rate: annak esélye, hogy egy kérés véletlen
+    INJECTED_STATUSES hibát kap (seed: a véletlenszámok magja, az
+    injected a beinjektált hibák száma). A requests lista a kiszolgált
+    útvonalakat, a not_modified a 304-es válaszok számát, a
+    max_in_flight a legtöbb egyszerre futó kérést tartalmazza. A
+    credentials (felhasználónév, jelszó) megadásakor a szál
+    bejelentkezéshez kötött; a logins a sikeres bejelentkezések száma."""
+
+    def __init__(self, posts: List[str], page_size: int = 20,
+                 delay: float = 0.0, next_links: bool = True,
+                 etags: bool = True,
+                 credentials: Optional[Tuple[str, str]] = None,
+                 jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """Inicializálja a szervert (még nem indítja el)."""
+        self.posts = posts
+        self.credentials = credentials
+        self.session_token = secrets.token_hex(8)
+        self.view_state = secrets.token_hex(16)
+        self.logins = 0
+        self.page_size = page_size
+        self.delay = delay
+        self.next_links = next_links
+        self.etags = etags
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.failures: List[int] = []
+        self.injected = 0
+        self.requests: List[str] = []
+        self.not_modified = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """A szerver gyökér URL-je."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def forum_url(self) -> str:
+        """A ForumFetcher-nek átadható fórum URL (az n= elé)."""
+        return f"{self.base_url}{FORUM_PATH}?"
+
+    def render_page(self, first: int) -> str:
+        """A first sorszámú hozzászólással kezdődő oldal HTML-je."""
+        start = max(first, 1) - 1
+        posts = self.posts[start:start + self.page_size]
+        next_link = ""
+        if self.next_links and start + self.page_size < len(self.posts):
+            next_n = start + self.page_size + 1
+            next_link = (f'<a title="Következő" accesskey="N" '
+                         f'href="{FORUM_PATH}?n={next_n}&amp;t=17632450'
+                         f'&amp;v=4">Következő</a>')
+        return (f'<html><body>{"".join(posts)}'
+                f'<div class="pager">{next_link}</div></body></html>')
+
+    def render_login_page(self) -> str:
+        """A belépő űrlap a rejtett ASP.NET állapotmezőkkel."""
+        field_id = LOGIN_PREFIX.replace("$", "_")
+        return (f'<html><body><form method="post" action="{FORUM_PATH}" '
+                f'id="aspnetForm">'
+                f'<input type="hidden" name="__VIEWSTATE" '
+                f'value="{self.view_state}"/>'
+                f'<input type="hidden" name="__EVENTVALIDATION" '
+                f'value="{self.view_state[::-1]}"/>'
+                f'<input type="text" name="{LOGIN_PREFIX}txtUserName" '
+                f'id="{field_id}txtUserName"/>'
+                f'<input type="password" name="{LOGIN_PREFIX}txtPassword" '
+                f'id="{field_id}txtPassword"/>'
+                f'<input type="submit" name="{LOGIN_PREFIX}butLogin" '
+                f'value="Belépés" id="{field_id}butLogin"/>'
+                f'</form></body></html>')
+
+    def is_authorized(self, cookie_header: Optional[str]) -> bool:
+        """Olvasható-e a szál a kérés sütijeivel."""
+        if self.credentials is None:
+            return True
+        cookies = dict(part.strip().split("=", 1)
+                       for part in (cookie_header or "").split(";")
+                       if "=" in part)
+        return cookies.get(SESSION_COOKIE) == self.session_token
+
+    def check_login(self, fields: Dict[str, List[str]]) -> bool:
+        """Az elküldött űrlap helyes-e (állapotmezők, gomb, adatok)."""
+        def value(name):
+            return fields.get(name, [""])[0]
+
+        accepted = (self.credentials is not None
+                    and value("__VIEWSTATE") == self.view_state
+                    and value("__EVENTVALIDATION") == self.view_state[::-1]
+                    and f"{LOGIN_PREFIX}butLogin" in fields
+                    and (value(f"{LOGIN_PREFIX}txtUserName"),
+                         value(f"{LOGIN_PREFIX}txtPassword"))
+                    == self.credentials)
+        if accepted:
+            with self._lock:
+                self.logins += 1
+        return accepted
+
+    def enter_request(self, path: str) -> Tuple[Optional[int], float]:
+        """Naplóz egy beérkező kérést, és a válaszát dönti el: a
+        beinjektálandó hibakódot (vagy None-t) és a késleltetést adja.
+
+        A kiszolgálás végén a leave_request-et kell hívni."""
+        with self._lock:
+            self.requests.append(path)
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            failure = self.failures.pop(0) if self.failures else None
+            if (failure is None and self.error_rate
+                    and self.rng.random() < self.error_rate):
+                failure = self.rng.choice(INJECTED_STATUSES)
+                self.injected += 1
+            return failure, self.delay + self.rng.uniform(0, self.jitter)
+
+    def leave_request(self):
+        """Egy enter_request-tel kezdett kérés kiszolgálása véget ért."""
+        with self._lock:
+            self._in_flight -= 1
+
+    def count_not_modified(self):
+        """Feljegyez egy 304-es választ."""
+        with self._lock:
+            self.not_modified += 1
+
+    def _handler(self):
+        """A kéréskezelő osztály, amely ehhez a szerverhez kötődik."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """GET és POST kérések kiszolgálása."""
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Egy fórumoldal (bejelentkezés nélkül a belépő űrlap)
+                visszaadása."""
+                with self._tracked() as answered:
+                    if answered:
+                        return
+                    url = urlsplit(self.path)
+                    if url.path != FORUM_PATH:
+                        self.send_error(404)
+                        return
+                    if not stub.is_authorized(self.headers.get("Cookie")):
+                        self._send(stub.render_login_page())
+                        return
+                    query = parse_qs(url.query)
+                    first = int(query.get("n", ["1"])[0])
+                    page = stub.render_page(first)
+                    etag = f'"{zlib.crc32(page.encode("utf-8")):08x}"'
+                    if (stub.etags
+                            and self.headers.get("If-None-Match") == etag):
+                        stub.count_not_modified()
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    self._send(page, {"ETag": etag} if stub.etags else {})
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                """A belépő űrlap elküldése: siker esetén süti és
+                átirányítás, különben újra az űrlap."""
+                with self._tracked() as answered:
+                    length = int(self.headers.get("Content-Length", 0))
+                    fields = parse_qs(self.rfile.read(length).decode())
+                    if answered:
+                        return
+                    if urlsplit(self.path).path != FORUM_PATH:
+                        self.send_error(404)
+                        return
+                    if not stub.check_login(fields):
+                        self._send(stub.render_login_page())
+                        return
+                    self.send_response(302)
+                    self.send_header("Set-Cookie",
+                                     f"{SESSION_COOKIE}={stub.session_token}"
+                                     f"; Path=/")
+                    self.send_header("Location", self.path)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+
+            @contextmanager
+            def _tracked(self):
+                """Naplózza a kérést, alkalmazza a késleltetést és a
+                beinjektált hibát; True-t ad, ha a válasz már elment."""
+                failure, delay = stub.enter_request(self.path)
+                try:
+                    if delay:
+                        time.sleep(delay)
+                    if failure is not None:
+                        self.send_response(failure)
+                        if failure == 429:
+                            self.send_header("Retry-After", "0")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                    yield failure is not None
+                finally:
+                    stub.leave_request()
+
+            def _send(self, html: str, headers: Optional[dict] = None):
+                """200-as HTML válasz."""
+                body = html.encode("utf-8")
+                self.send_response(200)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=W0622
+                """Csendes naplózás."""
+
+        return Handler
+
+    def start(self):
+        """Elindítja a szervert egy szabad helyi porton."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Leállítja a szervert."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class OfflineLogin:
+    """Az AuthManager helyett: bejelentkezés nélküli, sima requests
+    munkamenetet ad (a ForumDateAnalyzer által használt részével)."""
+
+    def open_session(self) -> requests.Session:
+        """Új, bejelentkezés nélküli munkamenet."""
+        return requests.Session()
+
+    def close(self):
+        """Nincs bezárandó böngésző."""
+
+
+def offline_analyzer(server: StubForumServer,
+                     **kwargs) -> ForumDateAnalyzer:
+    """ForumDateAnalyzer a szerver szálához bejelentkezés nélkül (sima
+    requests munkamenettel); a szerver kérésnaplóját kiüríti."""
+    analyzer = ForumDateAnalyzer("user", "secret", server.forum_url,
+                                 **kwargs)
+    analyzer.login = OfflineLogin()
+    server.requests.clear()
+    return analyzer
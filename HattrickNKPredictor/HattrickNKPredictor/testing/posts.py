@@ -0,0 +1,95 @@
+"""Véletlenszerű, valósághű tipp-hozzászólás szövegek tesztekhez és
+mérésekhez, valamint a korábbi szöveges feldolgozás összehasonlítási
+alapnak."""
+import random
+import re
+from typing import List
+from HattrickNKPredictor.forum.post_grammar import parse_plain_post
+
+TEAMS = ["Magyarország", "Ausztria", "Spanyolország", "Olaszország",
+         "Brazília", "Argentína", "Németország", "Franciaország",
+         "Anglia", "Hollandia", "Portugália", "Belgium", "Horvátország",
+         "Dánia", "Svájc", "Lengyelország"]
+NOISE = ["Hajrá Magyarország!", "Sok sikert mindenkinek", "Tuti tipp :)",
+         "Szerintem ez lesz a meglepetés forduló", "T", "ps: bocs a késésért"]
+
+
+def random_plain_lines(rng: random.Random, round_number: int = 1,
+                       noise: float = 0.15) -> List[str]:
+    """Egy szöveges ("NK ..." fejlécű) tipp sorai.
+
+    Változatos formában: kötőjeles vagy kettőspontos eredmény, zárójeles
+    helyezés, különféle tuti jelölések, hiányzó replay vagy bónusz,
+    előtte-utána fecsegés és néha hiányos tipp."""
+    lines = []
+    if rng.random() < noise:
+        lines.append(rng.choice(NOISE))
+    lines.append(rng.choice(["NK", "nk", "Nk"]) + f" {round_number}. forduló")
+
+    match_count = 5 if rng.random() > noise / 3 else rng.randint(3, 4)
+    tuti = rng.randrange(match_count)
+    for index in range(match_count):
+        home, away = rng.sample(TEAMS, 2)
+        rank = f"({rng.randint(1, 60)}) " if rng.random() < 0.2 else ""
+        separator = rng.choice("-:")
+        line = (f"{home} - {away} {rank}{rng.randint(0, 5)}{separator}"
+                f"{rng.randint(0, 5)}")
+        if index == tuti:
+            line += rng.choice([" T", " t", " tuti", " (T)"])
+        lines.append(line)
+        if rng.random() < noise / 3:
+            lines.append(rng.choice(NOISE))
+
+    if rng.random() > noise / 2:
+        lines.append(rng.choice(["Replay", "REPLAY:", "Replay tipp"]))
+        values = [rng.randint(0, 100) for _ in range(3)]
+        lines.append("-".join(map(str, values)))
+    if rng.random() > noise / 2:
+        lines.append(rng.choice(["Bónusz", "BÓNUSZ:", "Bonus"]))
+        lines.append(rng.choice(["", "válasz: "]) + rng.choice("ABCD"))
+    if rng.random() < noise:
+        lines.append(rng.choice(NOISE))
+    return lines
+
+
+def legacy_parse(lines: List[str]) -> tuple:
+    """A ForumFetcher.extract_match_info korábbi szöveges ága, változatlan
+    szabályokkal (összehasonlítási alapnak)."""
+    matches = []
+    tuti_indices = []
+    replay = None
+    bonus = None
+    start_processing = False
+    for line_idx, line in enumerate(lines, start=1):
+        if not start_processing:
+            if line.lower().startswith("nk "):
+                start_processing = True
+            continue
+
+        if re.search(r'\bT\b', line, re.IGNORECASE):
+            tuti_indices = line_idx - 2
+
+        match = re.match(r'^.+? - .+? (?:\(\d+\))?\s*(\d{1}[-:]\d'
+                         r'{1})(?!-)(.*)$', line)
+        if match:
+            score = re.split("[-:]", match.group(1))
+            matches.append(score[0])
+            matches.append(score[1])
+            if 't' in match.group(2).lower():
+                tuti_indices = line_idx - 1
+        elif line.upper().startswith('REPLAY'):
+            if line_idx + 1 < len(lines):
+                replay = lines[line_idx].strip().split(" ")[-1]
+        elif (line.upper().startswith('BÓNUSZ')
+              or line.upper().startswith('BONUS')):
+            bonus = lines[line_idx].strip().split(" ")[-1]
+    return matches, tuti_indices, replay, bonus
+
+
+def grammar_parse(lines: List[str]) -> tuple:
+    """A nyelvtan eredménye a korábbi alakban."""
+    post = parse_plain_post(lines)
+    if post is None:
+        return [], [], None, None
+    return (post.matches, [] if post.tuti is None else post.tuti,
+            post.replay, post.bonus)
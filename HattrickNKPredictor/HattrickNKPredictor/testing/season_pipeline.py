@@ -0,0 +1,147 @@
+"""A teljes szezon-feldolgozás végigfuttatása egy fórum szál ellen,
+szakaszonkénti falióra-idővel (terheléses teszthez a helyi szerverrel).
+
+Alapból a main.py do_results láncát futtatja: bejelentkezés, a szál
+egyszeri bejárása (ThreadCrawler), a pontozás (PredictionGame a
+SeasonEngine-en át), az exportálás (export_rounds_to_txt) és az
+összesítés (NKScoreAggregator). two_pass=True esetén a bejárás helyett
+a korábbi kétmenetes letöltés fut: a fordulók tartományai
+(ForumDateAnalyzer), majd fordulónként a tippek (ForumFetcher)."""
+import csv
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from HattrickNKPredictor.calculators.exporters import (NKScoreAggregator,
+                                                       export_rounds_to_txt)
+from HattrickNKPredictor.calculators.season import (SeasonEngine,
+                                                    SeasonResult)
+from HattrickNKPredictor.forum.fetch_scheduler import FetchScheduler
+from HattrickNKPredictor.forum.forum_manager import (ForumDateAnalyzer,
+                                                     ForumFetcher)
+from HattrickNKPredictor.forum.thread_crawler import ThreadCrawler
+
+STAGES = ("login", "crawl", "score", "export", "aggregate")
+TWO_PASS_STAGES = ("login", "dates", "fetch", "score", "export",
+                   "aggregate")
+
+
+class PipelineRun:
+    """Egy futás eredménye.
+
+    timings: szakasz neve -> másodperc (STAGES, illetve TWO_PASS_STAGES
+    sorrendjében), date_ranges: a fordulók tartományai, posts: a
+    letöltött tippek száma, season: a pontozott szezon, scores: az
+    NKScoreAggregator összesítése, stats: a FetchScheduler
+    összesítése."""
+
+    def __init__(self):
+        """Üres eredmény."""
+        self.timings: Dict[str, float] = {}
+        self.date_ranges: List[Tuple[int, int]] = []
+        self.posts = 0
+        self.season: Optional[SeasonResult] = None
+        self.scores: Dict[str, int] = {}
+        self.stats: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Méri egy szakasz idejét."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    @property
+    def total(self) -> float:
+        """Az összes szakasz ideje."""
+        return sum(self.timings.values())
+
+
+def run_season_pipeline(forum_url: str, output_dir: str,
+                        username: str = "user", password: str = "secret",
+                        scheduler: Optional[FetchScheduler] = None,
+                        engine: Optional[SeasonEngine] = None,
+                        max_workers: int = 4,
+                        two_pass: bool = False,
+                        boundary_search: bool = False) -> PipelineRun:
+    """Végigfuttatja a feldolgozást a forum_url szál ellen.
+
+    Az eredmény fájlok (fordulónként egy txt és a score.txt) és a
+    mentett sütik az output_dir-be kerülnek. scheduler: a letöltők közös
+    ütemezője (alapból max_workers párhuzamos kéréssel), engine: a
+    pontozó SeasonEngine, two_pass: a kétmenetes letöltés (a
+    boundary_search csak ennél számít)."""
+    scheduler = scheduler or FetchScheduler(max_concurrency=max_workers)
+    engine = engine or SeasonEngine()
+    run = PipelineRun()
+    cookie_path = os.path.join(output_dir, "session_cookies.json")
+
+    if two_pass:
+        rounds = _fetch_two_pass(run, forum_url, username, password,
+                                 scheduler, max_workers, boundary_search,
+                                 cookie_path)
+    else:
+        rounds = _crawl(run, forum_url, username, password, scheduler,
+                        cookie_path)
+
+    with run.stage("score"):
+        run.season = engine.score(rounds)
+
+    with run.stage("export"):
+        export_rounds_to_txt(run.season.rounds, output_dir)
+
+    with run.stage("aggregate"):
+        aggregator = NKScoreAggregator(run.season.tiebreaks)
+        aggregator.add_folder(output_dir)
+        aggregator.save_result(os.path.join(output_dir, "score.txt"))
+    run.scores = dict(aggregator.scores)
+    run.stats = scheduler.stats.summary()
+    return run
+
+
+def _crawl(run: PipelineRun, forum_url: str, username: str, password: str,
+           scheduler: FetchScheduler,
+           cookie_path: str) -> List[List[List[str]]]:
+    """A do_results letöltése: egyetlen bejárás a ThreadCrawler-rel
+    (mentett állapot nélkül); a fordulók CSV sorait adja."""
+    crawler = ThreadCrawler(username, password, forum_url,
+                            scheduler=scheduler, cookie_path=cookie_path)
+    with run.stage("login"):
+        crawler.session = crawler.login.open_session()
+    with run.stage("crawl"):
+        crawled = list(crawler.crawl())
+    run.date_ranges = [(r.first_post, r.last_post) for r in crawled]
+    run.posts = sum(len(r.posts) for r in crawled)
+    return [r.rows() for r in crawled]
+
+
+def _fetch_two_pass(run: PipelineRun, forum_url: str, username: str,
+                    password: str, scheduler: FetchScheduler,
+                    max_workers: int, boundary_search: bool,
+                    cookie_path: str) -> List[List[List[str]]]:
+    """A kétmenetes letöltés: előbb a fordulók tartományai, majd
+    fordulónként a tippek; a fordulók CSV sorait adja."""
+    analyzer = ForumDateAnalyzer(username, password, forum_url,
+                                 boundary_search=boundary_search,
+                                 scheduler=scheduler,
+                                 cookie_path=cookie_path)
+    with run.stage("login"):
+        session = analyzer.login.open_session()
+    with run.stage("dates"):
+        # A sütik már mentve vannak: itt csak egy ellenőrző kérés megy.
+        run.date_ranges = analyzer.get_date_ranges()
+
+    fetcher = ForumFetcher(username, password, forum_url, 0, 0,
+                           max_workers=max_workers, scheduler=scheduler)
+    fetcher.session = session
+    rounds = []
+    with run.stage("fetch"):
+        for first_post, last_post in run.date_ranges:
+            fetcher.kezdo = first_post
+            fetcher.utolso = last_post
+            data = fetcher.fetch_forum_data()
+            run.posts += len(data)
+            rounds.append(list(csv.reader(fetcher.csv_lines(data))))
+    return rounds
@@ -0,0 +1,139 @@
+"""Szintetikus, valósághű Hattrick NK fórum szál generálása tetszőleges
+méretben (fordulók, játékosok), tesztekhez és teljesítményméréshez.
+
+Minden forduló napja a szervező nyitó hozzászólásával kezdődik, utána a
+játékosok táblázatos (htMlTable) vagy szöveges ("NK ...") tippjei és
+fecsegés jön, végül a szervező eredmény-hozzászólása zárja."""
+import datetime
+import random
+from typing import List, Optional
+from HattrickNKPredictor.testing.forum_server import (StubForumServer,
+                                                      render_post,
+                                                      render_table_prediction)
+from HattrickNKPredictor.testing.posts import (NOISE, TEAMS,
+                                               random_plain_lines)
+
+# A valódi oldalakon a hozzászólások körül sok egyéb elem is van.
+MENU = "".join(f'<li><a href="/m{j}">Menü {j}</a></li>' for j in range(12))
+PAGE_CHROME = "".join(f'<div class="menu"><ul>{MENU}</ul><span class="info">'
+                      f'Hattrick fórum {i}</span></div>' for i in range(40))
+
+
+class GeneratedRound:
+    """Egy generált forduló adatai.
+
+    first_post: a szervező nyitó, last_post: a záró hozzászólásának
+    sorszáma, table_predictions / plain_predictions: a táblázatos és a
+    szöveges tippek száma, closed: a szervező zárta-e le."""
+
+    def __init__(self, date: str, first_post: int):
+        """Új, még üres forduló."""
+        self.date = date
+        self.first_post = first_post
+        self.last_post = first_post
+        self.table_predictions = 0
+        self.plain_predictions = 0
+        self.closed = False
+
+    @property
+    def predictions(self) -> int:
+        """Az összes tipp-hozzászólás száma."""
+        return self.table_predictions + self.plain_predictions
+
+    @property
+    def date_range(self):
+        """A ForumDateAnalyzer.get_date_ranges alakú tartomány."""
+        return self.first_post + 1, self.last_post
+
+
+class SyntheticThread:
+    """A generált szál: a hozzászólások HTML-je sorszám szerint és a
+    fordulók adatai."""
+
+    def __init__(self, posts: List[str], rounds: List[GeneratedRound],
+                 players: List[str], organiser: str):
+        """Eltárolja a generált adatokat."""
+        self.posts = posts
+        self.rounds = rounds
+        self.players = players
+        self.organiser = organiser
+
+    def closed_rounds(self) -> List[GeneratedRound]:
+        """A szervező által lezárt fordulók."""
+        return [r for r in self.rounds if r.closed]
+
+    def server(self, page_size: int = 20, **kwargs) -> StubForumServer:
+        """Helyi szerver, amely ezt a szálat szolgálja ki."""
+        return StubForumServer(self.posts, page_size=page_size, **kwargs)
+
+    def render_pages(self, page_size: int = 20,
+                     chrome: bool = False) -> List[str]:
+        """Az oldalak HTML-je "Következő" linkekkel; chrome esetén a
+        valódi oldalakhoz hasonló menükkel körülvéve."""
+        server = self.server(page_size)
+        pages = [server.render_page(first)
+                 for first in range(1, len(self.posts) + 1, page_size)]
+        if chrome:
+            pages = [page.replace("<body>", f"<body>{PAGE_CHROME}")
+                     for page in pages]
+        return pages
+
+
+def generate_thread(rounds: int = 10, players: int = 50, seed: int = 0,
+                    plain_share: float = 0.3, participation: float = 0.9,
+                    chatter: float = 0.2, noise: float = 0.1,
+                    open_last: bool = False, organiser: str = "Cacci",
+                    start: Optional[datetime.date] = None
+                    ) -> SyntheticThread:
+    """Szál generálása.
+
+    rounds/players: a fordulók és a játékosok száma, plain_share: a
+    szöveges tippek aránya, participation: annak esélye, hogy egy
+    játékos tippel egy fordulóban, chatter: a tipp utáni dátum nélküli
+    fecsegés esélye, noise: a szöveges tippek szabálytalanságának
+    mértéke (random_plain_lines), open_last: az utolsó forduló nyitva
+    marad (nem a szervező hozzászólása zárja)."""
+    rng = random.Random(seed)
+    start = start or datetime.date(2024, 6, 14)
+    names = [f"Player{index}" for index in range(players)]
+    posts: List[str] = []
+    generated: List[GeneratedRound] = []
+
+    def add(author, body, date=None):
+        posts.append(render_post(len(posts) + 1, author, body, date))
+        return len(posts)
+
+    def table(teams):
+        scores = [f"{rng.randint(0, 4)}-{rng.randint(0, 4)}"
+                  for _ in teams]
+        replay = "-".join(str(rng.randint(0, 100)) for _ in range(3))
+        return render_table_prediction(scores, tuti=rng.randrange(5),
+                                       replay=replay,
+                                       bonus=rng.choice("ABCD"),
+                                       teams=teams)
+
+    for index in range(rounds):
+        day = (start + datetime.timedelta(days=index)).isoformat()
+        teams = [" - ".join(rng.sample(TEAMS, 2)) for _ in range(5)]
+        current = GeneratedRound(day, add(organiser,
+                                          f"NK {index + 1}. forduló", day))
+        for name in rng.sample(names, players):
+            if rng.random() >= participation:
+                continue
+            if rng.random() < plain_share:
+                lines = random_plain_lines(rng, index + 1, noise)
+                add(name, "<br/>".join(lines))
+                current.plain_predictions += 1
+            else:
+                add(name, table(teams), day)
+                current.table_predictions += 1
+            if rng.random() < chatter:
+                add(rng.choice(names), rng.choice(NOISE))
+        if not (open_last and index == rounds - 1):
+            current.last_post = add(organiser, table(teams), day)
+            current.closed = True
+        else:
+            current.last_post = add(rng.choice(names), table(teams), day)
+            current.table_predictions += 1
+        generated.append(current)
+    return SyntheticThread(posts, generated, names, organiser)
@@ -0,0 +1,159 @@
+"""
+Egységtesztek a böngésző nélküli (HTTP) bejelentkezéshez és a mentett
+sütik újrahasználatához.
+"""
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+from HattrickNKPredictor.forum.auth_manager import (AuthManager, LoginError,
+                                                    user_config_dir)
+from HattrickNKPredictor.forum.forum_manager import ForumDateAnalyzer
+from HattrickNKPredictor.testing.forum_server import (StubForumServer,
+                                                      render_post)
+
+
+class TestHttpLogin(unittest.TestCase):
+    """
+    A belépő űrlap kitöltése és elküldése a helyi szerverrel.
+    """
+
+    def setUp(self):
+        """Bejelentkezéshez kötött szál két nappal."""
+        self.posts = [render_post(number, "Cacci" if number % 5 == 0
+                                  else "Pista", "tipp",
+                                  f"2024-06-{14 + (number - 1) // 5}")
+                      for number in range(1, 11)]
+        self.server = StubForumServer(self.posts, page_size=4,
+                                      credentials=("user", "secret"))
+        self.server.start()
+
+    def tearDown(self):
+        """Leállítja a szervert."""
+        self.server.stop()
+
+    def test_login_returns_authenticated_session(self):
+        """Sikeres belépés után a szál olvasható."""
+        auth = AuthManager("user", "secret", self.server.forum_url)
+        session = auth.http_login()
+        self.assertEqual(self.server.logins, 1)
+        page = session.get(f"{self.server.forum_url}n=5").text
+        self.assertIn('id="m5"', page)
+        self.assertIsNone(AuthManager.find_login_form(page))
+        self.assertIsNone(auth.driver)
+
+    def test_rejected_credentials(self):
+        """Hibás jelszóra LoginError."""
+        auth = AuthManager("user", "wrong", self.server.forum_url)
+        with self.assertRaises(LoginError):
+            auth.http_login()
+        self.assertEqual(self.server.logins, 0)
+
+    def test_form_fields(self):
+        """A rejtett állapotmezők, az adatok és a gomb is elmennek."""
+        auth = AuthManager("user", "secret", self.server.forum_url)
+        action, fields = auth.read_login_form(
+            self.server.render_login_page(), self.server.forum_url)
+        self.assertEqual(action, f"{self.server.base_url}/Forum/Read.aspx")
+        self.assertEqual(fields["__VIEWSTATE"], self.server.view_state)
+        prefix = "ctl00$ctl00$CPContent$ucLogin$"
+        self.assertEqual(fields[f"{prefix}txtUserName"], "user")
+        self.assertEqual(fields[f"{prefix}txtPassword"], "secret")
+        self.assertEqual(fields[f"{prefix}butLogin"], "Belépés")
+
+    def test_browser_fallback(self):
+        """Ha nincs belépő űrlap, a Selenium-os belépésre vált."""
+        self.server.credentials = None
+        auth = AuthManager("user", "secret", self.server.forum_url)
+        with mock.patch.object(auth, "login_forum") as login_forum, \
+                mock.patch.object(auth, "convert_cookies_to_requests") \
+                as convert:
+            session = auth.open_session()
+        login_forum.assert_called_once_with()
+        self.assertIs(session, convert.return_value)
+
+    def test_date_ranges_without_browser(self):
+        """A ForumDateAnalyzer böngésző nélkül is végigmegy."""
+        analyzer = ForumDateAnalyzer("user", "secret",
+                                     self.server.forum_url)
+        self.assertEqual(analyzer.get_date_ranges(), [(2, 5), (7, 10)])
+        self.assertEqual(self.server.logins, 1)
+
+
+class TestCookieCache(unittest.TestCase):
+    """
+    A mentett sütik újrahasználata egyetlen ellenőrző kéréssel.
+    """
+
+    def setUp(self):
+        """Bejelentkezéshez kötött szál és ideiglenes sütifájl."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cookies.json")
+        self.server = StubForumServer([render_post(1, "Cacci", "tipp")],
+                                      credentials=("user", "secret"))
+        self.server.start()
+
+    def tearDown(self):
+        """Leállítja a szervert, törli a fájlokat."""
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def open_session(self, username="user", password="secret"):
+        """Új AuthManager (mint egy új futás) munkamenete."""
+        auth = AuthManager(username, password, self.server.forum_url,
+                           cookie_path=self.path)
+        self.server.requests.clear()
+        session = auth.open_session()
+        self.assertIn('id="m1"',
+                      session.get(f"{self.server.forum_url}n=1").text)
+        return auth.session_source
+
+    def test_warm_run_skips_login(self):
+        """A második futás nem jelentkezik be, a fájl csak a tulajdonosé."""
+        self.assertEqual(self.open_session(), "http")
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        self.assertEqual(self.open_session(), "cache")
+        self.assertEqual(self.server.logins, 1)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_expired_cookies_log_in_again(self):
+        """Lejárt munkamenet után új bejelentkezés és új sütik."""
+        self.open_session()
+        self.server.session_token = "expired"
+        self.assertEqual(self.open_session(), "http")
+        self.assertEqual(self.open_session(), "cache")
+        self.assertEqual(self.server.logins, 2)
+
+    def test_private_directory(self):
+        """A hiányzó könyvtárat csak a felhasználónak hozza létre, és
+        alapból a felhasználó konfigurációs könyvtárát használja."""
+        self.path = os.path.join(self.tmp.name, "config", "cookies.json")
+        self.assertEqual(self.open_session(), "http")
+        mode = os.stat(os.path.dirname(self.path)).st_mode
+        self.assertEqual(stat.S_IMODE(mode), 0o700)
+        with mock.patch.dict(os.environ, {"XDG_CONFIG_HOME": self.tmp.name}):
+            self.assertEqual(user_config_dir(), os.path.join(
+                self.tmp.name, "HattrickNKPredictor"))
+
+    def test_other_user_does_not_reuse(self):
+        """Más felhasználó nem kapja meg a mentett sütiket."""
+        self.open_session()
+        self.server.credentials = ("other", "secret")
+        self.assertEqual(self.open_session("other"), "http")
+
+    def test_wrong_password_does_not_reuse(self):
+        """A mentett sütik csak a mentéskori jelszóval használhatók."""
+        self.open_session()
+        with open(self.path, encoding="utf-8") as f:
+            self.assertNotIn("secret", f.read())
+        wrong = AuthManager("user", "guess", self.server.forum_url,
+                            cookie_path=self.path)
+        self.assertIsNone(wrong.load_session())
+        self.server.credentials = ("user", "changed")
+        self.assertEqual(self.open_session(password="changed"), "http")
+        self.assertEqual(self.open_session(password="changed"), "cache")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Egységtesztek a BatchScorer tömbös pontszámító motorhoz.
+"""
+import itertools
+import random
+import unittest
+import numpy as np
+from HattrickNKPredictor.calculators.batch import BatchScorer
+from HattrickNKPredictor.calculators.calculator import PredictionGame
+from HattrickNKPredictor.calculators.models import MatchScorer, Participant
+from HattrickNKPredictor.testing.csv_data import random_csv_data
+
+
+class TestBatchScorer(unittest.TestCase):
+    """
+    Ellenőrzi, hogy a tömbös motor pontosan ugyanazt számolja,
+    mint az objektumonkénti útvonal.
+    """
+
+    def test_score_array_matches_full_grid(self):
+        """A teljes 0..6 gólos rácson egyezik a MatchScorer-rel."""
+        goals = range(7)
+        grid = np.array(list(itertools.product(goals, repeat=4)))
+        scores = MatchScorer.calculate_score_array(
+            grid[:, 0], grid[:, 1], grid[:, 2], grid[:, 3]
+        )
+        expected = [MatchScorer.calculate_score((ph, pa), (ah, aa))
+                    for ph, pa, ah, aa in grid.tolist()]
+        self.assertEqual(scores.tolist(), expected)
+
+    def test_vectorized_game_matches_per_object_path(self):
+        """A calculate_all_scores két útvonala azonos pontokat ad."""
+        rng = random.Random(42)
+        for _ in range(20):
+            csv_data = random_csv_data(rng, 50)
+            reference = PredictionGame(csv_data)
+            reference.calculate_all_scores()
+            batch = PredictionGame(csv_data)
+            batch.calculate_all_scores(vectorized=True)
+
+            for ref, got in zip(reference.participants, batch.participants):
+                self.assertEqual(ref.match_scores, got.match_scores)
+                self.assertEqual(ref.replay_score, got.replay_score)
+                self.assertEqual(ref.bonus_score, got.bonus_score)
+                self.assertEqual(ref.total_score, got.total_score)
+
+    def test_fewer_results_than_predictions(self):
+        """Hiányzó valós eredmény esetén a meccs 0 pontot ér."""
+        participant = Participant(1, "Test", [(1, 0), (2, 1), (0, 0)], {
+            "tuti_match": 3, "replay": (50, 60, 70), "bonus": "A"
+        })
+        scorer = BatchScorer.from_participants([participant])
+        scorer.score([(1, 0), (2, 1)], (50, 60, 70), "A")
+        scorer.apply_to([participant])
+        self.assertEqual(participant.match_scores, [5, 5, 0])
+        self.assertEqual(participant.total_score, 17)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Egységtesztek a fordulóhatárok bináris keresésére (BoundaryLocator).
+"""
+import random
+import unittest
+from HattrickNKPredictor.forum.boundary_locator import UnorderedDates
+from HattrickNKPredictor.forum.sync_state import SyncState
+from HattrickNKPredictor.testing.forum_server import (StubForumServer,
+                                                      offline_analyzer,
+                                                      render_post)
+
+
+def make_thread(rng, days, per_day):
+    """Napokra bontott szál dátum nélküli hozzászólásokkal; minden
+    harmadik nap nem a szervező hozzászólásával zárul."""
+    posts = []
+    for index in range(days):
+        day = f"2024-07-{index + 1:02d}"
+        for number in range(rng.randint(per_day // 2, per_day)):
+            dated = number == 0 or rng.random() > 0.2
+            posts.append(render_post(len(posts) + 1, f"User{number}",
+                                     "tipp", day if dated else None))
+        author = "Cacci" if index % 3 else "User0"
+        posts.append(render_post(len(posts) + 1, author, "eredmény", day))
+        posts.append(render_post(len(posts) + 1, "Józsi", "Hajrá!"))
+    return posts
+
+
+class TestBoundaryLocator(unittest.TestCase):
+    """
+    A bináris keresés ugyanazokat a tartományokat adja, mint a teljes
+    bejárás, jóval kevesebb letöltéssel.
+    """
+
+    def setUp(self):
+        """Egy hosszú szál, naponként sok oldalnyi hozzászólással."""
+        self.posts = make_thread(random.Random(17), 9, 800)
+
+    def analyzer(self, server, boundary_search):
+        """ForumDateAnalyzer bejelentkezés nélkül, a helyi szerverrel."""
+        return offline_analyzer(server, boundary_search=boundary_search)
+
+    def test_matches_linear_scan(self):
+        """Azonos tartományok, töredék annyi kéréssel."""
+        with StubForumServer(self.posts, page_size=20) as server:
+            expected = self.analyzer(server, False).get_date_ranges()
+            linear_requests = len(server.requests)
+            ranges = self.analyzer(server, True).get_date_ranges()
+            search_requests = len(server.requests)
+        self.assertEqual(len(expected), 6)
+        self.assertEqual(ranges, expected)
+        self.assertLess(search_requests * 3, linear_requests)
+
+    def test_single_round_range(self):
+        """Egy nap tartománya néhány kéréssel; hiányzó vagy nem lezárt
+        napra None."""
+        with StubForumServer(self.posts, page_size=20) as server:
+            expected = self.analyzer(server, False).get_date_ranges()
+            analyzer = self.analyzer(server, True)
+            self.assertEqual(analyzer.get_round_range("2024-07-08"),
+                             expected[4])
+            self.assertLessEqual(len(server.requests), 30)
+            self.assertIsNone(analyzer.get_round_range("2024-07-07"))
+            self.assertIsNone(analyzer.get_round_range("2024-08-01"))
+
+    def test_clamped_last_page(self):
+        """A szál végén az utolsó oldalt visszaadó szerverrel is működik."""
+        with StubForumServer(self.posts[:500], page_size=20) as server:
+            expected = self.analyzer(server, False).get_date_ranges()
+            render_page = server.render_page
+            server.render_page = lambda first: render_page(
+                min(first, len(server.posts) - 19))
+            self.assertEqual(
+                self.analyzer(server, True).get_date_ranges(), expected)
+
+    def test_unordered_dates_fall_back_to_scan(self):
+        """Egy régi dátummal bemásolt táblázatot a határ ellenőrzése
+        észrevesz, és a teljes bejárás eredménye jön vissza."""
+        posts = make_thread(random.Random(17), 7, 200)
+        index = next(i for i, post in enumerate(posts)
+                     if "<th>2024-07-05</th>" in post)
+        posts[index] = render_post(index + 1, "User0", "tipp", "2024-07-02")
+        with StubForumServer(posts, page_size=20) as server:
+            expected = self.analyzer(server, False).get_date_ranges()
+            analyzer = self.analyzer(server, True)
+            with self.assertRaises(UnorderedDates):
+                analyzer.session = analyzer.login.open_session()
+                analyzer.locator().date_ranges(analyzer.ORGANISER)
+            self.assertEqual(
+                self.analyzer(server, True).get_date_ranges(), expected)
+            state = SyncState(server.forum_url)
+            offline_analyzer(server, sync_state=state).get_date_ranges()
+            for day in ("2024-07-04", "2024-07-05", "2024-07-06"):
+                linear = (tuple(state.dates[day])
+                          if state.closing_authors[day] == "Cacci"
+                          else None)
+                self.assertEqual(
+                    self.analyzer(server, True).get_round_range(day),
+                    linear)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -74,5 +74,70 @@ class TestPredictionGame(unittest.TestCase):
                       f"{type(e).__name__} unexpectedly")
 
 
+class TestLiveRescoring(unittest.TestCase):
+    """
+    Egységtesztek az egyes eredmények beérkezésekor
+    végzett részleges újraszámoláshoz.
+    """
+
+    def setUp(self):
+        """Minta forduló, amelynek eredményei egyenként érkeznek."""
+        self.sample_csv_data = [
+            ["1", "User1", "1", "0", "2", "1",
+             "0", "0", "1", "1", "3", "2", "2", "50", "60", "70", "A"],
+            ["2", "User2", "0", "1", "1",
+             "1", "2", "1", "0", "0", "1", "2", "3", "55", "65", "75", "B"],
+            ["3", "User3", "1", "1", "0",
+             "0", "1", "0", "2", "1", "0", "1", "1", "60", "70", "80", "C"],
+            ["", "", "1", "0", "2", "1", "1",
+             "1", "3", "2", "1", "2", [], "50", "60", "70", "A"],
+            ["TeamA", "TeamB", "TeamC", "TeamD", "TeamE",
+             "TeamF", "TeamG", "TeamH", "TeamI", "TeamJ"]
+        ]
+
+    def test_pending_then_incremental_equals_full(self):
+        """Függő fordulóból eredményenként felépítve ugyanaz jön ki,
+        mint a teljes újraszámolásnál."""
+        reference = PredictionGame(self.sample_csv_data)
+        reference.calculate_all_scores()
+
+        game = PredictionGame(self.sample_csv_data)
+        game.reset_results()
+        self.assertEqual(game.table.total_scores.tolist(), [0, 0, 0])
+
+        for index, result in enumerate(reference.correct_results):
+            game.set_result(index, result)
+        game.set_replay((50, None, None))
+        game.set_replay((50, 60, 70))
+        game.set_bonus("A")
+
+        self.assertEqual(game.table.match_scores.tolist(),
+                         reference.table.match_scores.tolist())
+        self.assertEqual([p.total_score for p in game.participants],
+                         [p.total_score for p in reference.participants])
+
+    def test_change_and_clear_result(self):
+        """Egy eredmény módosítása és törlése csak a változással
+        frissíti az összpontszámot."""
+        game = PredictionGame(self.sample_csv_data)
+        game.calculate_all_scores()
+        before = game.table.total_scores.copy()
+
+        delta = game.set_result(1, (0, 3))
+        self.assertEqual((game.table.total_scores - before).tolist(),
+                         delta.tolist())
+        self.assertEqual(game.participants[0].match_scores[1], 0)
+
+        game.clear_result(1)
+        self.assertIsNone(game.correct_results[1])
+        self.assertEqual(game.table.match_scores[:, 1].tolist(), [0, 0, 0])
+
+        full = PredictionGame(self.sample_csv_data)
+        full.correct_results = game.correct_results
+        full.calculate_all_scores()
+        self.assertEqual(game.table.total_scores.tolist(),
+                         full.table.total_scores.tolist())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,134 @@
+"""
+Egységtesztek a felvétel/visszajátszás (Cassette) réteghez.
+"""
+import gzip
+import json
+import os
+import random
+import tempfile
+import unittest
+import requests
+from HattrickNKPredictor.calculators.season import SeasonEngine
+from HattrickNKPredictor.forum.auth_manager import AuthManager
+from HattrickNKPredictor.forum.cassette import Cassette, CassetteMiss
+from HattrickNKPredictor.forum.fetch_scheduler import FetchScheduler
+from HattrickNKPredictor.forum.thread_crawler import ThreadCrawler
+from HattrickNKPredictor.testing.forum_server import StubForumServer
+from HattrickNKPredictor.testing.forum_server import make_season
+
+
+class TestCassette(unittest.TestCase):
+    """
+    A felvett bejárás hálózat nélkül, azonos eredménnyel játszható vissza.
+    """
+
+    def setUp(self):
+        """Ideiglenes kazetta és egy néhány napos szál."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "season.cassette")
+        days = [("2024-06-14", True), ("2024-06-15", True),
+                ("2024-06-16", True)]
+        self.posts = make_season(random.Random(23), days)
+
+    def tearDown(self):
+        """Törli az ideiglenes fájlokat."""
+        self.tmp.cleanup()
+
+    def crawl(self, session, forum_url):
+        """A szál fordulóinak CSV sorai a megadott munkamenettel."""
+        crawler = ThreadCrawler("user", "secret", forum_url)
+        crawler.session = session
+        return [r.rows() for r in crawler.crawl()]
+
+    def test_replay_matches_recording(self):
+        """Visszajátszáskor a szerver már nem is fut."""
+        with StubForumServer(self.posts, page_size=6) as server:
+            forum_url = server.forum_url
+            with Cassette(self.path, "record") as cassette:
+                session = cassette.attach(FetchScheduler().session())
+                recorded = self.crawl(session, forum_url)
+            requests_sent = len(server.requests)
+        self.assertEqual(cassette.recorded, requests_sent)
+
+        replay = Cassette(self.path)
+        rounds = self.crawl(replay.session(), forum_url)
+        self.assertEqual(rounds, recorded)
+        self.assertEqual(replay.replayed, requests_sent)
+        season = SeasonEngine(max_workers=1).score(rounds)
+        self.assertEqual(len(season.rounds), 3)
+
+    def test_retried_attempts_are_not_recorded(self):
+        """Az újrapróbált 429/5xx válaszok helyett csak a végső kerül a
+        kazettára, így a visszajátszás a teljes bejárást adja."""
+        scheduler = FetchScheduler(rate=1000.0, burst=100,
+                                   sleep=lambda _: None)
+        with StubForumServer(self.posts, page_size=6) as server:
+            forum_url = server.forum_url
+            server.failures = [503, None, 429, 502, None, 500]
+            with Cassette(self.path, "record") as cassette:
+                recorded = self.crawl(cassette.attach(scheduler.session()),
+                                      forum_url)
+            requests_sent = len(server.requests)
+        self.assertEqual(scheduler.stats.retries, 4)
+        self.assertEqual(cassette.recorded, requests_sent - 4)
+        self.assertEqual(len(recorded), 3)
+        replay = Cassette(self.path)
+        self.assertEqual(self.crawl(replay.session(), forum_url), recorded)
+
+    def test_session_cookies_are_not_stored(self):
+        """A belépés Set-Cookie fejléce nem kerül az archívumba."""
+        with StubForumServer(self.posts,
+                             credentials=("user", "secret")) as server:
+            auth = AuthManager("user", "secret", server.forum_url)
+            with Cassette(self.path, "record") as cassette:
+                session = cassette.attach(requests.Session())
+                action, fields = auth.read_login_form(
+                    session.get(server.forum_url).text, server.forum_url)
+                response = session.post(action, data=fields)
+        self.assertIn(server.session_token, response.history[0].headers[
+            "Set-Cookie"])
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            archive = f.read()
+        interactions = json.loads(archive)["interactions"].values()
+        self.assertEqual(sum(map(len, interactions)), 3)
+        self.assertNotIn(server.session_token, archive)
+
+    def test_unknown_request(self):
+        """Nem felvett kérésre CassetteMiss."""
+        with StubForumServer(self.posts) as server:
+            with Cassette(self.path, "record") as cassette:
+                cassette.attach(requests.Session()).get(
+                    f"{server.forum_url}n=1")
+            forum_url = server.forum_url
+        session = Cassette(self.path).session()
+        self.assertEqual(session.get(f"{forum_url}n=1").status_code, 200)
+        with self.assertRaises(CassetteMiss):
+            session.get(f"{forum_url}n=21")
+
+    def test_repeated_requests_and_bodies(self):
+        """Az ismételt kérések sorban, a POST törzs szerint, bájthűen."""
+        with StubForumServer(self.posts, page_size=2) as server:
+            forum_url = server.forum_url
+            with Cassette(self.path, "record") as cassette:
+                session = cassette.attach(requests.Session())
+                first = session.get(f"{forum_url}n=1").content
+                server.posts[0] = server.posts[1]
+                second = session.get(f"{forum_url}n=1").content
+                login_page = session.post(forum_url, data={"a": "1"}).text
+        replay = Cassette(self.path).session()
+        self.assertEqual(replay.get(f"{forum_url}n=1").content, first)
+        self.assertEqual(replay.get(f"{forum_url}n=1").content, second)
+        self.assertEqual(replay.get(f"{forum_url}n=1").content, second)
+        self.assertEqual(replay.post(forum_url, data={"a": "1"}).text,
+                         login_page)
+        with self.assertRaises(CassetteMiss):
+            replay.post(forum_url, data={"a": "2"})
+
+    def test_invalid_mode(self):
+        """Ismeretlen mód hibát ad."""
+        with self.assertRaises(ValueError):
+            Cassette(self.path, "rewind")
+
+
+if __name__ == '__main__':
+    unittest.main()
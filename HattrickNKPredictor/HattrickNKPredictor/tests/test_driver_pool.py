@@ -0,0 +1,187 @@
+"""
+Egységtesztek a böngészős bejelentkezéshez: a folyamatonként egyetlen
+böngészőt kiosztó DriverPool és a fix várakozások helyetti feltételek.
+"""
+import time
+import unittest
+from selenium.common import NoSuchElementException
+from HattrickNKPredictor.forum.auth_manager import (AuthManager, DriverPool,
+                                                    LoginError)
+
+PREFIX = "ctl00_ctl00_CPContent_ucLogin_"
+
+
+class FakeElement:
+    """Egy oldalelem, amely a rajta végzett műveleteket naplózza."""
+
+    def __init__(self, browser, name, on_click=None):
+        """Az elem a böngészőjébe naplóz; on_click: a kattintás hatása."""
+        self.browser = browser
+        self.name = name
+        self.on_click = on_click
+        self.visible = True
+
+    def is_displayed(self):
+        """Látható-e (a süti-ablak kattintásra eltűnik)."""
+        return self.visible
+
+    def is_enabled(self):
+        """Az elemek mindig kattinthatók."""
+        return True
+
+    def send_keys(self, text):
+        """Naplózza a begépelt szöveget."""
+        self.browser.actions.append(("type", self.name, text))
+
+    def click(self):
+        """Naplózza a kattintást, és végrehajtja a hatását."""
+        self.browser.actions.append(("click", self.name))
+        if self.on_click:
+            self.on_click()
+
+
+class FakeBrowser:
+    """A fórum belépő oldalát utánzó, Selenium-szerű illesztőprogram.
+
+    banner: megjelenik-e a süti-ablak, accept: elfogadja-e a belépést."""
+
+    def __init__(self, banner=True, accept=True):
+        """Üres oldallal és üres művelet-naplóval indul."""
+        self.banner = banner
+        self.accept = accept
+        self.elements = {}
+        self.actions = []
+
+    def set_page_load_timeout(self, seconds):
+        """Az oldalak azonnal betöltődnek, a korlát nem számít."""
+
+    def get(self, url):
+        """Betölti a belépő oldalt: süti-ablak (ha van), a két mező és a
+        belépés gomb."""
+        self.actions.append(("get", url))
+        self.elements = {}
+        if self.banner:
+            banner = FakeElement(self, "banner")
+            banner.on_click = lambda: setattr(banner, "visible", False)
+            self.elements["css selector", ".cky-btn.cky-btn-accept"] = banner
+        for field in ("txtUserName", "txtPassword"):
+            self.elements["id", PREFIX + field] = FakeElement(self, field)
+        self.elements["id", PREFIX + "butLogin"] = FakeElement(
+            self, "butLogin", self.submit)
+
+    def submit(self):
+        """A belépés gomb hatása: elfogadáskor eltűnik az űrlap."""
+        if self.accept:
+            self.elements = {}
+
+    def find_element(self, by, value):
+        """A Selenium find_element-je: hiányzó elemre
+        NoSuchElementException."""
+        if (by, value) not in self.elements:
+            raise NoSuchElementException(value)
+        return self.elements[by, value]
+
+    def quit(self):
+        """Naplózza a böngésző bezárását."""
+        self.actions.append(("quit",))
+
+
+class TestDriverPool(unittest.TestCase):
+    """
+    Egy futásban csak egy böngésző indul, és a bejelentkezett állapota
+    újrahasznosul.
+    """
+
+    def setUp(self):
+        """Valódi böngésző helyett FakeBrowser-t indító készlet."""
+        self.browsers = []
+
+        def factory():
+            self.browsers.append(FakeBrowser())
+            return self.browsers[-1]
+
+        self.pool = DriverPool(factory)
+
+    def manager(self, username="user"):
+        """AuthManager a teszt készletével."""
+        return AuthManager(username, "secret", "https://ht/Forum/Read.aspx?",
+                           driver_pool=self.pool)
+
+    def test_one_browser_per_process(self):
+        """A bejelentkezés, a dátumelemzés és a letöltés egy böngészőn."""
+        for _ in range(3):
+            consumer = self.manager()
+            consumer.login_forum()
+            self.assertIs(consumer.driver, self.browsers[0])
+            consumer.close()
+        self.assertEqual(self.pool.starts, 1)
+        self.assertNotIn(("quit",), self.browsers[0].actions)
+
+    def test_authenticated_state_is_reused(self):
+        """A már bejelentkezett böngészőben nem tölti ki újra az űrlapot."""
+        self.manager().login_forum()
+        browser = self.browsers[0]
+        form_actions = len(browser.actions)
+        self.manager().login_forum()
+        self.assertEqual(browser.actions[form_actions:],
+                         [("get", "https://ht/Forum/Read.aspx?")])
+        self.assertEqual(self.pool.authenticated_as, "user")
+        self.manager("other").login_forum()
+        self.assertIn(("type", "txtUserName", "other"), browser.actions)
+
+    def test_shutdown_quits_once(self):
+        """A leállítás egyszer zárja be a böngészőt; utána újat indít."""
+        self.manager().login_forum()
+        self.pool.shutdown()
+        self.pool.shutdown()
+        self.assertEqual(self.browsers[0].actions.count(("quit",)), 1)
+        self.assertIsNone(self.pool.authenticated_as)
+        self.manager().login_forum()
+        self.assertEqual(self.pool.starts, 2)
+
+
+class TestBrowserLogin(unittest.TestCase):
+    """
+    A lépések a feltételek teljesülésekor azonnal továbbmennek, és a
+    bejelentkezés lépésenkénti időt ad.
+    """
+
+    def login(self, browser, **timeouts):
+        """login_forum a megadott böngészővel; visszaadja a managert."""
+        auth = AuthManager("user", "secret", "https://ht/Forum/Read.aspx?",
+                           driver_pool=DriverPool(lambda: browser),
+                           timeouts=timeouts)
+        auth.login_forum()
+        return auth
+
+    def test_steps_without_fixed_sleeps(self):
+        """Süti-ablak, kitöltés, elküldés; egy másodpercen belül."""
+        browser = FakeBrowser()
+        started = time.perf_counter()
+        auth = self.login(browser)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(browser.actions[1:], [
+            ("click", "banner"),
+            ("type", "txtUserName", "user"),
+            ("type", "txtPassword", "secret"),
+            ("click", "butLogin"),
+        ])
+        self.assertEqual(list(auth.timings), ["browser start", "page load",
+                                              "cookie banner", "submit",
+                                              "authenticated"])
+        self.assertIn("submit", auth.format_timings())
+
+    def test_missing_banner_waits_only_its_timeout(self):
+        """Süti-ablak nélkül csak a cookie_banner ideig vár."""
+        auth = self.login(FakeBrowser(banner=False), cookie_banner=0.2)
+        self.assertLess(auth.timings["cookie banner"], 1.0)
+        self.assertEqual(auth.driver_pool.authenticated_as, "user")
+
+    def test_rejected_login(self):
+        """Ha az űrlap megmarad, LoginError az authenticated idő után."""
+        with self.assertRaises(LoginError):
+            self.login(FakeBrowser(accept=False), authenticated=0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Egységtesztek a fordulók exportálásához és az NKScoreAggregator
+összesítőhöz.
+"""
+import os
+import random
+import tempfile
+import unittest
+from HattrickNKPredictor.calculators.exporters import (NKScoreAggregator,
+                                                       export_rounds_to_txt)
+from HattrickNKPredictor.calculators.season import SeasonEngine
+from HattrickNKPredictor.testing.csv_data import random_csv_data
+
+
+class TestNKScoreAggregator(unittest.TestCase):
+    """
+    Egységtesztek az összesített táblázat determinisztikus sorrendjéhez.
+    """
+
+    def test_ties_render_in_deterministic_order(self):
+        """Azonos pontszámnál a név dönt, a fájlok sorrendjétől
+        függetlenül."""
+        rounds = {
+            "fordulo10.txt": "[tr][th]beta[/th][td]7p[/td]\n"
+                             "[tr][th]Alfa[/th][td]3p[/td]\n",
+            "fordulo2.txt": "[tr][th]Alfa[/th][td]4p[/td]\n"
+                            "[tr][th]gamma[/th][td]9p[/td]\n",
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            for filename, content in rounds.items():
+                with open(os.path.join(tmp, filename), "w",
+                          encoding="utf-8") as f:
+                    f.write(content)
+            aggregator = NKScoreAggregator()
+            aggregator.add_folder(tmp)
+            table = aggregator._format_table()
+
+        rows = [line for line in table.splitlines()
+                if line.startswith("[tr][td]")]
+        self.assertEqual(rows, [
+            "[tr][td]1[/td][td]gamma[/td][td]9[/td][/tr]",
+            "[tr][td]2[/td][td]Alfa[/td][td]7[/td][/tr]",
+            "[tr][td]3[/td][td]beta[/td][td]7[/td][/tr]",
+        ])
+
+    def test_exported_rounds_aggregate_to_season(self):
+        """A fordulónkénti fájlok összesítése a szezon állása, üres
+        fordulóval együtt."""
+        rng = random.Random(6)
+        season = SeasonEngine(max_workers=1).score(
+            [random_csv_data(rng, count) for count in (6, 0, 9)])
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = export_rounds_to_txt(season.rounds, tmp)
+            aggregator = NKScoreAggregator()
+            aggregator.add_folder(tmp)
+        self.assertEqual([os.path.basename(path) for path in paths],
+                         ["fordulo1.txt", "fordulo2.txt", "fordulo3.txt"])
+        self.assertEqual(dict(aggregator.scores), dict(season.standings()))
+
+    def test_ties_follow_season_tiebreaks(self):
+        """A SeasonResult tiebreaks-szel az összesítő sorrendje a szezon
+        állásáé akkor is, ha a név más sorrendet adna."""
+        rng = random.Random(11)
+        season = SeasonEngine(max_workers=1).score(
+            [random_csv_data(rng, 60) for _ in range(3)])
+        standings = season.standings()
+        self.assertTrue(any(
+            first[1] == second[1] and first[0].casefold()
+            > second[0].casefold()
+            for first, second in zip(standings, standings[1:])))
+        with tempfile.TemporaryDirectory() as tmp:
+            export_rounds_to_txt(season.rounds, tmp)
+            aggregator = NKScoreAggregator(season.tiebreaks)
+            aggregator.add_folder(tmp)
+            table = aggregator._format_table()
+        names = [line.split("[td]")[2].split("[/td]")[0]
+                 for line in table.splitlines()
+                 if line.startswith("[tr][td]")]
+        self.assertEqual(names, [name for name, _ in standings])
+
+
+if __name__ == '__main__':
+    unittest.main()
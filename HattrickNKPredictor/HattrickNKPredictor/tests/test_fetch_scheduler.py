@@ -0,0 +1,157 @@
+"""
+Egységtesztek a kéréseket ütemező FetchScheduler-hez.
+"""
+import random
+import unittest
+import requests
+from HattrickNKPredictor.forum.fetch_scheduler import (FetchScheduler,
+                                                       TokenBucket)
+from HattrickNKPredictor.forum.forum_manager import ForumFetcher
+from HattrickNKPredictor.testing.forum_server import make_thread
+from HattrickNKPredictor.testing.forum_server import StubForumServer
+
+
+class FakeClock:
+    """Kézzel léptetett óra; a sleep az időt előre viszi."""
+
+    def __init__(self):
+        """A 0. másodpercről, alvások nélkül indul."""
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        """Az aktuális idő (time.monotonic helyett)."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Naplózza az alvást, és ennyivel előre viszi az órát."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    """
+    A token-vödör a burst után a megadott ütemben enged kéréseket.
+    """
+
+    def test_rate_after_burst(self):
+        """burst kérés azonnal, utána rate szerinti várakozás."""
+        clock = FakeClock()
+        bucket = TokenBucket(4.0, burst=2, clock=clock, sleep=clock.sleep)
+        waits = [bucket.acquire() for _ in range(6)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(sum(waits), 1.0)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_invalid_parameters(self):
+        """Nem pozitív ütem hibát ad."""
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class TestFetchScheduler(unittest.TestCase):
+    """
+    Újrapróbálás, időkorlát és korlátozott párhuzamosság a helyi
+    szerverrel.
+    """
+
+    def setUp(self):
+        """Szál és gyors ütemező (alvás nélküli várakozással)."""
+        self.posts = make_thread(60)
+        self.sleeps = []
+
+    def scheduler(self, **kwargs):
+        """Ütemező, amely a várakozásokat csak feljegyzi."""
+        options = {"rate": 1000.0, "burst": 100, "backoff": 0.5,
+                   "sleep": self.sleeps.append, "rng": random.Random(18)}
+        options.update(kwargs)
+        return FetchScheduler(**options)
+
+    def test_retries_transient_errors(self):
+        """429 és 5xx után újrapróbál, a várakozás exponenciálisan nő."""
+        scheduler = self.scheduler()
+        with StubForumServer(self.posts) as server:
+            server.failures = [503, 429, 502]
+            response = scheduler.session().get(f"{server.forum_url}n=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(server.requests), 4)
+        self.assertEqual(len(self.sleeps), 3)
+        for attempt, delay in enumerate(self.sleeps):
+            self.assertLessEqual(delay, 0.5 * 2 ** attempt)
+        stats = scheduler.stats.summary()
+        self.assertEqual((stats["requests"], stats["retries"],
+                          stats["failures"]), (4, 3, 0))
+        self.assertEqual([status for _, status, _ in
+                          scheduler.stats.timings], [503, 429, 502, 200])
+
+    def test_gives_up_after_retries(self):
+        """A próbálkozások elfogyása után HTTPError-t dob."""
+        scheduler = self.scheduler(retries=2)
+        with StubForumServer(self.posts) as server:
+            server.failures = [500] * 5
+            with self.assertRaises(requests.HTTPError) as raised:
+                scheduler.session().get(f"{server.forum_url}n=1")
+        self.assertEqual(raised.exception.response.status_code, 500)
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(scheduler.stats.failures, 1)
+
+    def test_failed_page_stops_fetch(self):
+        """Egy végleg hibás oldal nem üres oldalként zárja le a bejárást."""
+        scheduler = self.scheduler(retries=2)
+        with StubForumServer(self.posts, page_size=10) as server:
+            server.failures = [None, 503, 503, 503]
+            fetcher = ForumFetcher("user", "secret", server.forum_url, 1,
+                                   60, max_workers=1, scheduler=scheduler)
+            fetcher.session = scheduler.session()
+            with self.assertRaises(requests.HTTPError):
+                fetcher.fetch_forum_data()
+
+    def test_post_is_not_retried(self):
+        """A nem idempotens kérés egyszer megy el, a választ visszaadja."""
+        scheduler = self.scheduler()
+        with StubForumServer(self.posts) as server:
+            server.failures = [503]
+            response = scheduler.session().post(server.forum_url, data={})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(self.sleeps, [])
+
+    def test_client_errors_are_not_retried(self):
+        """A 404 végleges."""
+        scheduler = self.scheduler()
+        with StubForumServer(self.posts) as server:
+            response = scheduler.session().get(f"{server.base_url}/x")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_timeout_is_retried(self):
+        """Időtúllépés után újrapróbál, végül továbbdobja a hibát."""
+        scheduler = self.scheduler(retries=1, timeout=(1.0, 0.05))
+        with StubForumServer(self.posts, delay=0.3) as server:
+            with self.assertRaises(requests.Timeout):
+                scheduler.session().get(f"{server.forum_url}n=1")
+            attempts = len(server.requests)
+        self.assertEqual(attempts, 2)
+        self.assertEqual([status for _, status, _ in
+                          scheduler.stats.timings], [None, None])
+
+    def test_bounded_concurrency(self):
+        """A párhuzamos letöltés sem lépi túl a max_concurrency-t, és a
+        kapcsolat-készlet is ekkora."""
+        scheduler = self.scheduler(max_concurrency=2)
+        with StubForumServer(self.posts, page_size=5, delay=0.02) as server:
+            fetcher = ForumFetcher("user", "secret", server.forum_url, 1,
+                                   60, max_workers=6, scheduler=scheduler)
+            fetcher.session = scheduler.session()
+            data = fetcher.fetch_forum_data()
+        self.assertEqual([post["sorszam"] for post in data],
+                         [n for n in range(1, 61) if n % 7])
+        self.assertEqual(scheduler.stats.max_in_flight, 2)
+        self.assertEqual(len(scheduler.stats.timings), len(server.requests))
+        adapter = fetcher.session.get_adapter("https://www.hattrick.org/")
+        self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"],
+                         scheduler.max_concurrency)
+
+
+if __name__ == '__main__':
+    unittest.main()
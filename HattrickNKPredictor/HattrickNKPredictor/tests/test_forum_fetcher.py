@@ -0,0 +1,55 @@
+"""
+Egységtesztek a ForumFetcher oldalletöltéséhez egy helyi fórum-szerverrel.
+"""
+import unittest
+import requests
+from HattrickNKPredictor.forum.forum_manager import ForumFetcher
+from HattrickNKPredictor.testing.forum_server import (StubForumServer,
+                                                      make_thread)
+
+
+class TestForumFetcher(unittest.TestCase):
+    """
+    A párhuzamos letöltés ugyanazt adja, mint a soros linkkövetés.
+    """
+
+    def fetch(self, server, kezdo, utolso, max_workers):
+        """Letölti a kezdo..utolso tartományt a megadott szálszámmal."""
+        fetcher = ForumFetcher("user", "secret", server.forum_url,
+                               kezdo, utolso, max_workers=max_workers)
+        with requests.Session() as session:
+            fetcher.session = session
+            return fetcher.fetch_forum_data()
+
+    def test_concurrent_matches_serial(self):
+        """Azonos hozzászólások, azonos sorrendben."""
+        with StubForumServer(make_thread(230), page_size=20) as server:
+            serial = self.fetch(server, 15, 204, max_workers=1)
+            serial_requests = len(server.requests)
+            concurrent = self.fetch(server, 15, 204, max_workers=4)
+
+        self.assertEqual(concurrent, serial)
+        numbers = [post["sorszam"] for post in serial]
+        self.assertEqual(numbers, sorted(numbers))
+        self.assertEqual((numbers[0], numbers[-1]), (15, 204))
+        self.assertEqual(len(server.requests), 2 * serial_requests)
+
+    def test_pages_are_fetched_concurrently(self):
+        """Késleltetett szervernél is több kérés fut egyszerre."""
+        with StubForumServer(make_thread(200), page_size=10,
+                             delay=0.05) as server:
+            data = self.fetch(server, 1, 200, max_workers=4)
+        self.assertGreater(server.max_in_flight, 1)
+        self.assertEqual(len(data), 200 - 200 // 7)
+
+    def test_falls_back_to_serial_walk(self):
+        """Következő link nélkül az első oldalon megáll, mint korábban."""
+        with StubForumServer(make_thread(60), page_size=20,
+                             next_links=False) as server:
+            data = self.fetch(server, 1, 60, max_workers=4)
+        self.assertEqual([post["sorszam"] for post in data][-1], 20)
+        self.assertEqual(len(server.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
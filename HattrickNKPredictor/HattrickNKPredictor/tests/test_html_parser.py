@@ -0,0 +1,131 @@
+"""
+Egységtesztek a cserélhető HTML elemzőkhöz.
+"""
+import unittest
+from bs4 import BeautifulSoup
+from HattrickNKPredictor.forum.forum_manager import (ForumDateAnalyzer,
+                                                     ForumFetcher)
+from HattrickNKPredictor.forum.html_parser import (SelectolaxParser,
+                                                   available_backends,
+                                                   find_next_href,
+                                                   parse_forum_page)
+from HattrickNKPredictor.testing.forum_server import (StubForumServer,
+                                                      render_post,
+                                                      render_table_prediction)
+
+PLAIN_POST = ("NK 12. forduló<br/>Magyarország - Ausztria 2-1<br/>"
+              "Spanyolország - Olaszország 1:1 T<br/>"
+              "Brazília - Argentína (3) 0-2<br/>"
+              "Németország - Franciaország 3-3<br/>"
+              "Anglia - Hollandia 2-0<br/>Replay<br/>40-35-25<br/>"
+              "Bónusz<br/>B")
+
+
+def legacy_wrappers(page_html):
+    """Az eredeti, teljes fát építő feldolgozás."""
+    return BeautifulSoup(page_html, 'html.parser').select('.cfWrapper')
+
+
+class TestHtmlParser(unittest.TestCase):
+    """
+    Minden elérhető elemzővel ugyanazt kell kapni, mint a teljes
+    html.parser fával.
+    """
+
+    def setUp(self):
+        """Oldal táblázatos, szöveges és zaj-hozzászólásokkal."""
+        posts = [
+            render_post(1, "Cacci", render_table_prediction(
+                ["1-0", "2-2", "0-3", "1-1", "4-2"], tuti=2,
+                replay="50-30-20", bonus="C",
+                teams=[f"A{i} - B{i}" for i in range(5)]), "2024-06-14"),
+            render_post(2, "Pista", PLAIN_POST),
+            render_post(3, "Józsi", "Hajrá &amp; sok sikert!"),
+        ]
+        with StubForumServer(posts, page_size=2) as server:
+            self.page_html = server.render_page(1)
+        self.fetcher = ForumFetcher("user", "secret", "", 1, 2)
+
+    def test_backends_match_legacy_parse(self):
+        """A hozzászólások kinyert adatai elemzőnként azonosak."""
+        expected = [self.fetcher.parse_post(wrapper)
+                    for wrapper in legacy_wrappers(self.page_html)]
+        self.assertEqual(expected[1]["meccsek"],
+                         ['2', '1', '1', '1', '0', '2', '3', '3', '2', '0'])
+        analyzer = ForumDateAnalyzer("user", "secret", "")
+        dates = [analyzer.extract_post_data(wrapper)
+                 for wrapper in legacy_wrappers(self.page_html)]
+
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                page = parse_forum_page(self.page_html, backend)
+                self.assertEqual([self.fetcher.parse_post(wrapper)
+                                  for wrapper in page.wrappers], expected)
+                self.assertEqual(
+                    [analyzer.extract_post_data(w)
+                     for w in page.wrappers], dates)
+                self.assertEqual(page.next_url("http://h/Forum/x.aspx"),
+                                 "http://h/Forum/Read.aspx?n=3&t=17632450"
+                                 "&v=4")
+
+    def test_find_next_href(self):
+        """Attribútum-sorrendtől és idézőjelezéstől független."""
+        self.assertEqual(find_next_href(
+            "<a href='/x?n=21&amp;v=4' accesskey=N>K</a>"), "/x?n=21&v=4")
+        self.assertEqual(find_next_href(
+            '<a href="/prev">E</a><a class="n" title="Következő" '
+            'href="/next">K</a>'), "/next")
+        self.assertIsNone(find_next_href('<a title="Előző" href="/p">E</a>'))
+
+    def test_unknown_backend(self):
+        """Ismeretlen elemző névre hibát ad."""
+        with self.assertRaises(ValueError):
+            parse_forum_page(self.page_html, "regex")
+
+
+@unittest.skipIf(SelectolaxParser is None, "selectolax is not installed")
+class TestSelectolaxNode(unittest.TestCase):
+    """
+    A SelectolaxNode ugyanazt adja, mint a BeautifulSoup Tag a feldolgozó
+    által használt műveletekre.
+    """
+
+    def setUp(self):
+        """Ugyanaz az oldal selectolax és html.parser elemzéssel."""
+        TestHtmlParser.setUp(self)
+        self.nodes = parse_forum_page(self.page_html, 'selectolax').wrappers
+        self.tags = legacy_wrappers(self.page_html)
+
+    def test_default_backend_when_installed(self):
+        """Telepítve a selectolax a leggyorsabb, alapértelmezett elemző."""
+        self.assertEqual(available_backends()[0], 'selectolax')
+
+    def test_adapter_matches_soup(self):
+        """select, select_one, find_all, szöveg és attribútumok."""
+        self.assertEqual(len(self.nodes), len(self.tags))
+        selectors = ['.cfHeader a[id]', '.htMlTable th', '.htMlTable td',
+                     '.hattrick-ml', '.message', 'table']
+        for node, tag in zip(self.nodes, self.tags):
+            for selector in selectors:
+                with self.subTest(selector=selector):
+                    self.assertEqual(
+                        [n.get_text('|') for n in node.select(selector)],
+                        [t.get_text('|') for t in tag.select(selector)])
+                    first, expected = (node.select_one(selector),
+                                       tag.select_one(selector))
+                    self.assertEqual(first is None, expected is None)
+                    if expected is not None:
+                        self.assertEqual(first.text, expected.text)
+            self.assertEqual([n.text for n in node.find_all('a')],
+                             [t.text for t in tag.find_all('a')])
+            self.assertEqual(node.get_text('\n'), tag.get_text('\n'))
+            anchor, expected = node.select_one('a'), tag.select_one('a')
+            self.assertEqual(anchor.attrs, expected.attrs)
+            self.assertEqual(anchor['id'], expected['id'])
+        self.assertIsNone(self.nodes[1].select_one('.htMlTable'))
+        with self.assertRaises(KeyError):
+            self.nodes[0].select_one('a')['data-missing']
+
+
+if __name__ == '__main__':
+    unittest.main()
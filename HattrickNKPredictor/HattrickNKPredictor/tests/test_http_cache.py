@@ -0,0 +1,80 @@
+"""
+Egységtesztek a HttpCache lemezes válasz-gyorsítótárhoz.
+"""
+import os
+import tempfile
+import unittest
+import requests
+from HattrickNKPredictor.forum.forum_manager import ForumFetcher
+from HattrickNKPredictor.forum.http_cache import HttpCache
+from HattrickNKPredictor.testing.forum_server import StubForumServer
+from HattrickNKPredictor.testing.forum_server import make_thread
+
+
+class TestHttpCache(unittest.TestCase):
+    """
+    Egységtesztek a tároláshoz, a feltételes kérésekhez és az
+    immutable oldalakhoz.
+    """
+
+    def setUp(self):
+        """Ideiglenes gyorsítótár fájl és HTTP munkamenet."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = HttpCache(os.path.join(self.tmp.name, "cache.sqlite"))
+        self.session = requests.Session()
+
+    def tearDown(self):
+        """Lezárja a munkamenetet és törli a fájlokat."""
+        self.session.close()
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_store_and_lookup(self):
+        """A törzs tömörítve tárolódik, és változatlanul jön vissza."""
+        body = ("<div class='cfWrapper'>tipp</div>" * 500).encode()
+        self.cache.store("http://x/a", body, etag='"1"')
+        entry = self.cache.lookup("http://x/a")
+        self.assertEqual(entry.body, body)
+        self.assertEqual(entry.etag, '"1"')
+        self.assertFalse(entry.immutable)
+        self.assertIsNone(self.cache.lookup("http://x/b"))
+
+        size = self.cache._db.execute(  # pylint: disable=protected-access
+            "SELECT length(body) FROM responses").fetchone()[0]
+        self.assertLess(size, len(body) // 10)
+
+    def test_conditional_and_immutable_requests(self):
+        """Második kérésre 304, immutable oldalra nincs kérés."""
+        with StubForumServer(make_thread(30)) as server:
+            url = f"{server.forum_url}n=1"
+            first = self.cache.get(self.session, url)
+            second = self.cache.get(self.session, url)
+            self.assertEqual(second.text, first.text)
+            self.assertEqual(server.not_modified, 1)
+
+            self.cache.mark_immutable(url)
+            third = self.cache.get(self.session, url)
+            self.assertEqual(third.text, first.text)
+            self.assertEqual(len(server.requests), 2)
+        self.assertEqual((self.cache.fetched, self.cache.revalidated,
+                          self.cache.hits), (1, 1, 1))
+
+    def test_recompute_fetches_only_open_pages(self):
+        """A lezárt fordulók teljes oldalait a második futás már nem
+        kéri le, és ugyanazt az adatot kapja."""
+        with StubForumServer(make_thread(100), page_size=10) as server:
+            runs = []
+            for _ in range(2):
+                fetcher = ForumFetcher("user", "secret", server.forum_url,
+                                       1, 95, cache=self.cache)
+                fetcher.session = self.session
+                fetcher.immutable_until = 95
+                server.requests.clear()
+                runs.append(fetcher.fetch_forum_data())
+            self.assertEqual(len(server.requests), 1)
+            self.assertIn("n=91", server.requests[0])
+        self.assertEqual(runs[0], runs[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
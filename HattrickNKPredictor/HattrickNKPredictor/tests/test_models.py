@@ -2,8 +2,11 @@
 Egységtesztek a MatchScorer osztály calculate_score metódusához.
 Ez a metódus kiszámítja a pontszámot a tipp és a tényleges eredmény alapján.
 """
+import itertools
 import unittest
-from HattrickNKPredictor.calculators.models import MatchScorer, Participant
+import numpy as np
+from HattrickNKPredictor.calculators.models import (MatchScorer, Participant,
+                                                    ScoreMatrix)
 
 
 class TestMatchScorer(unittest.TestCase):
@@ -79,3 +82,40 @@ class TestParticipant(unittest.TestCase):
         self.assertEqual(self.participant.replay_score, 6)
 
         # Egyik sem pontos, csak 2
+
+
+class TestScoreMatrix(unittest.TestCase):
+    """
+    Egységtesztek az előre kiszámolt ScoreMatrix pont-táblához.
+    """
+
+    def setUp(self):
+        """Kis méretű tábla a teljes rács bejárásához."""
+        self.matrix = ScoreMatrix(max_goals=5)
+
+    def test_table_matches_calculate_score(self):
+        """A tábla minden eleme egyezik a képlettel."""
+        for goals in itertools.product(range(6), repeat=4):
+            self.assertEqual(
+                self.matrix.table[goals],
+                MatchScorer.calculate_score(goals[:2], goals[2:])
+            )
+
+    def test_score_above_cap_falls_back_to_formula(self):
+        """A határ fölötti gólszámnál a képlet számol."""
+        self.assertEqual(self.matrix.score((7, 1), (6, 0)), 3)
+        self.assertEqual(self.matrix.score((2, 1), (2, 1)), 5)
+
+    def test_score_many_mixed_range(self):
+        """A tömbös lekérdezés kevert (határon belüli és kívüli)
+        bemenetre is helyes."""
+        pred_home = np.array([2, 8, 0, 9])
+        pred_away = np.array([1, 0, 0, 9])
+        scores = self.matrix.score_many(pred_home, pred_away,
+                                        np.array([2, 7, 1, 9]),
+                                        np.array([1, 0, 1, 8]))
+        self.assertEqual(scores.tolist(), [5, 2, 3, 1])
+
+    def test_shared_returns_same_instance(self):
+        """A közös tábla folyamaton belül csak egyszer épül fel."""
+        self.assertIs(ScoreMatrix.shared(), ScoreMatrix.shared())
@@ -0,0 +1,51 @@
+"""
+Egységtesztek a szöveges tipp-hozzászólások nyelvtanához.
+"""
+import random
+import unittest
+from HattrickNKPredictor.forum.post_grammar import (parse_plain_post,
+                                                    split_lines)
+from HattrickNKPredictor.testing.posts import (grammar_parse, legacy_parse,
+                                               random_plain_lines)
+
+
+class TestPostGrammar(unittest.TestCase):
+    """
+    A nyelvtan a korábbi feldolgozással azonos eredményt ad.
+    """
+
+    def test_matches_legacy_parser(self):
+        """Több ezer változatos hozzászóláson egyezik."""
+        rng = random.Random(14)
+        for _ in range(3000):
+            lines = random_plain_lines(rng, noise=0.4)
+            self.assertEqual(grammar_parse(lines), legacy_parse(lines),
+                             lines)
+
+    def test_typed_result(self):
+        """A mezők és az elutasított sorok."""
+        text = ("Sziasztok!\n NK 3. forduló \nA - B 2-1\n"
+                "C - D (12) 1:1 T\nE - F 0-0\nG - H 3-2\nI - J 1-4\n"
+                "ezt nem értem\nReplay\n40-35-25\nBónusz\nválasz: C\n")
+        post = parse_plain_post(split_lines(text))
+        self.assertEqual(post.header, "NK 3. forduló")
+        self.assertTrue(post.is_complete)
+        self.assertEqual(post.matches, ['2', '1', '1', '1', '0', '0',
+                                        '3', '2', '1', '4'])
+        self.assertEqual(post.tuti, 3)
+        self.assertEqual((post.replay, post.bonus), ("40-35-25", "C"))
+        self.assertEqual(post.rejected, [(8, "ezt nem értem")])
+
+    def test_missing_header(self):
+        """NK fejléc nélkül nincs eredmény."""
+        self.assertIsNone(parse_plain_post(["A - B 2-1", "Replay"]))
+
+    def test_trailing_bonus_keyword(self):
+        """Az utolsó sorban álló bónusz kulcsszó nem okoz hibát."""
+        post = parse_plain_post(["NK 1", "A - B 1-0", "Bónusz"])
+        self.assertIsNone(post.bonus)
+        self.assertEqual(post.matches, ['1', '0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Egységtesztek a RankingIndex rangsor-indexhez.
+"""
+import unittest
+from unittest import mock
+import numpy as np
+from HattrickNKPredictor.calculators.calculator import PredictionGame
+from HattrickNKPredictor.calculators.ranking import RankingIndex
+
+
+class TestRankingIndex(unittest.TestCase):
+    """
+    Egységtesztek a RankingIndex top-K és helyezés lekérdezéseihez.
+    """
+
+    def test_competition_ranking(self):
+        """Holtversenyben azonos a helyezés, utána kimarad (1,2,2,4)."""
+        index = RankingIndex([8, 10, 5, 8], ids=[101, 102, 103, 104])
+        self.assertEqual(index.order.tolist(), [1, 0, 3, 2])
+        self.assertEqual(index.ranks.tolist(), [2, 1, 4, 2])
+        self.assertEqual(index.rank_of(104), 2)
+        self.assertEqual(index.rank_of(103), 4)
+
+    def test_tiebreak_key_precedence(self):
+        """A tiebreak kulcsok fontossági sorrendben döntenek."""
+        index = RankingIndex(
+            [10, 10, 10, 10, 8], ids=[5, 4, 3, 2, 1],
+            tiebreaks=[([1, 2, 1, 1, 0], True),
+                       ([0, 0, 1, 1, 0], True),
+                       ([5, 4, 3, 2, 1], False)]
+        )
+        self.assertEqual(index.order.tolist(), [1, 3, 2, 0, 4])
+        self.assertEqual(index.ranks.tolist(), [4, 1, 3, 2, 5])
+        self.assertEqual(index.top_k(2).tolist(), [1, 3])
+
+    def test_top_k_matches_full_order(self):
+        """A részleges kiválasztás a teljes rendezés elejét adja,
+        holtversenyes határ esetén is."""
+        rng = np.random.default_rng(7)
+        for _ in range(50):
+            scores = rng.integers(0, 15, size=200)
+            for k in (0, 1, 5, 20, 199, 200, 250):
+                partial = RankingIndex(scores).top_k(k)
+                full = RankingIndex(scores).order[:k]
+                self.assertEqual(partial.tolist(), full.tolist())
+
+    def test_rank_without_full_sort(self):
+        """A helyezés rendezés nélkül is helyes."""
+        index = RankingIndex([3, 7, 7, 1])
+        self.assertEqual([index.rank_of_row(row) for row in range(4)],
+                         [3, 1, 1, 4])
+        self.assertIsNone(index._order)
+
+
+class TestGameRanking(unittest.TestCase):
+    """
+    A PredictionGame gyorsítótárazott rangsorának tesztjei.
+    """
+
+    def setUp(self):
+        """Minta forduló."""
+        self.csv_data = [
+            ["11", "User1", "1", "0", "2", "1", "2", "50", "60", "70", "A"],
+            ["12", "User2", "1", "0", "0", "1", "1", "50", "60", "70", "A"],
+            ["13", "User3", "1", "0", "2", "1", "2", "50", "60", "70", "A"],
+            ["20", "Cacci", "1", "0", "2", "1", "[]", "50", "60", "70", "A"],
+            ["TeamA", "TeamB", "TeamC", "TeamD"]
+        ]
+
+    def test_ranking_cached_until_scores_change(self):
+        """A rangsor csak pontváltozás után épül újra."""
+        game = PredictionGame(self.csv_data, tiebreak=())
+        game.calculate_all_scores(vectorized=True)
+        ranking = game.ranking
+        self.assertIs(game.ranking, ranking)
+        self.assertEqual([p.name for p in game.get_rankings()],
+                         ["User1", "User3", "User2"])
+        self.assertEqual(game.get_rank(13), 1)
+
+        game.set_result(1, (0, 1))
+        self.assertIsNot(game.ranking, ranking)
+        self.assertEqual([p.name for p in game.get_rankings(limit=1)],
+                         ["User2"])
+        self.assertEqual(game.get_rank(13), 2)
+
+    def test_tiebreak_chain(self):
+        """Azonos pontnál a telitalálatok, a tuti, a replay pont és
+        végül a kisebb sorszám dönt, és a helyezések is különböznek."""
+        csv_data = [
+            ["11", "User1", "1", "0", "3", "1", "2", "50", "60", "70", "A"],
+            ["12", "User2", "2", "0", "2", "1", "1", "50", "60", "70", "A"],
+            ["13", "User3", "1", "0", "2", "0", "1", "50", "60", "70", "A"],
+            ["14", "User4", "1", "0", "2", "0", "1", "50", "60", "70", "A"],
+            ["20", "Cacci", "1", "0", "2", "1", "[]", "50", "60", "70", "A"],
+            ["TeamA", "TeamB", "TeamC", "TeamD"]
+        ]
+        game = PredictionGame(csv_data)
+        game.calculate_all_scores()
+        self.assertEqual(game.table.total_scores.tolist(), [16, 16, 19, 19])
+        self.assertEqual(game.table.exact_hits.tolist(), [1, 1, 1, 1])
+        self.assertEqual(game.table.tuti_hits.tolist(), [1, 1, 1, 1])
+        self.assertEqual([p.name for p in game.get_rankings()],
+                         ["User3", "User4", "User1", "User2"])
+        self.assertEqual(game.ranking.ranks.tolist(), [3, 4, 1, 2])
+
+        untied = PredictionGame(csv_data, tiebreak=("exact",))
+        untied.calculate_all_scores(vectorized=True)
+        self.assertEqual(untied.ranking.ranks.tolist(), [3, 3, 1, 1])
+
+    def test_round_without_participants(self):
+        """Csak a szervező sora: üres helyezés és rangsor, hiba nélkül."""
+        game = PredictionGame(self.csv_data[-2:])
+        game.calculate_all_scores()
+        self.assertEqual(game.ranking.ranks.tolist(), [])
+        self.assertEqual(game.get_rankings(), [])
+        with mock.patch("builtins.print") as printed:
+            game.print_results()
+        printed.assert_called_once()
+        self.assertEqual(RankingIndex([]).ranks.tolist(), [])
+
+    def test_unknown_tiebreak_key(self):
+        """Ismeretlen kulcs esetén ValueError."""
+        with self.assertRaises(ValueError):
+            PredictionGame(self.csv_data, tiebreak=("goals",))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Egységtesztek a RuleSet szabálykészlethez.
+"""
+import random
+import unittest
+import numpy as np
+from HattrickNKPredictor.calculators.calculator import PredictionGame
+from HattrickNKPredictor.calculators.models import MatchScorer, ScoreMatrix
+from HattrickNKPredictor.calculators.rules import DEFAULT_RULES, RuleSet
+from HattrickNKPredictor.testing.csv_data import random_csv_data
+
+CUSTOM_TOML = """
+name = "Kupa"
+
+[match]
+exact = 10
+goal_difference = 6
+outcome = 3
+partial = 1
+miss = -1
+
+[tuti]
+multiplier = 3
+
+[replay]
+bands = [[0, 5], [3, 3], [8, 1]]
+
+[bonus]
+points = 4
+"""
+
+
+class TestRuleSet(unittest.TestCase):
+    """
+    Egységtesztek a szabályok betöltéséhez és a lefordított táblákhoz.
+    """
+
+    def test_defaults_match_legacy_rules(self):
+        """Az alapértelmezett szabályok az eredeti NK pontozást adják."""
+        self.assertEqual(MatchScorer.calculate_score((2, 1), (2, 1)), 5)
+        self.assertEqual(MatchScorer.calculate_score((2, 1), (3, 2)), 3)
+        self.assertEqual(MatchScorer.calculate_score((2, 1), (3, 1)), 2)
+        self.assertEqual(MatchScorer.calculate_score((2, 1), (2, 2)), 1)
+        self.assertEqual(DEFAULT_RULES.replay_points(5), 2)
+        self.assertEqual(DEFAULT_RULES.replay_points(10), 1)
+        self.assertEqual(DEFAULT_RULES.replay_points(11), 0)
+
+    def test_from_toml(self):
+        """A TOML csoportok a megfelelő szabályokra képződnek le."""
+        rules = RuleSet.from_toml(CUSTOM_TOML)
+        self.assertEqual(rules.name, "Kupa")
+        self.assertEqual(rules, RuleSet(10, 6, 3, 1, -1, 3,
+                                        ((0, 5), (3, 3), (8, 1)), 4))
+        self.assertEqual(
+            [int(rules.replay_points(d)) for d in range(11)],
+            [5, 3, 3, 3, 1, 1, 1, 1, 1, 0, 0])
+
+    def test_invalid_rules(self):
+        """Ismeretlen kulcs vagy rendezetlen replay sávok hibát adnak."""
+        with self.assertRaises(ValueError):
+            RuleSet.from_dict({"match": {"perfect": 5}})
+        with self.assertRaises(ValueError):
+            RuleSet.from_dict({"jackpot": 5})
+        with self.assertRaises(ValueError):
+            RuleSet(replay_bands=((10, 1), (5, 2)))
+
+    def test_score_matrix_uses_rules(self):
+        """A lefordított pont-tábla a tömbös képlettel egyezik, a
+        határon kívül is."""
+        rules = RuleSet.from_toml(CUSTOM_TOML)
+        matrix = ScoreMatrix.shared(4, rules)
+        self.assertIs(matrix, ScoreMatrix.shared(4, RuleSet.from_toml(
+            CUSTOM_TOML)))
+        self.assertIsNot(matrix, ScoreMatrix.shared(4))
+        rng = np.random.default_rng(0)
+        goals = rng.integers(0, 7, size=(4, 500))
+        np.testing.assert_array_equal(
+            matrix.score_many(*goals),
+            MatchScorer.calculate_score_array(*goals, rules=rules))
+        self.assertEqual(matrix.score((6, 0), (1, 0)), 3)
+
+    def test_custom_rules_both_paths_agree(self):
+        """Egyedi szabályokkal is egyezik az objektumonkénti és a
+        tömbös útvonal, és eltér az alapértelmezett pontozástól."""
+        rules = RuleSet.from_toml(CUSTOM_TOML)
+        data = random_csv_data(random.Random(10), 60)
+        per_object = PredictionGame(data, rules=rules)
+        per_object.calculate_all_scores()
+        vectorized = PredictionGame(data, rules=rules)
+        vectorized.calculate_all_scores(vectorized=True)
+        default = PredictionGame(data)
+        default.calculate_all_scores(vectorized=True)
+
+        np.testing.assert_array_equal(per_object.table.total_scores,
+                                      vectorized.table.total_scores)
+        np.testing.assert_array_equal(per_object.table.match_scores,
+                                      vectorized.table.match_scores)
+        self.assertFalse(np.array_equal(default.table.total_scores,
+                                        vectorized.table.total_scores))
+
+        vectorized.set_result(1, (9, 9))
+        per_object.correct_results[1] = (9, 9)
+        per_object.calculate_all_scores()
+        np.testing.assert_array_equal(per_object.table.total_scores,
+                                      vectorized.table.total_scores)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Egységtesztek a WinnerEnumerator pontos győztes-elemzőhöz.
+"""
+import itertools
+import math
+import random
+import unittest
+import numpy as np
+from HattrickNKPredictor.calculators.calculator import PredictionGame
+from HattrickNKPredictor.calculators.scenarios import (OutcomeDimension,
+                                                       WinnerEnumerator)
+from HattrickNKPredictor.calculators.simulation import ScoreDistribution
+from HattrickNKPredictor.testing.csv_data import random_csv_data
+
+
+class TestWinnerEnumerator(unittest.TestCase):
+    """
+    A metszéses bejárást a nyers erős (brute force) bejárással veti össze.
+    """
+
+    def setUp(self):
+        """Forduló két függő meccsel és függő bónusszal."""
+        self.game = PredictionGame(random_csv_data(random.Random(9), 30,
+                                                   max_goals=3))
+        self.game.calculate_all_scores(vectorized=True)
+        self.game.clear_result(2)
+        self.game.clear_result(4)
+        self.game.set_bonus(None)
+        self.distribution = ScoreDistribution.poisson(max_goals=3)
+
+    def brute_force(self):
+        """Minden kombináció kiértékelése a live API-val."""
+        winners = {}
+        goals = list(itertools.product(range(4), repeat=2))
+        probabilities = self.distribution.probabilities
+        for third, fifth, bonus in itertools.product(goals, goals, "ABCD"):
+            self.game.set_result(2, third)
+            self.game.set_result(4, fifth)
+            self.game.set_bonus(bonus)
+            cost = -math.log(probabilities[third]) - math.log(
+                probabilities[fifth]) - math.log(1 / 4)
+            scores = self.game.table.total_scores
+            for row in (scores == scores.max()).nonzero()[0].tolist():
+                winners[row] = min(winners.get(row, math.inf), cost)
+        self.game.clear_result(2)
+        self.game.clear_result(4)
+        self.game.set_bonus(None)
+        return winners
+
+    def test_matches_brute_force(self):
+        """Ugyanazok nyerhetnek, és a legolcsóbb forgatókönyv
+        költsége is egyezik."""
+        enumerator = WinnerEnumerator(self.game, max_goals=3,
+                                      bonus_options="ABCD")
+        self.assertLessEqual(enumerator.scenario_count(), 16 * 16 * 4)
+        chances = enumerator.analyse()
+        expected = self.brute_force()
+
+        self.assertEqual(
+            {row for row, chance in enumerate(chances) if chance.can_win},
+            set(expected))
+        for row, cost in expected.items():
+            self.assertAlmostEqual(chances[row].cost, cost)
+
+    def test_cheapest_scenario_wins(self):
+        """A visszaadott forgatókönyvben a résztvevő tényleg első."""
+        chances = WinnerEnumerator(self.game, max_goals=3).analyse()
+        for row, chance in enumerate(chances):
+            if not chance.can_win:
+                continue
+            self.game.set_result(2, chance.scenario["match 3"])
+            self.game.set_result(4, chance.scenario["match 5"])
+            self.game.set_bonus(chance.scenario["bonus"])
+            scores = self.game.table.total_scores
+            self.assertEqual(scores[row], scores.max())
+        self.game.set_bonus(None)
+
+    def test_equivalent_outcomes_are_grouped(self):
+        """Az mindenkinek azonos pontot adó kimenetelek egy csoportba
+        kerülnek, a legvalószínűbb taggal képviselve."""
+        dimension = OutcomeDimension(
+            "match 1", ["a", "b", "c", "d"],
+            np.array([[1, 0], [2, 3], [1, 0], [2, 3]]), [0.1, 0.2, 0.3, 0.4])
+        self.assertEqual(len(dimension), 2)
+        self.assertEqual(sorted(dimension.outcomes), ["c", "d"])
+
+    def test_feasibility_only_mode(self):
+        """cheapest=False esetén is ugyanazok nyerhetnek."""
+        enumerator = WinnerEnumerator(self.game, max_goals=3)
+        self.assertEqual(
+            [chance.can_win for chance in enumerator.analyse()],
+            [chance.can_win for chance in enumerator.analyse(False)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Egységtesztek a SeasonEngine szezon-kiértékelőhöz.
+"""
+import csv
+import os
+import random
+import tempfile
+import unittest
+from HattrickNKPredictor.calculators.calculator import PredictionGame
+from HattrickNKPredictor.calculators.season import SeasonEngine
+from HattrickNKPredictor.testing.csv_data import random_csv_data
+
+
+class TestSeasonEngine(unittest.TestCase):
+    """
+    Egységtesztek a fordulók párhuzamos kiértékeléséhez.
+    """
+
+    def setUp(self):
+        """Néhány véletlenszerű forduló eltérő résztvevőszámmal."""
+        rng = random.Random(3)
+        self.rounds = [random_csv_data(rng, count)
+                       for count in (5, 12, 8, 20)]
+
+    def test_parallel_matches_serial(self):
+        """A párhuzamos futás eredménye megegyezik a sorossal."""
+        serial = SeasonEngine(max_workers=1).score(self.rounds)
+        parallel = SeasonEngine(max_workers=3).score(self.rounds)
+
+        self.assertEqual(serial.names, parallel.names)
+        self.assertEqual(serial.matrix.tolist(), parallel.matrix.tolist())
+        for one, other in zip(serial.rounds, parallel.rounds):
+            self.assertEqual(one.table.total_scores.tolist(),
+                             other.table.total_scores.tolist())
+            self.assertEqual([p.name for p in one.get_rankings()],
+                             [p.name for p in other.get_rankings()])
+
+    def test_season_matrix(self):
+        """A mátrix fordulónként a játékosok összpontszámát tartalmazza."""
+        season = SeasonEngine(max_workers=1).score(self.rounds)
+        self.assertEqual(season.matrix.shape, (20, 4))
+        for column, csv_data in enumerate(self.rounds):
+            game = PredictionGame(csv_data)
+            game.calculate_all_scores()
+            for participant in game.participants:
+                row = season.names.index(participant.name)
+                self.assertEqual(season.matrix[row, column],
+                                 participant.total_score)
+        self.assertEqual(season.standings()[0][1], season.totals.max())
+
+    def test_round_without_participants(self):
+        """Üres forduló (csak a szervező zárása) mellett is lefut, soros
+        és párhuzamos futásban is."""
+        rounds = self.rounds[:2] + [random_csv_data(random.Random(4), 0)]
+        for workers in (1, 2):
+            with self.subTest(max_workers=workers):
+                season = SeasonEngine(max_workers=workers).score(rounds)
+                empty = season.rounds[-1]
+                self.assertEqual(len(empty.table), 0)
+                self.assertEqual(empty.get_rankings(), [])
+                self.assertEqual(empty.ranking.ranks.tolist(), [])
+                self.assertEqual(season.matrix[:, -1].tolist(),
+                                 [0] * len(season.names))
+
+    def test_file_sources(self):
+        """CSV fájlokból is beolvas."""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for index, csv_data in enumerate(self.rounds):
+                path = os.path.join(tmp, f"fordulo_{index + 1}.csv")
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    csv.writer(f).writerows(csv_data)
+                paths.append(path)
+            from_files = SeasonEngine(max_workers=2).score(paths)
+        in_memory = SeasonEngine(max_workers=1).score(self.rounds)
+        self.assertEqual(from_files.matrix.tolist(),
+                         in_memory.matrix.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
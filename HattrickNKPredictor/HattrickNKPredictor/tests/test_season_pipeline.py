@@ -0,0 +1,69 @@
+"""
+Egységtesztek a teljes szezon-feldolgozáshoz a helyi szerver ellen.
+"""
+import os
+import random
+import tempfile
+import unittest
+from HattrickNKPredictor.calculators.season import SeasonEngine
+from HattrickNKPredictor.forum.fetch_scheduler import FetchScheduler
+from HattrickNKPredictor.testing.season_pipeline import (STAGES,
+                                                         TWO_PASS_STAGES,
+                                                         run_season_pipeline)
+from HattrickNKPredictor.testing.thread_generator import generate_thread
+
+
+class TestSeasonPipeline(unittest.TestCase):
+    """
+    A lánc a bejelentkezéstől az összesítésig, véletlen hibákkal.
+    """
+
+    def setUp(self):
+        """Kis generált szál és ideiglenes kimeneti mappa."""
+        self.thread = generate_thread(rounds=6, players=25, seed=25)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Törli a kimeneti fájlokat."""
+        self.tmp.cleanup()
+
+    def run_pipeline(self, server, **kwargs):
+        """Gyors ütemezővel (alvás nélküli újrapróbálással) futtat."""
+        scheduler = FetchScheduler(rate=1000.0, burst=100, sleep=lambda _: 0,
+                                   rng=random.Random(25))
+        return run_season_pipeline(server.forum_url, self.tmp.name,
+                                   scheduler=scheduler,
+                                   engine=SeasonEngine(max_workers=1),
+                                   **kwargs)
+
+    def test_pipeline_with_injected_errors(self):
+        """Hibák mellett is a generált fordulók és egyező összesítés."""
+        with self.thread.server(page_size=10, credentials=("user", "secret"),
+                                error_rate=0.1, seed=3) as server:
+            run = self.run_pipeline(server)
+        self.assertGreater(server.injected, 0)
+        self.assertEqual(server.logins, 1)
+        self.assertEqual(run.stats["retries"], server.injected)
+        self.assertEqual(tuple(run.timings), STAGES)
+        self.assertEqual(run.date_ranges, [r.date_range for r in
+                                           self.thread.closed_rounds()])
+        self.assertEqual(len(run.season.rounds), 6)
+        self.assertEqual(run.scores, dict(run.season.standings()))
+        files = set(os.listdir(self.tmp.name))
+        self.assertTrue({f"fordulo{n}.txt" for n in range(1, 7)} <= files)
+        self.assertIn("score.txt", files)
+
+    def test_two_pass_matches_crawl(self):
+        """A kétmenetes letöltés ugyanazt a szezont adja."""
+        with self.thread.server(page_size=10,
+                                credentials=("user", "secret")) as server:
+            crawled = self.run_pipeline(server)
+            two_pass = self.run_pipeline(server, two_pass=True)
+        self.assertEqual(tuple(two_pass.timings), TWO_PASS_STAGES)
+        self.assertEqual(two_pass.date_ranges, crawled.date_ranges)
+        self.assertEqual(two_pass.posts, crawled.posts)
+        self.assertEqual(two_pass.scores, crawled.scores)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Egységtesztek a StandingsSimulator Monte Carlo szimulátorhoz.
+"""
+import random
+import unittest
+from unittest import mock
+import numpy as np
+from HattrickNKPredictor.calculators.calculator import PredictionGame
+from HattrickNKPredictor.calculators.ranking import RankingIndex
+from HattrickNKPredictor.calculators.simulation import (ScoreDistribution,
+                                                        StandingsSimulator)
+from HattrickNKPredictor.testing.csv_data import random_csv_data
+
+
+class TestStandingsSimulator(unittest.TestCase):
+    """
+    Egységtesztek a végeredmény-szimulációhoz.
+    """
+
+    def setUp(self):
+        """Véletlenszerű forduló két függő meccsel és függő bónusszal."""
+        self.game = PredictionGame(random_csv_data(random.Random(5), 40))
+        self.game.calculate_all_scores(vectorized=True)
+        self.game.clear_result(3)
+        self.game.clear_result(4)
+        self.game.set_bonus(None)
+
+    def test_seeded_runs_are_reproducible(self):
+        """Azonos seed mellett azonos az eredmény."""
+        first = StandingsSimulator(self.game, seed=11).run(5000)
+        second = StandingsSimulator(self.game, seed=11).run(5000)
+        self.assertEqual(first.win_probability.tolist(),
+                         second.win_probability.tolist())
+        self.assertEqual(first.expected_rank.tolist(),
+                         second.expected_rank.tolist())
+
+    def test_finished_round_is_certain(self):
+        """Ha minden eredmény ismert, a rangsor biztos."""
+        game = PredictionGame(random_csv_data(random.Random(6), 30))
+        game.calculate_all_scores(vectorized=True)
+        result = StandingsSimulator(game, seed=1).run(100)
+        ranks = game.ranking.ranks
+        game_untied = PredictionGame(random_csv_data(random.Random(6), 30),
+                                     tiebreak=())
+        game_untied.calculate_all_scores(vectorized=True)
+        self.assertEqual(result.expected_rank.tolist(),
+                         game_untied.ranking.ranks.astype(float).tolist())
+        self.assertEqual(result.win_probability[ranks == 1].tolist(), [1.0])
+
+    def test_matches_exact_probabilities(self):
+        """Egy függő meccs két lehetséges kimenetelével a szimulált
+        győzelmi esély közel van a pontos értékhez."""
+        game = PredictionGame(random_csv_data(random.Random(8), 25),
+                              tiebreak=())
+        game.calculate_all_scores(vectorized=True)
+        game.clear_result(0)
+        probabilities = np.zeros((4, 4))
+        probabilities[1, 0] = 0.7
+        probabilities[0, 2] = 0.3
+
+        exact = np.zeros(len(game.participants))
+        for outcome, weight in (((1, 0), 0.7), ((0, 2), 0.3)):
+            game.set_result(0, outcome)
+            exact += weight * (game.ranking.ranks == 1)
+        game.clear_result(0)
+
+        result = StandingsSimulator(
+            game, ScoreDistribution(probabilities), seed=3
+        ).run(20000)
+        np.testing.assert_allclose(result.win_probability, exact, atol=0.02)
+
+    def test_competition_ranks_match_ranking_index(self):
+        """A hisztogramos helyezésszámítás egyezik a RankingIndex-szel."""
+        rng = np.random.default_rng(2)
+        scores = rng.integers(0, 40, size=(50, 120)).astype(np.int32)
+        ranks = StandingsSimulator.competition_ranks(scores)
+        for row, expected in zip(ranks, scores):
+            self.assertEqual(row.tolist(),
+                             RankingIndex(expected).ranks.tolist())
+
+    def test_wide_scores_use_sorted_ranks(self):
+        """Nagy pontterjedelemnél a rendezéses számítás ugyanazt adja."""
+        rng = np.random.default_rng(8)
+        scores = rng.integers(0, 40, size=(50, 120)).astype(np.int32)
+        scores[:, 0] += 10_000_000
+        ranks = StandingsSimulator.competition_ranks(scores)
+        self.assertEqual(ranks.dtype, np.int32)
+        for row, expected in zip(ranks, scores):
+            self.assertEqual(row.tolist(),
+                             RankingIndex(expected).ranks.tolist())
+        narrow = scores[:, 1:]
+        with mock.patch.object(StandingsSimulator, "MAX_HISTOGRAM_CELLS", 0):
+            np.testing.assert_array_equal(
+                StandingsSimulator.competition_ranks(narrow),
+                ranks[:, 1:] - 1)
+
+    def test_season_base_scores(self):
+        """A korábbi fordulók pontjai és a többi versenyző is számít."""
+        leader = {"Season leader": 10_000}
+        result = StandingsSimulator(self.game, other_competitors=leader,
+                                    base_scores=np.zeros(40), seed=4
+                                    ).run(1000)
+        self.assertEqual(result.names[-1], "Season leader")
+        self.assertEqual(result.win_probability[-1], 1.0)
+        self.assertEqual(result.win_probability[:-1].sum(), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
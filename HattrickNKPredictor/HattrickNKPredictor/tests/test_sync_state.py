@@ -0,0 +1,88 @@
+"""
+Egységtesztek a ForumDateAnalyzer növekményes (SyncState) bejárásához.
+"""
+import os
+import tempfile
+import unittest
+from HattrickNKPredictor.forum.sync_state import SyncState
+from HattrickNKPredictor.testing.forum_server import (StubForumServer,
+                                                      offline_analyzer,
+                                                      render_post)
+
+
+def make_posts(start, days, per_day=9, closed=True):
+    """Napokra bontott hozzászólások; a nap utolsó hozzászólása a
+    szervezőé, ha a forduló lezárt."""
+    posts = []
+    number = start
+    for day_index, day in enumerate(days):
+        for index in range(per_day):
+            last = index == per_day - 1
+            author = ("Cacci" if last and (closed or day_index < len(days) - 1)
+                      else f"User{index}")
+            posts.append(render_post(number, author, "tipp", day))
+            number += 1
+    return posts
+
+
+class TestSyncState(unittest.TestCase):
+    """
+    A mentett állapotból folytatott bejárás ugyanazt adja, mint a teljes.
+    """
+
+    def setUp(self):
+        """Ideiglenes állapotfájl."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "sync.json")
+
+    def tearDown(self):
+        """Törli az ideiglenes fájlokat."""
+        self.tmp.cleanup()
+
+    def date_ranges(self, server, state=None):
+        """get_date_ranges bejelentkezés nélkül, a helyi szerverrel."""
+        return offline_analyzer(server, sync_state=state).get_date_ranges()
+
+    def test_incremental_matches_full_crawl(self):
+        """Új hozzászólások után csak az utolsó oldaltól olvas."""
+        posts = make_posts(1, ["2024-06-14", "2024-06-15", "2024-06-16"],
+                           closed=False)
+        with StubForumServer(posts, page_size=5) as server:
+            first = self.date_ranges(server,
+                                     SyncState.load(server.forum_url,
+                                                    self.path))
+            self.assertEqual(first, [(2, 9), (11, 18)])
+            self.assertEqual(len(server.requests), 6)
+
+            server.posts.extend(make_posts(28, ["2024-06-16",
+                                                "2024-06-17"]))
+            resumed = self.date_ranges(server,
+                                       SyncState.load(server.forum_url,
+                                                      self.path))
+            self.assertEqual(len(server.requests), 4)
+            self.assertIn("n=26", server.requests[0])
+            full = self.date_ranges(server)
+        self.assertEqual(resumed, full)
+        self.assertEqual(resumed[-2:], [(20, 36), (38, 45)])
+
+    def test_unchanged_thread_returns_at_once(self):
+        """Változatlan szálnál egyetlen kérés elég."""
+        posts = make_posts(1, ["2024-06-14", "2024-06-15"])
+        with StubForumServer(posts, page_size=5) as server:
+            expected = self.date_ranges(
+                server, SyncState.load(server.forum_url, self.path))
+            state = SyncState.load(server.forum_url, self.path)
+            self.assertEqual(self.date_ranges(server, state), expected)
+            self.assertEqual(len(server.requests), 1)
+
+    def test_other_thread_starts_over(self):
+        """Más szál állapota nem használható."""
+        state = SyncState("http://a/", self.path)
+        state.add_post(5, "2024-06-14", "Cacci")
+        state.save()
+        self.assertEqual(SyncState.load("http://a/", self.path).last_post, 5)
+        self.assertEqual(SyncState.load("http://b/", self.path).last_post, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Egységtesztek a ParticipantTable oszlopos tárolóhoz.
+"""
+import os
+import tempfile
+import unittest
+from HattrickNKPredictor.calculators.calculator import PredictionGame
+from HattrickNKPredictor.calculators.exporters import export_results_to_txt
+
+
+class TestParticipantTable(unittest.TestCase):
+    """
+    Egységtesztek a ParticipantTable-höz és a sor-nézetekhez.
+    """
+
+    def setUp(self):
+        """Három meccses forduló minta adatai."""
+        self.csv_data = [
+            ["11", "User1", "1", "0", "2", "1", "0", "0",
+             "2", "50", "60", "70", "A"],
+            ["12", "User2", "0", "1", "[]", "1", "2", "2",
+             "[]", "40", "65", "90", "B"],
+            ["20", "Cacci", "1", "0", "2", "1", "1", "1",
+             "[]", "50", "60", "70", "A"],
+            ["TeamA", "TeamB", "TeamC", "TeamD", "TeamE", "TeamF"]
+        ]
+
+    def test_any_match_count(self):
+        """A forduló meccsszáma nincs öt meccsre rögzítve."""
+        game = PredictionGame(self.csv_data)
+        self.assertEqual(game.table.match_count, 3)
+        self.assertEqual(game.correct_results, [(1, 0), (2, 1), (1, 1)])
+        self.assertEqual(game.correct_replay, (50, 60, 70))
+        self.assertEqual(game.correct_bonus, "A")
+        self.assertEqual(game.participants[1].predictions,
+                         [(0, 1), (0, 0), (2, 2)])
+
+    def test_empty_country_row_keeps_five_matches(self):
+        """Üres csapatsor és összeesett replay mellett is öt meccs."""
+        goals = ["1", "0", "2", "1", "0", "0", "3", "1", "1", "1"]
+        rows = [["11", "User1"] + goals + ["2", "50", "60", "70", "A"],
+                ["20", "Cacci"] + goals + ["2", "", "A"]]
+        game = PredictionGame(rows + [[""]])
+        self.assertEqual(game.table.match_count, 5)
+        self.assertEqual(game.correct_results,
+                         [(1, 0), (2, 1), (0, 0), (3, 1), (1, 1)])
+        self.assertEqual(game.participants[0].tuti_match, 2)
+        named = PredictionGame(rows + [[f"Team{i}" for i in range(10)]])
+        game.calculate_all_scores()
+        named.calculate_all_scores()
+        self.assertEqual(game.participants[0].match_scores,
+                         named.participants[0].match_scores)
+
+    def test_row_view_scores(self):
+        """A sor-nézet a tábla pontjait adja vissza."""
+        game = PredictionGame(self.csv_data)
+        game.calculate_all_scores()
+        first, second = game.participants
+        self.assertEqual(first.match_scores, [5, 10, 3])
+        self.assertEqual(first.total_score, 25)
+        self.assertEqual(second.match_scores, [0, 0, 3])
+        self.assertEqual(second.replay_score, 3)
+        self.assertEqual(second.total_score, 6)
+        self.assertFalse(hasattr(first, "__dict__"))
+
+    def test_vectorized_matches_row_path(self):
+        """A tömbös és a soronkénti számolás egyezik."""
+        reference = PredictionGame(self.csv_data)
+        reference.calculate_all_scores()
+        batch = PredictionGame(self.csv_data)
+        batch.calculate_all_scores(vectorized=True)
+        self.assertEqual(reference.table.match_scores.tolist(),
+                         batch.table.match_scores.tolist())
+        self.assertEqual(reference.table.total_scores.tolist(),
+                         batch.table.total_scores.tolist())
+
+    def test_export_with_row_views(self):
+        """Az exportálás a sor-nézetekkel is működik."""
+        game = PredictionGame(self.csv_data)
+        game.calculate_all_scores(vectorized=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "fordulo.txt")
+            export_results_to_txt(game.participants, "NK - 1. Forduló",
+                                  game.correct_results, game.correct_replay,
+                                  game.correct_bonus, game.countrys, output)
+            with open(output, encoding="utf-8") as f:
+                content = f.read()
+        self.assertIn("[tr][th]User1[/th][td]25p[/td]"
+                      "[td]1-0 (5 p)[/td][td]2-1 (10 p)[/td]", content)
+
+
+if __name__ == '__main__':
+    unittest.main()
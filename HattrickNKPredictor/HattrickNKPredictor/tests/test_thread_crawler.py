@@ -0,0 +1,112 @@
+"""
+Egységtesztek az egymenetes ThreadCrawler fórumbejáróhoz.
+"""
+import csv
+import os
+import random
+import tempfile
+import unittest
+import requests
+from HattrickNKPredictor.calculators.season import SeasonEngine
+from HattrickNKPredictor.forum.forum_manager import ForumFetcher
+from HattrickNKPredictor.forum.sync_state import SyncState
+from HattrickNKPredictor.forum.thread_crawler import ThreadCrawler
+from HattrickNKPredictor.testing.forum_server import (StubForumServer,
+                                                      make_season,
+                                                      offline_analyzer)
+
+
+class TestThreadCrawler(unittest.TestCase):
+    """
+    Az egymenetes bejárás ugyanazokat a fordulókat adja, mint a
+    ForumDateAnalyzer + ForumFetcher páros.
+    """
+
+    def setUp(self):
+        """Néhány nap, köztük egy le nem zárt."""
+        self.days = [("2024-06-14", True), ("2024-06-15", True),
+                     ("2024-06-16", False), ("2024-06-17", True),
+                     ("2024-06-18", True)]
+        self.posts = make_season(random.Random(16), self.days)
+
+    def legacy_rounds(self, server):
+        """A korábbi, kétmenetes letöltés CSV sorai fordulónként."""
+        analyzer = offline_analyzer(server)
+        rounds = []
+        for first, last in analyzer.get_date_ranges():
+            fetcher = ForumFetcher("user", "secret", server.forum_url,
+                                   first, last, max_workers=1)
+            fetcher.session = requests.Session()
+            data = fetcher.fetch_forum_data()
+            rounds.append(list(csv.reader(fetcher.csv_lines(data))))
+        return rounds
+
+    def test_matches_two_pass_crawl(self):
+        """Azonos fordulók, azonos CSV sorok, kevesebb letöltéssel."""
+        with StubForumServer(self.posts, page_size=7) as server:
+            expected = self.legacy_rounds(server)
+            legacy_requests = len(server.requests)
+            server.requests.clear()
+
+            crawler = ThreadCrawler("user", "secret", server.forum_url)
+            crawler.session = requests.Session()
+            rounds = list(crawler.crawl())
+            crawl_requests = len(server.requests)
+
+        self.assertEqual(len(rounds), 4)
+        self.assertEqual([r.rows() for r in rounds], expected)
+        self.assertEqual([r.index for r in rounds], [0, 1, 2, 3])
+        self.assertEqual(crawl_requests, -(-len(self.posts) // 7))
+        self.assertLess(crawl_requests, legacy_requests)
+
+    def test_rounds_are_ready_to_score(self):
+        """A kiadott fordulók közvetlenül pontozhatók."""
+        with StubForumServer(self.posts, page_size=7) as server:
+            crawler = ThreadCrawler("user", "secret", server.forum_url)
+            crawler.session = requests.Session()
+            rounds = list(crawler.crawl())
+        season = SeasonEngine(max_workers=1).score(
+            [r.rows() for r in rounds])
+        self.assertEqual(len(season.rounds), 4)
+        self.assertEqual(season.rounds[0].countrys,
+                         [f"{side}{i}" for i in range(5)
+                          for side in "HV"])
+
+    def test_resume_from_sync_state(self):
+        """A mentett fordulók után az utolsó mentett naptól folytatja, és
+        a teljes bejárással azonos fordulókat ad."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sync.json")
+            # Ugyanaz a véletlen sorozat: a régi szál ennek az eleje.
+            posts = make_season(random.Random(16),
+                                self.days + [("2024-06-19", True)])
+            self.assertEqual(posts[:len(self.posts)], self.posts)
+            with StubForumServer(self.posts, page_size=7) as server:
+                self.crawl(server, SyncState.load(server.forum_url, path))
+                stored = SyncState.load(server.forum_url, path).rounds
+                self.assertEqual(len(stored), 4)
+                server.posts = posts
+                resumed = self.crawl(server, SyncState.load(
+                    server.forum_url, path))
+                resumed_requests = list(server.requests)
+                full = self.crawl(server)
+        self.assertEqual(len(resumed), 5)
+        self.assertEqual([r.rows() for r in resumed],
+                         [r.rows() for r in full])
+        self.assertEqual([r.index for r in resumed], list(range(5)))
+        self.assertIn(f"n={stored[-1]['first_post'] - 1}",
+                      resumed_requests[0])
+        self.assertLess(len(resumed_requests), len(server.requests))
+
+    def crawl(self, server, state=None):
+        """A crawl fordulói; a server.requests csak ezt a bejárást
+        tartalmazza."""
+        server.requests.clear()
+        crawler = ThreadCrawler("user", "secret", server.forum_url,
+                                sync_state=state)
+        crawler.session = requests.Session()
+        return list(crawler.crawl())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Egységtesztek a szintetikus fórum szál generátorhoz.
+"""
+import unittest
+import requests
+from HattrickNKPredictor.forum.forum_manager import ForumFetcher
+from HattrickNKPredictor.forum.html_parser import parse_forum_page
+from HattrickNKPredictor.forum.thread_crawler import ThreadCrawler
+from HattrickNKPredictor.testing.thread_generator import generate_thread
+
+
+class TestThreadGenerator(unittest.TestCase):
+    """
+    A generált szál a valódi feldolgozással a megadott fordulókat adja.
+    """
+
+    def setUp(self):
+        """Néhány forduló, az utolsó nyitva."""
+        self.thread = generate_thread(rounds=5, players=40, seed=24,
+                                      open_last=True)
+
+    def test_crawl_finds_generated_rounds(self):
+        """A bejárás a lezárt fordulókat és a tippek zömét megtalálja."""
+        with self.thread.server(page_size=20) as server:
+            crawler = ThreadCrawler("user", "secret", server.forum_url)
+            crawler.session = requests.Session()
+            rounds = list(crawler.crawl())
+        expected = self.thread.closed_rounds()
+        self.assertEqual(len(expected), 4)
+        self.assertEqual([(r.first_post, r.last_post) for r in rounds],
+                         [r.date_range for r in expected])
+        for crawled, generated in zip(rounds, expected):
+            parsed = len(crawled.posts) - 1  # a szervező záró tippje
+            self.assertLessEqual(parsed, generated.predictions)
+            self.assertGreaterEqual(parsed, 0.8 * generated.predictions)
+            self.assertGreaterEqual(generated.table_predictions, 1)
+            self.assertGreaterEqual(generated.plain_predictions, 1)
+
+    def test_pages(self):
+        """Az oldalak minden hozzászólást lefednek, linkekkel."""
+        pages = self.thread.render_pages(page_size=25, chrome=True)
+        fetcher = ForumFetcher("user", "secret", "", 1, 10 ** 9)
+        numbers = []
+        for index, page_html in enumerate(pages):
+            page = parse_forum_page(page_html)
+            numbers += [int(fetcher.get_msg_number(w).lstrip('#'))
+                        for w in page.wrappers]
+            self.assertEqual(page.next_href is None,
+                             index == len(pages) - 1)
+        self.assertEqual(numbers, list(range(1, len(self.thread.posts) + 1)))
+
+    def test_deterministic_and_scalable(self):
+        """Azonos mag, azonos szál; a méret a paraméterekkel nő."""
+        self.assertEqual(generate_thread(rounds=5, players=40, seed=24,
+                                         open_last=True).posts,
+                         self.thread.posts)
+        large = generate_thread(rounds=20, players=200, seed=1,
+                                participation=1.0, chatter=0.0)
+        self.assertEqual(len(large.posts), 20 * (200 + 2))
+        self.assertEqual(len(large.players), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Fórumoldal-feldolgozás mérése HTML elemzőnként.
+
+Az eredeti, teljes fát építő html.parser feldolgozást veti össze a
+SoupStrainer-rel szűrt elemzőkkel, a hozzászólások kinyerésével együtt.
+
+Futtatás: python benchmarks/bench_html_parser.py [oldalak száma]
+"""
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from bs4 import BeautifulSoup  # noqa: E402
+from HattrickNKPredictor.forum.forum_manager import ForumFetcher  # noqa: E402
+from HattrickNKPredictor.forum.html_parser import (  # noqa: E402
+    available_backends, parse_forum_page)
+from HattrickNKPredictor.testing.forum_server import (  # noqa: E402
+    StubForumServer, render_post, render_table_prediction)
+from HattrickNKPredictor.testing.thread_generator import (  # noqa: E402
+    PAGE_CHROME)
+
+
+def make_pages(page_count, page_size=20, seed=1):
+    """Oldalak HTML-je táblázatos tippekkel és zaj-hozzászólásokkal."""
+    rng = random.Random(seed)
+    posts = []
+    for number in range(1, page_count * page_size + 1):
+        if number % 6 == 0:
+            body = "Gratulálok a győztesnek!"
+        else:
+            body = render_table_prediction(
+                [f"{rng.randint(0, 4)}-{rng.randint(0, 4)}"
+                 for _ in range(5)], tuti=rng.randint(0, 4),
+                replay="40-35-25", bonus=rng.choice("ABCD"))
+        posts.append(render_post(number, f"User{number}", body))
+    server = StubForumServer(posts, page_size=page_size)
+    return [server.render_page(first).replace(
+        "<body>", f"<body>{PAGE_CHROME}")
+        for first in range(1, len(posts) + 1, page_size)]
+
+
+def legacy(page_html):
+    """Az eredeti feldolgozás: teljes fa html.parser-rel."""
+    soup = BeautifulSoup(page_html, 'html.parser')
+    soup.select_one('a[title="Következő"], a[accesskey="N"]')
+    return soup.select('.cfWrapper')
+
+
+def measure(pages, parse):
+    """Oldalak/másodperc a feldolgozással és a tippek kinyerésével."""
+    fetcher = ForumFetcher("user", "secret", "", 1, 10 ** 9)
+    start = time.perf_counter()
+    posts = 0
+    for page_html in pages:
+        for wrapper in parse(page_html):
+            posts += fetcher.parse_post(wrapper) is not None
+    return len(pages) / (time.perf_counter() - start), posts
+
+
+def main():
+    """Lefuttatja a mérést és kiírja az eredményt."""
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    pages = make_pages(page_count)
+    baseline, expected = measure(pages, legacy)
+    print(f"{'backend':<22}{'pages/s':>10}{'speedup':>10}")
+    print(f"{'html.parser (full)':<22}{baseline:>10.1f}{1.0:>9.2f}x")
+    for backend in available_backends():
+        rate, posts = measure(
+            pages, lambda page, b=backend: parse_forum_page(page, b).wrappers)
+        assert posts == expected, backend
+        print(f"{backend:<22}{rate:>10.1f}{rate / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
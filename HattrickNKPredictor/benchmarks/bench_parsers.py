@@ -0,0 +1,99 @@
+"""Fórum-feldolgozási utak mérése szintetikus szálon.
+
+Minden útra hozzászólás/másodpercet és csúcs memóriahasználatot mér
+(tracemalloc: csak a Python-allokációk, az lxml C-oldali memóriája nem):
+- teljes oldalfeldolgozás (HTML elemzés + parse_post) elemzőnként,
+  az eredeti, teljes fát építő html.parser-rel együtt,
+- parse_post külön a táblázatos és a szöveges tippekre,
+- a dátumok kinyerése (ForumDateAnalyzer.extract_post_data).
+
+Futtatás: python benchmarks/bench_parsers.py [--rounds N] [--players N]
+"""
+import argparse
+import pathlib
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from bs4 import BeautifulSoup  # noqa: E402
+from HattrickNKPredictor.forum.forum_manager import (  # noqa: E402
+    ForumDateAnalyzer, ForumFetcher)
+from HattrickNKPredictor.forum.html_parser import (  # noqa: E402
+    available_backends, default_backend, parse_forum_page)
+from HattrickNKPredictor.testing.thread_generator import (  # noqa: E402
+    generate_thread)
+
+
+def legacy_wrappers(page_html):
+    """Az eredeti feldolgozás: teljes fa html.parser-rel."""
+    soup = BeautifulSoup(page_html, 'html.parser')
+    soup.select_one('a[title="Következő"], a[accesskey="N"]')
+    return soup.select('.cfWrapper')
+
+
+def measure(work, repeat):
+    """A legjobb futásidő másodpercben és a csúcs memória bájtban."""
+    seconds = min(timeit.repeat(work, number=1, repeat=repeat))
+    tracemalloc.start()
+    work()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def parser_paths(thread, fetcher):
+    """(név, hozzászólások száma, mérendő függvény) hármasok."""
+    pages = thread.render_pages(chrome=True)
+    post_count = len(thread.posts)
+
+    def pipeline(parse):
+        return lambda: [fetcher.parse_post(wrapper)
+                        for page in pages for wrapper in parse(page)]
+
+    paths = [("page: html.parser (full)", post_count,
+              pipeline(legacy_wrappers))]
+    for backend in available_backends():
+        paths.append((f"page: {backend}", post_count, pipeline(
+            lambda page, b=backend: parse_forum_page(page, b).wrappers)))
+
+    wrappers = [wrapper for page in pages
+                for wrapper in parse_forum_page(page).wrappers]
+    table = [w for w in wrappers if w.select_one('.htMlTable td')]
+    plain = [w for w in wrappers if not w.select_one('.htMlTable')]
+    paths += [
+        ("post: table", len(table),
+         lambda: [fetcher.parse_post(w) for w in table]),
+        ("post: plain", len(plain),
+         lambda: [fetcher.parse_post(w) for w in plain]),
+        ("date: extract_post_data", len(wrappers),
+         lambda: [ForumDateAnalyzer.extract_post_data(w)
+                  for w in wrappers]),
+    ]
+    return paths
+
+
+def main():
+    """Lefuttatja a mérést és kiírja az eredményt."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--players", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    thread = generate_thread(args.rounds, args.players, args.seed)
+    fetcher = ForumFetcher("user", "secret", "", 1, 10 ** 9)
+    print(f"{len(thread.posts)} posts, {args.rounds} rounds, "
+          f"{args.players} players, default backend: {default_backend()}")
+    print(f"{'path':<28}{'posts':>8}{'posts/s':>12}{'peak KiB':>12}")
+    for name, count, work in parser_paths(thread, fetcher):
+        seconds, peak = measure(work, args.repeat)
+        print(f"{name:<28}{count:>8}{count / seconds:>12.0f}"
+              f"{peak / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
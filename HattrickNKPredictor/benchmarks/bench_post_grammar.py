@@ -0,0 +1,42 @@
+"""Szöveges tipp-hozzászólások feldolgozásának mérése.
+
+A korábbi, soronként beágyazott mintákkal dolgozó feldolgozást veti össze
+a post_grammar egymenetes állapotgépével.
+
+Futtatás: python benchmarks/bench_post_grammar.py [hozzászólások száma]
+"""
+import pathlib
+import random
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from HattrickNKPredictor.forum.post_grammar import (  # noqa: E402
+    parse_plain_post)
+from HattrickNKPredictor.testing.posts import (  # noqa: E402
+    grammar_parse, legacy_parse, random_plain_lines)
+
+
+def main():
+    """Lefuttatja a mérést és kiírja az eredményt."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(2024)
+    posts = [random_plain_lines(rng, round_number=rng.randint(1, 30))
+             for _ in range(count)]
+    assert all(grammar_parse(p) == legacy_parse(p) for p in posts)
+
+    rates = {}
+    for name, parse in (("legacy", legacy_parse),
+                        ("post_grammar", parse_plain_post)):
+        seconds = min(timeit.repeat(lambda f=parse: [f(p) for p in posts],
+                                    number=1, repeat=5))
+        rates[name] = count / seconds
+    print(f"{'parser':<16}{'posts/s':>12}{'speedup':>10}")
+    for name, rate in rates.items():
+        print(f"{name:<16}{rate:>12.0f}{rate / rates['legacy']:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
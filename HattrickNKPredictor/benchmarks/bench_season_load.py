@@ -0,0 +1,127 @@
+"""Terheléses teszt: a teljes szezon-feldolgozás egy helyi, a Hattrick
+fórumot utánzó szerver ellen.
+
+A szerver külön folyamatban szolgálja ki a generált szálat (n= lapozás,
+"Következő" linkek, belépő űrlap, késleltetés és véletlen hibák), hogy
+ne versengjen a klienssel a GIL-ért. A kliens a do_results valódi
+ThreadCrawler -> PredictionGame -> export_rounds_to_txt ->
+NKScoreAggregator láncát futtatja (--two-pass esetén a ThreadCrawler
+helyett ForumDateAnalyzer -> ForumFetcher), és szakaszonként kiírja a
+falióra-időt. Végül ellenőrzi, hogy a fordulók
+tartományai a generált szálé, és az összesítés a SeasonEngine-é.
+
+Alapból 200 forduló és 2000 játékos (kb. 100 000 hozzászólás); ez
+néhány percig tart.
+
+Futtatás: python benchmarks/bench_season_load.py [--rounds N]
+          [--players N] [--delay S] [--error-rate P] [--workers N]
+          [--two-pass [--boundary-search]]
+"""
+import argparse
+import multiprocessing
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from HattrickNKPredictor.calculators.season import SeasonEngine  # noqa: E402
+from HattrickNKPredictor.forum.fetch_scheduler import (  # noqa: E402
+    FetchScheduler)
+from HattrickNKPredictor.testing.season_pipeline import (  # noqa: E402
+    run_season_pipeline)
+from HattrickNKPredictor.testing.thread_generator import (  # noqa: E402
+    generate_thread)
+
+CREDENTIALS = ("user", "secret")
+
+
+def serve(args, conn):
+    """A szerver folyamat: generálja és kiszolgálja a szálat, amíg a
+    kliens le nem állítja, majd visszaküldi a szerver számlálóit."""
+    thread = generate_thread(args.rounds, args.players, args.seed,
+                             participation=args.participation)
+    server = thread.server(args.page_size, credentials=CREDENTIALS,
+                           delay=args.delay, jitter=args.jitter,
+                           error_rate=args.error_rate, seed=args.seed)
+    server.start()
+    conn.send((server.forum_url, len(thread.posts),
+               [r.date_range for r in thread.closed_rounds()]))
+    conn.recv()
+    server.stop()
+    conn.send({"requests": len(server.requests), "logins": server.logins,
+               "injected": server.injected,
+               "max_in_flight": server.max_in_flight})
+
+
+def main():
+    """Lefuttatja a terheléses tesztet és kiírja az eredményt."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--participation", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=25)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="késleltetés kérésenként (s)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="véletlen plusz késleltetés (0..S s)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="véletlen 429/5xx válaszok aránya")
+    parser.add_argument("--fetch-workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=1000.0,
+                        help="kérések másodpercenként")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="pontozó folyamatok (alapból a CPU magok)")
+    parser.add_argument("--two-pass", action="store_true",
+                        help="ForumDateAnalyzer + ForumFetcher letöltés")
+    parser.add_argument("--boundary-search", action="store_true",
+                        help="bináris keresés a --two-pass dátumaihoz")
+    args = parser.parse_args()
+
+    conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve, args=(args, child_conn),
+                                      daemon=True)
+    started = time.perf_counter()
+    process.start()
+    forum_url, post_count, expected = conn.recv()
+    print(f"{post_count} posts, {args.rounds} rounds, {args.players} "
+          f"players, generated in {time.perf_counter() - started:.1f} s")
+
+    scheduler = FetchScheduler(rate=args.rate, burst=args.fetch_workers,
+                               max_concurrency=args.fetch_workers,
+                               backoff=0.05)
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            run = run_season_pipeline(
+                forum_url, output_dir, *CREDENTIALS, scheduler=scheduler,
+                engine=SeasonEngine(max_workers=args.workers),
+                max_workers=args.fetch_workers, two_pass=args.two_pass,
+                boundary_search=args.boundary_search)
+    finally:
+        conn.send("stop")
+        server_stats = conn.recv()
+        process.join()
+
+    print(f"{'stage':<12}{'seconds':>10}{'share':>8}")
+    for name, seconds in run.timings.items():
+        print(f"{name:<12}{seconds:>10.2f}{seconds / run.total:>8.0%}")
+    print(f"{'total':<12}{run.total:>10.2f}")
+    print(f"{run.posts} predictions in {len(run.date_ranges)} rounds, "
+          f"{len(run.scores)} players scored")
+    print("requests: " + ", ".join(f"{key} {value:.3g}" for key, value
+                                   in run.stats.items()))
+    print("server: " + ", ".join(f"{key} {value}" for key, value
+                                 in server_stats.items()))
+    ranges_ok = run.date_ranges == expected
+    scores_ok = run.scores == dict(run.season.standings())
+    print(f"round ranges {'ok' if ranges_ok else 'MISMATCH'}, "
+          f"aggregate {'ok' if scores_ok else 'MISMATCH'}")
+    if not (ranges_ok and scores_ok):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
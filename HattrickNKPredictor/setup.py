@@ -7,9 +7,15 @@ setup(
     install_requires=[
         "selenium>=4.0.0",
         "beautifulsoup4>=4.0.0",
+        "numpy>=1.20.0",
         "pandas>=1.0.0",
         "requests>=2.0.0",
+        "tomli>=1.1.0; python_version < '3.11'",
     ],
+    extras_require={
+        "lxml": ["lxml>=4.6.0"],
+        "selectolax": ["selectolax>=0.3.0"],
+    },
     test_suite="HattrickNKPredictor.tests",
     entry_points={
         "console_scripts": [